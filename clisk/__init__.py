@@ -1,32 +1,69 @@
 from __future__ import print_function
-import argparse, random, sys
-from board import create_board
-from player import create_player
-from game import Game
+import argparse, os, sys
+from .board import create_board
+from .player import create_player
+from .game import Game
+from .events import ConsoleSink
+from .record import RecordWriter
+from .rng import SeedSequence, create_streams
 
 def main():
     # Parse arguments
     parser = argparse.ArgumentParser(description='clisk: Command-line interface Risk.')
     parser.add_argument('-p', '--player', metavar=('name', 'type'), nargs=2, action='append',
                         dest='players', help='player type (e.g. ethan human, ai random, etc.)', required=True)
-    parser.add_argument('-b', '--board', metavar='board', help='board type (e.g. classic, grid, etc.)', default='classic')
+    parser.add_argument('-b', '--board', metavar='board', help='board type (e.g. classic, grid, etc.) or path of a board definition file', default='classic')
+    parser.add_argument('-c', '--compact', action='store_true', help='store the board state in flat arrays (grids then compute their borders)')
+    parser.add_argument('--region-size', metavar='n', type=int, help='number of cells along the side of a grid region', default=2)
+    parser.add_argument('--regions-per-side', metavar='n', type=int, help='number of regions along the side of a grid', default=2)
+    parser.add_argument('-m', '--connected-moves', action='store_true', help='allow moving troops through any chain of owned territories')
+    parser.add_argument('-i', '--instant-battles', action='store_true', help='resolve each attack in a single draw')
+    parser.add_argument('-r', '--record', metavar='file', help='write a binary record of the game', default=None)
     parser.add_argument('-s', '--seed', metavar='seed', help='random seed', default=0)
+    parser.add_argument('-g', '--game', metavar='n', type=int, help='play game n of the games seeded by the random seed (as numbered by clisk-sim)', default=0)
+    parser.add_argument('--checkpoint', metavar='file', help='keep a snapshot of the game in a file, updated every --checkpoint-every turns', default=None)
+    parser.add_argument('--checkpoint-every', metavar='n', type=int, help='number of turns between snapshots', default=100)
+    parser.add_argument('--resume', metavar='file', help='continue a game from a snapshot (with the same players and board options)', default=None)
+    parser.add_argument('--fork', action='store_true', help='continue a resumed game with new random numbers drawn from the seed')
+    parser.add_argument('-t', '--timing', action='store_true', help='report the time spent in each phase, player decision and board query')
+    parser.add_argument('--timing-output', metavar='file', help='write the timing report to a JSON file', default=None)
     args = parser.parse_args()
 
     # Additional argument checks
     try:
         if len(args.players) < 2: raise ValueError('error: At least 2 players are required.')
         if len(set([name for [name, type] in args.players])) != len(args.players): raise ValueError('error: Player names must all be different.')
+        if args.region_size < 1 or args.regions_per_side < 1 or args.region_size * args.regions_per_side < 2:
+            raise ValueError('error: --region-size and --regions-per-side must be at least 1, with at least 2 cells per side.')
+        if args.fork and not args.resume: raise ValueError('error: --fork requires --resume.')
+        if args.checkpoint_every < 1: raise ValueError('error: --checkpoint-every must be at least 1.')
     except Exception as e:
         print(e)
         parser.print_usage()
         sys.exit(1)
 
     # Set up game
-    random.seed(args.seed)
-    players = [create_player(name, type, random) for [name, type] in args.players]
-    board = create_board(args.board)
-    game = Game(players, board, random)
+    seed_sequence = SeedSequence(args.seed).get_child(args.game)
+    game_random, player_randoms = create_streams(seed_sequence, len(args.players))
+    players = [create_player(name, type, rng) for [name, type], rng in zip(args.players, player_randoms)]
+    board = create_board(args.board, args.compact, args.region_size, args.regions_per_side, args.connected_moves)
+    game = Game(players, board, game_random, args.instant_battles, setup=not args.resume)
+    if args.resume:
+        with open(args.resume, 'rb') as f: game.loads(f.read(), random=not args.fork)
+    game.add_sink(ConsoleSink())
+    if args.record: game.add_sink(RecordWriter(args.record, seed_sequence))
+    if args.timing or args.timing_output: game.instrument()
 
     # Play game
-    game.play()
+    try:
+        if args.checkpoint:
+            while game.play(args.checkpoint_every) is None:
+                # Replace the snapshot in one step so preemption never leaves half of one
+                with open(args.checkpoint + '.tmp', 'wb') as f: f.write(game.dumps())
+                os.rename(args.checkpoint + '.tmp', args.checkpoint)
+        else:
+            game.play()
+    finally:
+        game.close()
+    if args.timing: print(game.stats.report())
+    if args.timing_output: game.stats.save(args.timing_output)
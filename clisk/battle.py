@@ -0,0 +1,208 @@
+from __future__ import division
+import bisect, itertools
+
+def get_roll_outcomes(n_attack_dice, n_defend_dice):
+    """Get the exact distribution of the losses of a single roll
+
+       Args:
+           n_attack_dice (int): Number of attacking dice
+           n_defend_dice (int): Number of defending dice
+
+       Returns:
+           (dict((int, int), float)): Probability of each (attacker losses, defender losses)
+    """
+    n_dice = min(n_attack_dice, n_defend_dice)
+    counts = {}
+    for dice in itertools.product(range(1, 7), repeat=n_attack_dice+n_defend_dice):
+        attack_dice = sorted(dice[:n_attack_dice], reverse=True)
+        defend_dice = sorted(dice[n_attack_dice:], reverse=True)
+        n_defend_losses = sum(1 for i in range(n_dice) if attack_dice[i] > defend_dice[i])
+        losses = (n_dice - n_defend_losses, n_defend_losses)
+        counts[losses] = counts.get(losses, 0) + 1
+    n_rolls = 6 ** (n_attack_dice + n_defend_dice)
+    return dict((losses, count / n_rolls) for losses, count in counts.items())
+
+def get_cumulative(p):
+    """Get the cumulative sums of a list of probabilities
+
+       Args:
+           p (list(float)): Probabilities
+
+       Returns:
+           (list(float)): Cumulative probabilities
+    """
+    cumulative, p_total = [], 0.
+    for p_i in p:
+        p_total += p_i
+        cumulative.append(p_total)
+    return cumulative
+
+def sample_index(cumulative, random):
+    """Sample an index from a cumulative distribution
+
+       Args:
+           cumulative (list(float)): Cumulative probabilities
+           random (random): Random engine
+
+       Returns:
+           (int): Sampled index
+    """
+    return min(bisect.bisect_right(cumulative, random.random() * cumulative[-1]), len(cumulative) - 1)
+
+# Number of the 6 ** (a + d) rolls of a attacking and d defending dice
+# leading to each (attacker losses, defender losses), as given by
+# get_roll_outcomes but written out so importing costs nothing
+roll_counts = {
+    (1, 1): [((0, 1), 15), ((1, 0), 21)],
+    (1, 2): [((0, 1), 55), ((1, 0), 161)],
+    (2, 1): [((0, 1), 125), ((1, 0), 91)],
+    (2, 2): [((0, 2), 295), ((1, 1), 420), ((2, 0), 581)],
+    (3, 1): [((0, 1), 855), ((1, 0), 441)],
+    (3, 2): [((0, 2), 2890), ((1, 1), 2611), ((2, 0), 2275)],
+}
+roll_outcomes = dict(((a, d), [(losses, n / 6 ** (a + d)) for losses, n in counts]) for (a, d), counts in roll_counts.items())
+roll_cumulatives = dict((dice, get_cumulative([p for losses, p in outcomes])) for dice, outcomes in roll_outcomes.items())
+
+max_table_troops = 50
+max_table_rounds = 64
+max_cached_battles = 100000
+cached_battles = {}
+cached_rounds = [[1.]]
+cached_round_cumulatives = [[1.]]
+
+def get_battle_outcomes(n_from_troops, n_to_troops):
+    """Get the exact distribution of the final state of an attack to completion
+
+       The attacker rolls until the defender is wiped out or only 1 attacking
+       troop is left, as in Game.attack_to_completion. Results are cached.
+
+       Args:
+           n_from_troops (int): Number of troops on the attacking territory
+           n_to_troops (int): Number of troops on the defending territory
+
+       Returns:
+           (list((int, int)), list(float)): Final (attacking troops, defending troops) and their cumulative probabilities
+    """
+    key = (n_from_troops, n_to_troops)
+    if key in cached_battles: return cached_battles[key]
+
+    # Push the probability of each state down to the final states, in order
+    # of decreasing total number of troops since every roll removes some
+    final = {}
+    states = {key: 1.}
+    for total in range(n_from_troops + n_to_troops, 0, -1):
+        for n_from in range(max(0, total - n_to_troops), min(total, n_from_troops) + 1):
+            state = (n_from, total - n_from)
+            p = states.pop(state, 0.)
+            if not p: continue
+            if n_from < 2 or not state[1]:
+                final[state] = final.get(state, 0.) + p
+                continue
+            for (from_losses, to_losses), p_roll in roll_outcomes[(min(3, n_from - 1), min(2, state[1]))]:
+                next_state = (n_from - from_losses, state[1] - to_losses)
+                states[next_state] = states.get(next_state, 0.) + p * p_roll
+
+    outcomes = sorted(final)
+    cumulative = get_cumulative([final[state] for state in outcomes])
+    if len(cached_battles) >= max_cached_battles: cached_battles.clear()
+    cached_battles[key] = (outcomes, cumulative)
+    return outcomes, cumulative
+
+def get_round_outcomes(n_rounds):
+    """Get the distribution of the attacker losses over consecutive 3 vs. 2 dice rolls
+
+       Args:
+           n_rounds (int): Number of rolls
+
+       Returns:
+           (list(float)): Cumulative probabilities of losing 0 to 2 * n_rounds attacking troops
+    """
+    p_roll = [p for losses, p in roll_outcomes[(3, 2)]]
+    while len(cached_rounds) <= n_rounds:
+        p_previous = cached_rounds[-1]
+        p = [0.] * (len(p_previous) + 2)
+        for i, p_i in enumerate(p_previous):
+            for j, p_j in enumerate(p_roll): p[i+j] += p_i * p_j
+        cached_rounds.append(p)
+        cached_round_cumulatives.append(get_cumulative(p))
+    return cached_round_cumulatives[n_rounds]
+
+def sample_battle(n_from_troops, n_to_troops, random):
+    """Sample the final state of an attack to completion
+
+       Battles with at most max_table_troops on each side are drawn in a
+       single step from their exact outcome distribution. Larger battles
+       first jump over as many 3 vs. 2 dice rolls as can be made without
+       leaving that regime, up to max_table_rounds at a time, sampled
+       together from their exact combined distribution, so they only take
+       a handful of draws.
+
+       Args:
+           n_from_troops (int): Number of troops on the attacking territory
+           n_to_troops (int): Number of troops on the defending territory
+           random (random): Random engine
+
+       Returns:
+           (int, int): Final number of troops on the attacking and defending territories
+    """
+    n_from, n_to = n_from_troops, n_to_troops
+    while n_from > 1 and n_to:
+        if n_from <= max_table_troops and n_to <= max_table_troops:
+            outcomes, cumulative = get_battle_outcomes(n_from, n_to)
+            return outcomes[sample_index(cumulative, random)]
+        if n_from > 3 and n_to > 1:
+            n_rounds = min((n_from - 4) // 2 + 1, (n_to - 2) // 2 + 1, max_table_rounds)
+            n_from_losses = sample_index(get_round_outcomes(n_rounds), random)
+            n_from, n_to = n_from - n_from_losses, n_to - (2 * n_rounds - n_from_losses)
+        else:
+            dice = (min(3, n_from - 1), min(2, n_to))
+            from_losses, to_losses = roll_outcomes[dice][sample_index(roll_cumulatives[dice], random)][0]
+            n_from, n_to = n_from - from_losses, n_to - to_losses
+    return n_from, n_to
+
+def get_win_probabilities(n_troops):
+    """Compute the probability of conquest of all attacks to completion up to a number of troops
+
+       Args:
+           n_troops (int): Maximum number of troops on each side
+
+       Returns:
+           (list(list(float))): Probability of conquest indexed by attacking then defending troops
+    """
+    table = [[1.] + [0.] * n_troops for n_from in range(n_troops + 1)]
+    for n_from in range(2, n_troops + 1):
+        row = table[n_from]
+        for n_to in range(1, n_troops + 1):
+            p = 0.
+            for (from_losses, to_losses), p_roll in roll_outcomes[(min(3, n_from - 1), min(2, n_to))]:
+                p += p_roll * table[n_from - from_losses][n_to - to_losses]
+            row[n_to] = p
+    return table
+
+max_odds_troops = 200
+win_probabilities = []
+
+def get_win_probability(n_from_troops, n_to_troops):
+    """Get the probability that an attack to completion conquers the defending territory
+
+       Looked up in a table of all battles with up to max_odds_troops on each
+       side, built on first use and grown as larger battles are asked for. Larger battles are scaled
+       down to the table keeping the ratio of troops, which underestimates
+       how one-sided they are.
+
+       Args:
+           n_from_troops (int): Number of troops on the attacking territory
+           n_to_troops (int): Number of troops on the defending territory
+
+       Returns:
+           (float): Probability of conquest
+    """
+    global win_probabilities
+    n_troops = max(n_from_troops, n_to_troops)
+    if n_troops > max_odds_troops:
+        scale = float(max_odds_troops) / n_troops
+        n_from_troops, n_to_troops = int(round(n_from_troops * scale)), max(1, int(round(n_to_troops * scale)))
+        n_troops = max_odds_troops
+    if n_troops >= len(win_probabilities):
+        win_probabilities = get_win_probabilities(min(max(2 * len(win_probabilities), n_troops, 16), max_odds_troops))
+    return win_probabilities[n_from_troops][n_to_troops]
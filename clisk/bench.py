@@ -0,0 +1,192 @@
+from __future__ import print_function, division
+import argparse, json, platform, re, sys, time, timeit
+from .board import create_board
+from .player import create_player
+from .game import Game
+from .sim import play_game
+from .rng import SeedSequence, create_streams
+
+def make_game(board_type='classic', board_args=None, n_players=3, seed=0):
+    """Set up a game between random players to run queries on
+
+       Args:
+           board_type (str): Type of board
+           board_args (dict(str, val)): Keyword arguments of create_board
+           n_players (int): Number of players
+           seed (int): Random seed
+
+       Returns:
+           (Game): Game after the initial distribution of territories
+    """
+    game_random, player_randoms = create_streams(SeedSequence(seed), n_players)
+    players = [create_player('p%i' % (i), 'random', rng) for i, rng in enumerate(player_randoms)]
+    return Game(players, create_board(board_type, **(board_args or {})), game_random)
+
+def get_micro_benchmarks(game):
+    """Return the board query and combat benchmarks
+
+       Each benchmark is a function making one pass over the board and the
+       number of operations in that pass.
+
+       Args:
+           game (Game): Game to run queries on
+
+       Returns:
+           (list((str, function, int))): Name, function and number of operations of each benchmark
+    """
+    board = game.board
+    territories = board.get_territories()
+    players = board.get_players()
+    player_territories = [board.get_territories(p) for p in players]
+
+    # A battle between two territories, restored before every attack
+    from_territory = territories[0]
+    to_territory = board.get_hostile_neighbors(from_territory)[0] if board.get_hostile_neighbors(from_territory) else board.get_neighbors(from_territory)[0]
+    from_player, to_player = players[0], players[-1]
+    def attack_to_completion():
+        board.assign(from_territory, from_player)
+        board.assign(to_territory, to_player)
+        board.set_n_troops(from_territory, 10)
+        board.set_n_troops(to_territory, 5)
+        game.attack_to_completion(from_territory, to_territory)
+
+    return [
+        ('get_neighbors', lambda: [board.get_neighbors(t) for t in territories], len(territories)),
+        ('get_hostile_neighbors', lambda: [board.get_hostile_neighbors(t) for t in territories], len(territories)),
+        ('get_attacking_territories', lambda: [board.get_attacking_territories(p) for p in players], len(players)),
+        ('get_regions', lambda: [board.get_regions(ts) for ts in player_territories], len(players)),
+        ('roll', lambda: game.roll(3, 2), 1),
+        ('attack_to_completion', attack_to_completion, 1),
+    ]
+
+def time_function(function, n_ops, min_time=0.2, repeat=3):
+    """Time a function, calling it enough times to run for a minimum time
+
+       Args:
+           function (function): Function to time
+           n_ops (int): Number of operations per call
+           min_time (float): Minimum number of seconds per measurement
+           repeat (int): Number of measurements (the fastest is kept)
+
+       Returns:
+           (float): Seconds per operation
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_time / 10: number *= 10
+    number = max(1, int(number * min_time / timer.timeit(number)))
+    return min(timer.repeat(repeat, number)) / (number * n_ops)
+
+def time_games(board_type, board_args, n_games, instant_battles):
+    """Time random vs random games
+
+       Args:
+           board_type (str): Type of board
+           board_args (dict(str, val)): Keyword arguments of create_board
+           n_games (int): Number of games, played as games 0 to n_games-1 of root seed 0
+           instant_battles (bool): Whether or not to resolve attacks in a single draw
+
+       Returns:
+           (float): Seconds per game
+    """
+    player_types = [['a', 'random'], ['b', 'random']]
+    start = time.time()
+    for i in range(n_games): play_game((SeedSequence(0).get_child(i), player_types, board_type, board_args, instant_battles, None, False))
+    return (time.time() - start) / n_games
+
+def run(pattern=None, compact=False, instant_battles=False, n_games=10, grid_sizes=(2, 3, 4), min_time=0.2, repeat=3, callback=None):
+    """Run the benchmarks
+
+       Args:
+           pattern (str): Regular expression selecting benchmarks by name (if None, run all)
+           compact (bool): Whether or not to use compact boards
+           instant_battles (bool): Whether or not to resolve attacks in a single draw
+           n_games (int): Number of games per game benchmark
+           grid_sizes (list(int)): Numbers of regions along the side of the benchmarked grids
+           min_time (float): Minimum number of seconds per measurement of the micro-benchmarks
+           repeat (int): Number of measurements of the micro-benchmarks (the fastest is kept)
+           callback (function(str, float)): Called with the name and seconds per operation of each benchmark
+
+       Returns:
+           (dict(str, float)): Seconds per operation of each benchmark
+    """
+    results = {}
+    def record(name, seconds):
+        results[name] = seconds
+        if callback: callback(name, seconds)
+    selected = lambda name: pattern is None or re.search(pattern, name)
+
+    # Micro-benchmarks
+    for board_type, board_args in [('classic', {}), ('grid', {'n_regions_per_side': grid_sizes[-1]})]:
+        board_args['compact'] = compact
+        game = make_game(board_type, board_args)
+        game.instant_battles = instant_battles
+        for name, function, n_ops in get_micro_benchmarks(game):
+            name = 'micro.%s.%s' % (board_type, name)
+            if selected(name): record(name, time_function(function, n_ops, min_time, repeat))
+
+    # Games
+    boards = [('classic', 'classic', {})] + [('grid%i' % (n), 'grid', {'n_regions_per_side': n}) for n in grid_sizes]
+    for name, board_type, board_args in boards:
+        board_args['compact'] = compact
+        name = 'game.%s' % (name)
+        if selected(name): record(name, time_games(board_type, board_args, n_games, instant_battles))
+    return results
+
+def compare(results, baseline, tolerance):
+    """Compare results with a baseline
+
+       Args:
+           results (dict(str, float)): Seconds per operation of each benchmark
+           baseline (dict(str, float)): Baseline seconds per operation of each benchmark
+           tolerance (float): Relative slowdown allowed before a benchmark counts as a regression
+
+       Returns:
+           (list((str, float, float, bool))): Name, result, baseline and regression flag of each benchmark in both
+    """
+    return [(name, results[name], baseline[name], results[name] > baseline[name] * (1. + tolerance))
+            for name in sorted(results) if name in baseline]
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description='clisk-bench: Benchmark board queries, combat and full games.')
+    parser.add_argument('-k', '--filter', metavar='pattern', help='only run benchmarks whose name matches a regular expression', default=None)
+    parser.add_argument('-c', '--compact', action='store_true', help='store the board state in flat arrays (grids then compute their borders)')
+    parser.add_argument('-i', '--instant-battles', action='store_true', help='resolve each attack in a single draw')
+    parser.add_argument('-n', '--n-games', metavar='n', type=int, help='number of games per game benchmark', default=10)
+    parser.add_argument('--grid-sizes', metavar='n', type=int, nargs='+', help='numbers of regions along the side of the benchmarked grids', default=[2, 3, 4])
+    parser.add_argument('--min-time', metavar='s', type=float, help='minimum seconds per measurement of the micro-benchmarks', default=0.2)
+    parser.add_argument('--repeat', metavar='n', type=int, help='number of measurements of the micro-benchmarks', default=3)
+    parser.add_argument('-o', '--output', metavar='file', help='write the results to a JSON file', default=None)
+    parser.add_argument('--baseline', metavar='file', help='compare with the results in a JSON file written by --output', default=None)
+    parser.add_argument('--tolerance', metavar='x', type=float, help='relative slowdown allowed before failing the comparison', default=0.1)
+    args = parser.parse_args()
+
+    # Results are only comparable between runs of the same benchmarks
+    settings = {'compact': args.compact, 'instant_battles': args.instant_battles, 'n_games': args.n_games, 'grid_sizes': args.grid_sizes}
+    if args.baseline:
+        with open(args.baseline) as f: baseline = json.load(f)
+        if baseline.get('settings') != settings:
+            print('error: The settings of the baseline differ: %s (baseline: %s)' % (json.dumps(settings, sort_keys=True), json.dumps(baseline.get('settings'), sort_keys=True)))
+            sys.exit(1)
+
+    # Run benchmarks
+    print('%-40s %14s %14s' % ('benchmark', 'time/op (us)', 'ops/s'))
+    callback = lambda name, seconds: print('%-40s %14.3f %14.1f' % (name, 1e6 * seconds, 1. / seconds))
+    results = run(args.filter, args.compact, args.instant_battles, args.n_games, args.grid_sizes, args.min_time, args.repeat, callback)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'settings': settings,
+                'results': results,
+            }, f, indent=4, sort_keys=True)
+
+    # Compare with baseline
+    if args.baseline:
+        comparison = compare(results, baseline['results'], args.tolerance)
+        print('%-40s %14s %14s %8s' % ('benchmark', 'time/op (us)', 'baseline (us)', 'ratio'))
+        for name, seconds, baseline_seconds, regression in comparison:
+            print('%-40s %14.3f %14.3f %8.2f%s' % (name, 1e6 * seconds, 1e6 * baseline_seconds, seconds / baseline_seconds, '  REGRESSION' if regression else ''))
+        if any(regression for name, seconds, baseline_seconds, regression in comparison): sys.exit(1)
@@ -1,18 +1,45 @@
-import sys
-from classic_board import ClassicBoard
-from grid_board import GridBoard
+import os, sys
 
-def create_board(type):
+def create_board(type, compact=False, region_size=2, n_regions_per_side=2, connected_moves=False):
     """Board factory
 
        Args:
-           type (str): Type of board
+           type (str): Type of board, or path of a board definition file
+           compact (bool): Whether or not to store the board state in flat arrays (grids then compute their borders)
+           region_size (int): Number of cells along the side of a grid region
+           n_regions_per_side (int): Number of regions along the side of a grid
+           connected_moves (bool): Whether or not troops can move through any chain of the player's territories
 
        Returns:
            (Board): Game board
     """
-    if type == 'classic': return ClassicBoard()
-    elif type == 'grid': return GridBoard()
+    # Board modules are only imported when selected
+    if type == 'classic':
+        from .classic_board import ClassicBoard, CLASSIC_MAP
+        if compact:
+            from .compact_map_board import CompactMapBoard
+            board = CompactMapBoard(CLASSIC_MAP)
+        else:
+            board = ClassicBoard()
+    elif type == 'grid':
+        if region_size < 1 or n_regions_per_side < 1 or region_size * n_regions_per_side < 2:
+            print('error: Grids need a region size and a number of regions per side of at least 1, and at least 2 cells per side')
+            sys.exit(1)
+        if compact:
+            from .implicit_grid_board import ImplicitGridBoard
+            board = ImplicitGridBoard(region_size, n_regions_per_side)
+        else:
+            from .grid_board import GridBoard
+            board = GridBoard(region_size, n_regions_per_side)
+    elif os.path.isfile(type):
+        if compact:
+            from .compact_map_board import CompactMapBoard
+            board = CompactMapBoard(type)
+        else:
+            from .map_board import MapBoard
+            board = MapBoard(type)
     else:
-        print('error: Unrecognized board type: %s' % (args.board))
+        print('error: Unrecognized board type: %s' % (type))
         sys.exit(1)
+    if connected_moves: board.set_connected_moves(True)
+    return board
@@ -1,18 +1,204 @@
-from graphscii import Graph
+import copy
+from .components import Components
 
 class Board(object):
     """Board class
 
        Attributes:
-           graph (graphscii.Graph): Board graph
+           positions (dict(str, list(float))): x, y position of each territory
+           borders (list((str, str, str))): Both territories and label of each border
            regions (list(dict(str, val))): Region definitions
+           neighbors (dict(str, tuple(str))): Neighboring territories of each territory
+           territories (list(str)): All territories in the order they were added
+           player_territories (dict(str, dict(str, None))): Territories owned by each player
+           player_troops (dict(str, int)): Total number of troops of each player
+           owners (dict(str, str)): Player owning each territory
+           troops (dict(str, int)): Number of troops on each territory
+           history (list(list((str, str, int)))): Previous owner and troops of the territories changed by each applied action
+           hostile_counts (dict(str, int)): Number of neighbors owned by another player of each territory (0 if missing)
+           attackers (dict(str, dict(str, None))): Territories of each player able to attack
+           movers (dict(str, dict(str, None))): Territories of each player able to move troops
+           components (Components): Connected territories of each player when troops can move through them (None otherwise)
+           territory_regions (dict(str, list(int))): Indices of the regions containing each territory
+           region_counts (dict(str, list(int))): Number of territories owned by each player in each region
+           player_regions (dict(str, dict(int, None))): Indices of the regions completely owned by each player
     """
 
     def __init__(self):
         """Initialize board
         """
-        self.graph = Graph()
+        self.positions = {}
+        self.borders = []
         self.regions = []
+        self.neighbors = {}
+        self.territories = []
+        self.player_territories = {}
+        self.player_troops = {}
+        self.owners = {}
+        self.troops = {}
+        self.history = []
+        self.hostile_counts = {}
+        self.attackers = {}
+        self.movers = {}
+        self.components = None
+        self.territory_regions = {}
+        self.region_counts = {}
+        self.player_regions = {}
+
+    def copy(self):
+        """Copy the board, sharing territories and borders with the copy
+
+           Returns:
+               (Board): Copy of the board
+        """
+        board = copy.copy(self)
+        board.owners = dict(self.owners)
+        board.troops = dict(self.troops)
+        board.player_territories = dict((p, dict(ts)) for p, ts in self.player_territories.items())
+        board.player_troops = dict(self.player_troops)
+        board.history = []
+        board.hostile_counts = dict(self.hostile_counts)
+        board.attackers = dict((p, dict(ts)) for p, ts in self.attackers.items())
+        board.movers = dict((p, dict(ts)) for p, ts in self.movers.items())
+        if self.components: board.components = self.components.copy(board)
+        board.region_counts = dict((p, list(counts)) for p, counts in self.region_counts.items())
+        board.player_regions = dict((p, dict(rs)) for p, rs in self.player_regions.items())
+        return board
+
+    def apply(self, action):
+        """Apply an action so that it can be undone
+
+           Actions are tuples of one of the forms
+               ('place', territory, n_troops),
+               ('battle', from_territory, to_territory, n_from_troops, n_to_troops), giving the
+                   troops left after an attack to completion (the attacker moves in if none are left to defend),
+               ('move', from_territory, to_territory, n_troops).
+
+           Args:
+               action (tuple): Action
+        """
+        kind = action[0]
+        territories = action[1:2] if kind == 'place' else action[1:3]
+        self.history.append([(t, self.get_owner(t), self.get_n_troops(t)) for t in territories])
+        if kind == 'place':
+            territory, n_troops = action[1:]
+            self.set_n_troops(territory, self.get_n_troops(territory) + n_troops)
+        elif kind == 'battle':
+            from_territory, to_territory, n_from_troops, n_to_troops = action[1:]
+            if n_to_troops:
+                self.set_n_troops(from_territory, n_from_troops)
+                self.set_n_troops(to_territory, n_to_troops)
+            else:
+                self.set_n_troops(to_territory, 0)
+                self.assign(to_territory, self.get_owner(from_territory))
+                self.set_n_troops(to_territory, n_from_troops - 1)
+                self.set_n_troops(from_territory, 1)
+        elif kind == 'move':
+            from_territory, to_territory, n_troops = action[1:]
+            self.set_n_troops(from_territory, self.get_n_troops(from_territory) - n_troops)
+            self.set_n_troops(to_territory, self.get_n_troops(to_territory) + n_troops)
+        else:
+            self.history.pop()
+            raise ValueError('Unrecognized action: %s' % (kind))
+
+    def undo(self):
+        """Undo the last applied action
+        """
+        for territory, owner, n_troops in reversed(self.history.pop()):
+            if owner is not None: self.assign(territory, owner)
+            self.set_n_troops(territory, n_troops)
+
+    def get_orders(self):
+        """Return the order of the territories in the incremental indices
+
+           Queries such as get_territories list territories in the order they
+           entered the indices, so a board rebuilt from its owners and troops
+           alone answers them in another order.
+
+           Returns:
+               (list((str, list(str), list(str), list(str), list(list(str))))): Each player in order, with its territories, attacking territories, moving territories and connected groups (None if not tracked)
+        """
+        orders = []
+        for player, territories in self.player_territories.items():
+            groups = self.components.get_groups(player) if self.components else None
+            orders.append((player, list(territories), list(self.attackers.get(player, ())), list(self.movers.get(player, ())), groups))
+        return orders
+
+    def set_orders(self, orders):
+        """Reorder the incremental indices as those of a board with the same owners and troops
+
+           Args:
+               orders (list((str, list(str), list(str), list(str), list(list(str))))): Orders returned by get_orders
+        """
+        self.player_territories = dict((player, dict.fromkeys(territories)) for player, territories, attackers, movers, groups in orders)
+        for player, territories, attackers, movers, groups in orders:
+            if attackers: self.attackers[player] = dict.fromkeys(attackers)
+            if movers: self.movers[player] = dict.fromkeys(movers)
+            if self.components: self.components.set_groups(player, groups)
+
+    def add_territory(self, territory, pos=[0, 0]):
+        """Add a territory to the board
+
+           Args:
+               territory (str): Name of territory
+               pos (list(float)): x, y position between 0 and 1
+        """
+        self.positions[territory] = pos
+        self.neighbors[territory] = ()
+        self.territories.append(territory)
+        self.troops[territory] = 0
+
+    def add_border(self, territory0, territory1, label=''):
+        """Connect two territories
+
+           Args:
+               territory0 (str): Name of first territory
+               territory1 (str): Name of second territory
+               label (str): Label drawn on the border
+        """
+        self.borders.append((territory0, territory1, label))
+        self.neighbors[territory0] += (territory1,)
+        self.neighbors[territory1] += (territory0,)
+
+    def add_region(self, name, value, territories):
+        """Add a region to the board
+
+           Args:
+               name (str): Name of region
+               value (int): Number of extra troops for owning the region
+               territories (list(str)): Territories in the region
+        """
+        r = len(self.regions)
+        self.regions.append({'name': name, 'value': value, 'territories': territories})
+        for territory in territories: self.territory_regions.setdefault(territory, []).append(r)
+        self._count_region(r)
+
+    def _count_region(self, r):
+        """Count the territories each player owns in a new region
+
+           Args:
+               r (int): Region index, following all regions already counted
+        """
+        for counts in self.region_counts.values(): counts.append(0)
+        territories = self.regions[r]['territories']
+        for territory in territories:
+            owner = self.get_owner(territory)
+            if owner is None: continue
+            if owner not in self.region_counts: self.region_counts[owner] = [0] * len(self.regions)
+            self.region_counts[owner][r] += 1
+        for player, counts in self.region_counts.items():
+            if counts[r] == len(territories): self.player_regions.setdefault(player, {})[r] = None
+
+    def get_territory_regions(self, territory):
+        """Return the regions containing a territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (list(int)): Region indices
+        """
+        return self.territory_regions.get(territory, ())
 
     def get_territories(self, player=None):
         """Return a list of territories
@@ -23,9 +209,39 @@ class Board(object):
            Returns:
                (list(str)): List of territories
         """
-        if not player: return self.graph.nodes.keys()
-        # TODO: Optimize by storing
-        return [t for t in self.graph.nodes.keys() if self.graph.nodes[t].att['o'] == player]
+        if not player: return list(self.territories)
+        return list(self.player_territories.get(player, ()))
+
+    def get_players(self):
+        """Return a list of players owning at least one territory
+
+           Returns:
+               (list(str)): List of players
+        """
+        return list(self.player_territories)
+
+    def count_territories(self, player=None):
+        """Count territories
+
+           Args:
+               player (Player): Relevant player (if None, use all players)
+
+           Returns:
+               (int): Number of territories
+        """
+        if not player: return len(self.territories)
+        return len(self.player_territories.get(player, ()))
+
+    def total_troops(self, player):
+        """Count troops of a player over all of their territories
+
+           Args:
+               player (Player): Relevant player
+
+           Returns:
+               (int): Number of troops
+        """
+        return self.player_troops.get(player, 0)
 
     def get_attacking_territories(self, player):
         """Return a list of territories that are able to attack
@@ -36,7 +252,18 @@ class Board(object):
            Returns:
                (list): List of territories
         """
-        return [t for t in self.get_territories(player) if (self.get_n_troops(t) > 1) and len(self.get_hostile_neighbors(t))]
+        return list(self.attackers.get(player, ()))
+
+    def can_attack(self, player):
+        """Check if a player has a territory able to attack
+
+           Args:
+               player (Player): Relevant player
+
+           Returns:
+               (bool): Whether or not the player can attack
+        """
+        return player in self.attackers
 
     def get_moving_territories(self, player):
         """Return a list of territories that are able to move
@@ -47,7 +274,52 @@ class Board(object):
            Returns:
                (list): List of territories
         """
-        return [t for t in self.get_territories(player) if (self.get_n_troops(t) > 1) and len(self.get_friendly_neighbors(t))]
+        return list(self.movers.get(player, ()))
+
+    def can_move(self, player):
+        """Check if a player has a territory able to move troops
+
+           Args:
+               player (Player): Relevant player
+
+           Returns:
+               (bool): Whether or not the player can move troops
+        """
+        return player in self.movers
+
+    def set_connected_moves(self, connected_moves):
+        """Choose whether troops move to neighbors only or through any chain of the player's territories
+
+           Args:
+               connected_moves (bool): Whether or not troops can move through connected territories
+        """
+        self.components = Components(self) if connected_moves else None
+
+    def get_move_targets(self, territory):
+        """Return the territories troops can move to from a territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (list(str)): Friendly neighbors, or all connected territories of the owner when moves can go through them
+        """
+        if not self.components: return self.get_friendly_neighbors(territory)
+        return [t for t in self.components.get_members(territory) if t != territory]
+
+    def can_move_to(self, from_territory, to_territory):
+        """Check if troops can move between two territories
+
+           Args:
+               from_territory (str): Name of territory moved from
+               to_territory (str): Name of territory moved to
+
+           Returns:
+               (bool): Whether or not to_territory is a move target of from_territory
+        """
+        if from_territory == to_territory: return False
+        if self.components: return self.components.is_connected(from_territory, to_territory)
+        return to_territory in self.get_neighbors(from_territory) and self.get_owner(to_territory) == self.get_owner(from_territory)
 
     def get_neighbors(self, territory):
         """Return a list of territories neighboring a given territory
@@ -56,14 +328,20 @@ class Board(object):
                territory (str): Name of territory
 
            Returns:
-               (list): List of territories
+               (tuple(str)): Tuple of territories
         """
-        # TODO: Optimize this by storing neighbors in data structure
-        neighbors = []
-        for edge in self.graph.edges:
-            if territory == edge.n0.label: neighbors.append(edge.n1.label)
-            if territory == edge.n1.label: neighbors.append(edge.n0.label)
-        return neighbors
+        return self.neighbors[territory]
+
+    def count_neighbors(self, territory):
+        """Count the territories neighboring a given territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (int): Number of neighbors
+        """
+        return len(self.neighbors[territory])
 
     def get_friendly_neighbors(self, territory):
         """Return a list of territories neighboring a given territory
@@ -96,7 +374,34 @@ class Board(object):
            Returns:
                (list(dict(str, value)): List of regions
         """
-        return [r for r in self.regions if all(t in territories for t in r['territories'])]
+        counts = {}
+        for territory in set(territories):
+            for r in self.get_territory_regions(territory): counts[r] = counts.get(r, 0) + 1
+        return [region for r, region in enumerate(self.regions) if counts.get(r) == len(region['territories'])]
+
+    def get_player_regions(self, player):
+        """Return the regions completely owned by a player
+
+           Args:
+               player (str): Name of player
+
+           Returns:
+               (list(dict(str, value)): List of regions
+        """
+        return [self.regions[r] for r in sorted(self.player_regions.get(player, ()))]
+
+    def count_region_territories(self, r, player):
+        """Count the territories of a region owned by a player
+
+           Args:
+               r (int): Region index
+               player (str): Name of player
+
+           Returns:
+               (int): Number of territories
+        """
+        counts = self.region_counts.get(player)
+        return counts[r] if counts else 0
 
     def get_n_troops(self, territory):
         """Get number of troops on a territory
@@ -107,7 +412,7 @@ class Board(object):
            Returns:
                (int): Number of troops on a territory
         """
-        return self.graph.nodes[territory].att['n']
+        return self.troops[territory]
 
     def set_n_troops(self, territory, n_troops):
         """Set number of troops on a territory
@@ -117,7 +422,25 @@ class Board(object):
                n_troops (int): Number of troops
         """
         if n_troops < 0: raise ValueError('# troops must be non-negative')
-        self.graph.nodes[territory].att['n'] = n_troops
+        owner, old_n_troops = self.get_owner(territory), self.get_n_troops(territory)
+        if owner is not None: self.player_troops[owner] += n_troops - old_n_troops
+        self._store_n_troops(territory, n_troops)
+        if (n_troops > 1) != (old_n_troops > 1): self._update_frontiers(territory)
+
+    def add_troops(self, placements):
+        """Add troops to several territories in a single update
+
+           Args:
+               placements (dict(str, int)): Number of troops to add to each territory
+        """
+        added = {}
+        for territory, n_troops in placements.items():
+            if n_troops < 0: raise ValueError('# troops must be non-negative')
+            owner, old_n_troops = self.get_owner(territory), self.get_n_troops(territory)
+            if owner is not None: added[owner] = added.get(owner, 0) + n_troops
+            self._store_n_troops(territory, old_n_troops + n_troops)
+            if old_n_troops <= 1 < old_n_troops + n_troops: self._update_frontiers(territory)
+        for owner, n_troops in added.items(): self.player_troops[owner] += n_troops
 
     def get_owner(self, territory):
         """Get player from territory
@@ -128,7 +451,7 @@ class Board(object):
            Returns:
                (str): Name of player who owns the territory
         """
-        return self.graph.nodes[territory].att['o'] if territory in self.graph.nodes else None
+        return self.owners.get(territory)
 
     def assign(self, territory, player):
         """Assign a territory to a player
@@ -137,17 +460,124 @@ class Board(object):
                territory (str): Name of territory
                player (str): Name of player
         """
-        self.graph.nodes[territory].att['o'] = player
+        owner, n_troops = self.get_owner(territory), self.get_n_troops(territory)
+        if owner == player: return
+        if owner is not None:
+            territories = self.player_territories[owner]
+            del territories[territory]
+            if territories:
+                self.player_troops[owner] -= n_troops
+            else:
+                del self.player_territories[owner]
+                del self.player_troops[owner]
+        if player not in self.player_territories:
+            self.player_territories[player] = {}
+            self.player_troops[player] = 0
+        self.player_territories[player][territory] = None
+        self.player_troops[player] += n_troops
+        self._store_owner(territory, player)
+
+        if self.components:
+            if owner is not None: self.components.remove(territory, owner)
+            self.components.add(territory, player)
+
+        # Update the region counts
+        regions = self.get_territory_regions(territory)
+        if regions:
+            if player not in self.region_counts: self.region_counts[player] = [0] * len(self.regions)
+            counts = self.region_counts[player]
+            for r in regions:
+                counts[r] += 1
+                if counts[r] == len(self.regions[r]['territories']): self.player_regions.setdefault(player, {})[r] = None
+            if owner is not None:
+                counts = self.region_counts[owner]
+                for r in regions:
+                    if counts[r] == len(self.regions[r]['territories']): self._discard(self.player_regions, owner, r)
+                    counts[r] -= 1
+
+        # Update the hostile neighbor counts and frontiers around the territory
+        if owner is not None:
+            self._discard(self.attackers, owner, territory)
+            self._discard(self.movers, owner, territory)
+        counts, n_hostile = self.hostile_counts, 0
+        for neighbor in self.get_neighbors(territory):
+            neighbor_owner = self.get_owner(neighbor)
+            if neighbor_owner != player: n_hostile += 1
+            change = (neighbor_owner != player) - (neighbor_owner != owner)
+            if change:
+                counts[neighbor] = counts.get(neighbor, 0) + change
+                self._update_frontiers(neighbor)
+        counts[territory] = n_hostile
+        self._update_frontiers(territory)
+
+    def _update_frontiers(self, territory):
+        """Add a territory to or remove it from its owner's attacking and moving territories
+
+           Args:
+               territory (str): Name of territory
+        """
+        owner = self.get_owner(territory)
+        if owner is None: return
+        n_hostile = self.hostile_counts.get(territory, 0)
+        mobile = self.get_n_troops(territory) > 1
+        if mobile and n_hostile: self.attackers.setdefault(owner, {})[territory] = None
+        else: self._discard(self.attackers, owner, territory)
+        if mobile and n_hostile < self.count_neighbors(territory): self.movers.setdefault(owner, {})[territory] = None
+        else: self._discard(self.movers, owner, territory)
+
+    def _discard(self, frontiers, player, territory):
+        """Remove an item from a player's set, dropping the player when it becomes empty
+
+           Args:
+               frontiers (dict(str, dict(val, None))): Items of each player
+               player (str): Name of player
+               territory (val): Item to remove
+        """
+        territories = frontiers.get(player)
+        if territories and territory in territories:
+            del territories[territory]
+            if not territories: del frontiers[player]
+
+    def _store_n_troops(self, territory, n_troops):
+        """Write the number of troops of a territory to storage
+
+           Args:
+               territory (str): Name of territory
+               n_troops (int): Number of troops
+        """
+        self.troops[territory] = n_troops
+
+    def _store_owner(self, territory, player):
+        """Write the owner of a territory to storage
+
+           Args:
+               territory (str): Name of territory
+               player (str): Name of player
+        """
+        self.owners[territory] = player
+
+    def get_graph(self):
+        """Return a graph of the board for drawing
+
+           Returns:
+               (graphscii.Graph): Board graph
+        """
+        from graphscii import Graph
+        graph = Graph()
+        for territory in self.territories:
+            att = {'o': self.get_owner(territory), 'n': self.get_n_troops(territory)}
+            graph.add_node(territory, att=att, pos=self.positions[territory], show_att=True)
+        for territory0, territory1, label in self.borders:
+            graph.add_edge(territory0, territory1, label=label)
+        return graph
 
     def draw(self):
         """Draw the board and print stats
         """
         print('---')
-        self.graph.draw()
-        players = list(set([self.get_owner(t) for t in self.get_territories()])) # TODO: Optimize by storing this
-        for player in players:
+        self.get_graph().draw()
+        for player in self.get_players():
             territories = self.get_territories(player)
-            n_troops = sum([self.get_n_troops(t) for t in territories])
-            regions = self.get_regions(territories)
-            print('Player %s: troops: %i, territories: %i, regions: %i' % (player, n_troops, len(territories), len(regions)))
+            regions = self.get_player_regions(player)
+            print('Player %s: troops: %i, territories: %i, regions: %i' % (player, self.total_troops(player), len(territories), len(regions)))
         print('---')
@@ -0,0 +1,287 @@
+import hashlib, json, mmap, os, struct, sys, tempfile
+from array import array
+
+MAGIC = b'CLSKMAP\x00'
+VERSION = 1
+
+# Magic, version, numbers of territories, borders, labels and regions, and sizes of the name, label and region name blobs
+HEADER = struct.Struct('<8s8I')
+
+def get_cache_dir():
+    """Return the directory holding compiled maps
+
+       Returns:
+           (str): Path of cache directory ($CLISK_CACHE_DIR, None if unset so maps are compiled in memory)
+    """
+    return os.environ.get('CLISK_CACHE_DIR') or None
+
+def get_layout(n_territories, n_borders, n_labels, n_regions, names_size, labels_size, region_names_size):
+    """Return the sections of a compiled map following its header
+
+       The float section comes first so that every section is aligned on its item size.
+
+       Args:
+           n_territories (int): Number of territories
+           n_borders (int): Number of borders
+           n_labels (int): Number of distinct border labels
+           n_regions (int): Number of regions
+           names_size (int): Number of bytes of territory names
+           labels_size (int): Number of bytes of border labels
+           region_names_size (int): Number of bytes of region names
+
+       Returns:
+           (list((str, str, int))): Name, array typecode and number of items of each section
+    """
+    return [
+        ('positions', 'd', 2*n_territories),
+        ('offsets', 'i', n_territories+1),
+        ('targets', 'i', 2*n_borders),
+        ('borders', 'i', 2*n_borders),
+        ('border_labels', 'i', n_borders),
+        ('name_offsets', 'i', n_territories+1),
+        ('label_offsets', 'i', n_labels+1),
+        ('region_values', 'i', n_regions),
+        ('region_name_offsets', 'i', n_regions+1),
+        ('region_masks', 'B', n_regions*((n_territories+7)//8)),
+        ('names', 'B', names_size),
+        ('labels', 'B', labels_size),
+        ('region_names', 'B', region_names_size),
+    ]
+
+def to_bytes(a):
+    """Return the little-endian bytes of an array
+
+       Args:
+           a (array): Array
+
+       Returns:
+           (bytes): Raw bytes
+    """
+    if sys.byteorder != 'little':
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes() if hasattr(a, 'tobytes') else a.tostring()
+
+def pack_strings(strings):
+    """Pack strings into an offset table and a UTF-8 blob
+
+       Args:
+           strings (list(str)): Strings
+
+       Returns:
+           (array(int), array(int)): Start of each string (and end of the last) and blob bytes
+    """
+    offsets, blob = array('i', [0]), bytearray()
+    for s in strings:
+        blob.extend(s.encode('utf-8'))
+        offsets.append(len(blob))
+    return offsets, array('B', bytes(blob))
+
+def unpack_strings(offsets, blob):
+    """Unpack strings from an offset table and a UTF-8 blob
+
+       Args:
+           offsets (array(int)): Start of each string (and end of the last)
+           blob (array(int)): Blob bytes
+
+       Returns:
+           (list(str)): Strings
+    """
+    data = bytes(bytearray(blob))
+    strings = [data[offsets[i]:offsets[i+1]] for i in range(len(offsets)-1)]
+    if str is bytes: return strings
+    return [s.decode('utf-8') for s in strings]
+
+def compile_map(definition):
+    """Compile a board definition into its binary form
+
+       Args:
+           definition (dict(str, val)): Board definition with territories, borders and regions
+
+       Returns:
+           (bytes): Compiled map
+    """
+    territories = [t['name'] for t in definition['territories']]
+    ids = dict((t, i) for i, t in enumerate(territories))
+    n_territories = len(territories)
+
+    # Borders, with interned labels
+    labels, label_ids = [''], {'': 0}
+    borders, border_labels = array('i'), array('i')
+    neighbors = [[] for t in territories]
+    for border in definition['borders']:
+        i, j = ids[border[0]], ids[border[1]]
+        label = border[2] if len(border) > 2 else ''
+        if label not in label_ids:
+            label_ids[label] = len(labels)
+            labels.append(label)
+        borders.extend([i, j])
+        border_labels.append(label_ids[label])
+        neighbors[i].append(j)
+        neighbors[j].append(i)
+    offsets, targets = array('i', [0]), array('i')
+    for ns in neighbors:
+        targets.extend(ns)
+        offsets.append(len(targets))
+
+    # Regions, as one bitset of territories each
+    n_mask_bytes = (n_territories+7)//8
+    region_values, region_masks = array('i'), array('B', [0]) * (len(definition['regions'])*n_mask_bytes)
+    for r, region in enumerate(definition['regions']):
+        region_values.append(region['value'])
+        for territory in region['territories']:
+            i = ids[territory]
+            region_masks[r*n_mask_bytes + i//8] |= 1 << (i % 8)
+
+    positions = array('d')
+    for territory in definition['territories']: positions.extend(territory.get('pos', [0, 0]))
+    name_offsets, names = pack_strings(territories)
+    label_offsets, label_blob = pack_strings(labels)
+    region_name_offsets, region_names = pack_strings([r['name'] for r in definition['regions']])
+    sections = {
+        'positions': positions, 'offsets': offsets, 'targets': targets, 'borders': borders, 'border_labels': border_labels,
+        'name_offsets': name_offsets, 'label_offsets': label_offsets, 'region_values': region_values,
+        'region_name_offsets': region_name_offsets, 'region_masks': region_masks, 'names': names,
+        'labels': label_blob, 'region_names': region_names,
+    }
+    sizes = (n_territories, len(border_labels), len(labels), len(region_values), len(names), len(label_blob), len(region_names))
+    data = bytearray(HEADER.pack(MAGIC, VERSION, *sizes))
+    for name, typecode, n in get_layout(*sizes): data.extend(to_bytes(sections[name]))
+    return bytes(data)
+
+def get_section(buffer, pos, typecode, n):
+    """Return a section of a compiled map as an array of integers or floats
+
+       Args:
+           buffer (mmap): Compiled map
+           pos (int): Position of the section
+           typecode (str): Array typecode of the section
+           n (int): Number of items
+
+       Returns:
+           (memoryview): Items, without copying where memoryview.cast is available (an array otherwise)
+    """
+    end = pos + n*array(typecode).itemsize
+    if hasattr(memoryview, 'cast') and sys.byteorder == 'little': return memoryview(buffer)[pos:end].cast(typecode)
+    a = array(typecode)
+    a.frombytes(buffer[pos:end]) if hasattr(a, 'frombytes') else a.fromstring(buffer[pos:end])
+    if sys.byteorder != 'little': a.byteswap()
+    return a
+
+class BoardMap(object):
+    """Compiled board definition read from a memory-mapped file
+
+       Territories, borders and regions are identified by integer ids. The
+       arrays are views of the mapped file where possible, so processes
+       loading the same map share one copy of it.
+
+       Attributes:
+           territories (list(str)): All territories, indexed by territory id
+           positions (memoryview(float)): x, y position of each territory
+           offsets (memoryview(int)): Start of the neighbors of each territory in targets
+           targets (memoryview(int)): Neighboring territory ids of all territories
+           borders (memoryview(int)): Territory ids of both ends of each border, in definition order
+           border_labels (memoryview(int)): Label id of each border
+           labels (list(str)): Border labels, indexed by label id ('' first)
+           region_names (list(str)): Region names, indexed by region id
+           region_values (memoryview(int)): Value of each region
+           region_masks (memoryview(int)): Bitset of the territories of each region
+           buffer (mmap): Mapped file
+           path (str): Path of mapped file (None if the map is held in memory)
+    """
+
+    def __init__(self, buffer, path=None):
+        """Initialize map
+
+           Args:
+               buffer (mmap): Compiled map
+               path (str): Path of mapped file (None if the map is held in memory)
+        """
+        self.buffer, self.path = buffer, path
+        header = HEADER.unpack_from(buffer, 0)
+        if header[0] != MAGIC: raise ValueError('Not a compiled clisk map')
+        if header[1] != VERSION: raise ValueError('Unsupported map version: %i' % (header[1]))
+        pos = HEADER.size
+        for name, typecode, n in get_layout(*header[2:]):
+            setattr(self, name, get_section(buffer, pos, typecode, n))
+            pos += n*array(typecode).itemsize
+        self.territories = unpack_strings(self.name_offsets, self.names)
+        self.labels = unpack_strings(self.label_offsets, self.labels)
+        self.region_names = unpack_strings(self.region_name_offsets, self.region_names)
+        del self.names, self.name_offsets, self.label_offsets, self.region_name_offsets
+
+    def __reduce__(self):
+        """Pickle the map as the path of its file, so other processes map it again
+
+           Returns:
+               (tuple): Function and arguments to rebuild the map
+        """
+        if self.path is None: return BoardMap, (bytes(self.buffer),)
+        return read_map, (self.path,)
+
+    def get_region_ids(self, r):
+        """Return the territories of a region
+
+           Args:
+               r (int): Region id
+
+           Returns:
+               (list(int)): Territory ids
+        """
+        n_mask_bytes = (len(self.territories)+7)//8
+        masks, start = self.region_masks, r*n_mask_bytes
+        return [8*k + b for k in range(n_mask_bytes) if masks[start+k] for b in range(8) if masks[start+k] >> b & 1]
+
+    def get_regions(self):
+        """Return region definitions
+
+           Returns:
+               (list(dict(str, val))): Region definitions
+        """
+        return [{
+            'name': name,
+            'value': self.region_values[r],
+            'territories': [self.territories[i] for i in self.get_region_ids(r)]
+        } for r, name in enumerate(self.region_names)]
+
+def load_map(path):
+    """Load a board definition file, compiling it
+
+       If $CLISK_CACHE_DIR is set, the compiled map is cached there under a
+       hash of the file contents, so editing the file recompiles it, and
+       later loads memory-map the cached file. Otherwise nothing is written
+       and the map is compiled in memory on every load.
+
+       Args:
+           path (str): Path of board definition file (JSON)
+
+       Returns:
+           (BoardMap): Compiled map
+    """
+    with open(path, 'rb') as f: source = f.read()
+    cache_dir = get_cache_dir()
+    if cache_dir is None: return BoardMap(compile_map(json.loads(source.decode('utf-8'))))
+    cache_path = os.path.join(cache_dir, '%s-%s.clm' % (os.path.splitext(os.path.basename(path))[0], hashlib.sha1(source).hexdigest()))
+    if not os.path.exists(cache_path):
+        data = compile_map(json.loads(source.decode('utf-8')))
+        try:
+            if not os.path.isdir(cache_dir): os.makedirs(cache_dir)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+            with os.fdopen(fd, 'wb') as f: f.write(data)
+            os.rename(tmp_path, cache_path)
+        except (IOError, OSError) as e:
+            sys.stderr.write('warning: Cannot cache the compiled map in %s (%s), using it from memory\n' % (cache_dir, e))
+            return BoardMap(data)
+    return read_map(cache_path)
+
+def read_map(path):
+    """Memory-map a compiled map
+
+       Args:
+           path (str): Path of compiled map
+
+       Returns:
+           (BoardMap): Compiled map
+    """
+    with open(path, 'rb') as f:
+        return BoardMap(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), path)
@@ -0,0 +1,620 @@
+import copy
+from array import array
+from .board import Board
+
+class CompactBoard(Board):
+    """A board storing its state in flat arrays indexed by integer territory ids
+
+       Territory names are only kept to translate to and from ids, so the
+       string-keyed Board interface works unchanged on top of the arrays.
+       The territories of each player, and its attacking and moving
+       territories and owned regions, are kept as id arrays with the
+       position of each id in them, so adding and removing one is a swap
+       with the last and copying the board only copies arrays.
+
+       Attributes:
+           board_map (BoardMap): Compiled map
+           regions (list(dict(str, val))): Region definitions
+           territories (list(str)): All territories, indexed by territory id
+           ids (dict(str, int)): Territory id of each territory
+           neighbors (list(tuple(str))): Neighboring territories of each territory, filled in on first use (None before)
+           offsets (memoryview(int)): Start of the neighbors of each territory in targets
+           targets (memoryview(int)): Neighboring territory ids of all territories
+           positions (memoryview(float)): x, y position of each territory
+           labels (dict((int, int), str)): Non-empty border labels
+           territory_regions (list(tuple(int))): Indices of the regions containing each territory
+           region_sizes (array(int)): Number of territories in each region
+           players (list(str)): Players, indexed by player id
+           player_ids (dict(str, int)): Player id of each player
+           active (list(int)): Ids of the players owning at least one territory, in the order they gained their first one
+           owners (array(int)): Player id owning each territory (-1 if none)
+           troops (array(int)): Number of troops on each territory
+           player_territories (list(array(int))): Territories owned by each player
+           territory_index (array(int)): Position of each territory in the territories of its owner (-1 if none)
+           player_troops (list(int)): Total number of troops of each player
+           history (list(list((str, str, int)))): Previous owner and troops of the territories changed by each applied action
+           hostile_counts (array(int)): Number of neighbors owned by another player of each territory
+           attackers (list(array(int))): Territories of each player able to attack
+           attacker_index (array(int)): Position of each territory in the attacking territories of its owner (-1 if none)
+           movers (list(array(int))): Territories of each player able to move troops
+           mover_index (array(int)): Position of each territory in the moving territories of its owner (-1 if none)
+           components (Components): Connected territories of each player when troops can move through them (None otherwise)
+           region_counts (list(array(int))): Number of territories owned by each player in each region
+           player_regions (list(array(int))): Indices of the regions completely owned by each player
+           region_index (array(int)): Position of each region in the regions of its owner (-1 if not completely owned)
+    """
+
+    def __init__(self, board_map):
+        """Initialize board from a compiled map
+
+           Args:
+               board_map (BoardMap): Compiled map
+        """
+        self.set_map(board_map)
+        self.territory_regions = [()] * len(self.territories)
+        self.region_sizes = array('i')
+        self.regions = []
+        self.init_state()
+        for r, name in enumerate(board_map.region_names):
+            self.add_region(name, board_map.region_values[r], [self.territories[i] for i in board_map.get_region_ids(r)])
+
+    def set_map(self, board_map):
+        """Take the territories, borders and layout of the board from a compiled map
+
+           Args:
+               board_map (BoardMap): Compiled map
+        """
+        self.board_map = board_map
+        self.territories = board_map.territories
+        self.ids = dict((t, i) for i, t in enumerate(self.territories))
+        self.neighbors = [None] * len(self.territories)
+        self.offsets, self.targets, self.positions = board_map.offsets, board_map.targets, board_map.positions
+        borders, labels = board_map.borders, board_map.labels
+        self.labels = {}
+        for k, label in enumerate(board_map.border_labels):
+            if label:
+                i, j = borders[2*k], borders[2*k+1]
+                self.labels[(min(i, j), max(i, j))] = labels[label]
+
+    def init_state(self):
+        """Clear the owners and troops of all territories
+        """
+        n_territories = len(self.territories)
+        self.players = []
+        self.player_ids = {}
+        self.active = []
+        self.owners = array('i', [-1]) * n_territories
+        self.troops = array('i', [0]) * n_territories
+        self.player_territories = []
+        self.territory_index = array('i', [-1]) * n_territories
+        self.player_troops = []
+        self.history = []
+        self.hostile_counts = array('i', [0]) * n_territories
+        self.attackers = []
+        self.attacker_index = array('i', [-1]) * n_territories
+        self.movers = []
+        self.mover_index = array('i', [-1]) * n_territories
+        self.components = None
+        self.region_counts = []
+        self.player_regions = []
+        self.region_index = array('i', [-1]) * len(self.regions)
+
+    def copy(self):
+        """Copy the board, sharing territories and borders with the copy
+
+           Returns:
+               (CompactBoard): Copy of the board
+        """
+        board = copy.copy(self)
+        board.players = list(self.players)
+        board.player_ids = dict(self.player_ids)
+        board.active = list(self.active)
+        board.owners = self.owners[:]
+        board.troops = self.troops[:]
+        board.player_territories = [ids[:] for ids in self.player_territories]
+        board.territory_index = self.territory_index[:]
+        board.player_troops = list(self.player_troops)
+        board.history = []
+        board.hostile_counts = self.hostile_counts[:]
+        board.attackers = [ids[:] for ids in self.attackers]
+        board.attacker_index = self.attacker_index[:]
+        board.movers = [ids[:] for ids in self.movers]
+        board.mover_index = self.mover_index[:]
+        if self.components: board.components = self.components.copy(board)
+        board.region_counts = [counts[:] for counts in self.region_counts]
+        board.player_regions = [rs[:] for rs in self.player_regions]
+        board.region_index = self.region_index[:]
+        return board
+
+    def get_orders(self):
+        """Return the order of the territories in the incremental indices
+
+           Returns:
+               (list((str, list(str), list(str), list(str), list(list(str))))): Each player in order, with its territories, attacking territories, moving territories and connected groups (None if not tracked)
+        """
+        orders = []
+        for p in self.active:
+            player = self.players[p]
+            groups = self.components.get_groups(player) if self.components else None
+            orders.append((player, self.get_names(self.player_territories[p]), self.get_names(self.attackers[p]), self.get_names(self.movers[p]), groups))
+        return orders
+
+    def set_orders(self, orders):
+        """Reorder the incremental indices as those of a board with the same owners and troops
+
+           Args:
+               orders (list((str, list(str), list(str), list(str), list(list(str))))): Orders returned by get_orders
+        """
+        ids, player_ids = self.ids, self.player_ids
+        self.active = [player_ids[player] for player, territories, attackers, movers, groups in orders]
+        for player, territories, attackers, movers, groups in orders:
+            p = player_ids[player]
+            for members, index, ts in ((self.player_territories, self.territory_index, territories),
+                                       (self.attackers, self.attacker_index, attackers), (self.movers, self.mover_index, movers)):
+                members[p] = array('i', [ids[t] for t in ts])
+                for k, i in enumerate(members[p]): index[i] = k
+            if self.components: self.components.set_groups(player, groups)
+
+    def add_region(self, name, value, territories):
+        """Add a region to the board
+
+           Args:
+               name (str): Name of region
+               value (int): Number of extra troops for owning the region
+               territories (list(str)): Territories in the region
+        """
+        r = len(self.regions)
+        self.regions.append({'name': name, 'value': value, 'territories': territories})
+        self.region_sizes.append(len(territories))
+        self.region_index.append(-1)
+        key = (r,)
+        for territory in territories:
+            i = self.ids[territory]
+            self.territory_regions[i] = self.territory_regions[i] + key if self.territory_regions[i] else key
+        for counts in self.region_counts: counts.append(0)
+        for territory in territories:
+            p = self.owners[self.ids[territory]]
+            if p >= 0: self.region_counts[p][r] += 1
+        for p, counts in enumerate(self.region_counts):
+            if counts[r] == len(territories): self._insert(self.player_regions, self.region_index, p, r)
+
+    def get_names(self, ids):
+        """Return the names of territories
+
+           Args:
+               ids (list(int)): Territory ids
+
+           Returns:
+               (list(str)): Names of territories
+        """
+        names = self.territories
+        return [names[i] for i in ids]
+
+    def get_territory_regions(self, territory):
+        """Return the regions containing a territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (tuple(int)): Region indices
+        """
+        return self.get_region_ids(self.ids[territory])
+
+    def get_region_ids(self, i):
+        """Return the regions containing a territory
+
+           Args:
+               i (int): Territory id
+
+           Returns:
+               (tuple(int)): Region indices
+        """
+        return self.territory_regions[i]
+
+    def get_territories(self, player=None):
+        """Return a list of territories
+
+           Args:
+               player (Player): Relevant player (if None, use all players)
+
+           Returns:
+               (list(str)): List of territories
+        """
+        if not player: return list(self.territories)
+        p = self.player_ids.get(player)
+        if p is None: return []
+        return self.get_names(self.player_territories[p])
+
+    def get_players(self):
+        """Return a list of players owning at least one territory
+
+           Returns:
+               (list(str)): List of players
+        """
+        return [self.players[p] for p in self.active]
+
+    def count_territories(self, player=None):
+        """Count territories
+
+           Args:
+               player (Player): Relevant player (if None, use all players)
+
+           Returns:
+               (int): Number of territories
+        """
+        if not player: return len(self.territories)
+        p = self.player_ids.get(player)
+        return 0 if p is None else len(self.player_territories[p])
+
+    def total_troops(self, player):
+        """Count troops of a player over all of their territories
+
+           Args:
+               player (Player): Relevant player
+
+           Returns:
+               (int): Number of troops
+        """
+        p = self.player_ids.get(player)
+        return 0 if p is None else self.player_troops[p]
+
+    def get_attacking_territories(self, player):
+        """Return a list of territories that are able to attack
+
+           Args:
+               player (Player): Relevant player
+
+           Returns:
+               (list): List of territories
+        """
+        p = self.player_ids.get(player)
+        if p is None: return []
+        return self.get_names(self.attackers[p])
+
+    def can_attack(self, player):
+        """Check if a player has a territory able to attack
+
+           Args:
+               player (Player): Relevant player
+
+           Returns:
+               (bool): Whether or not the player can attack
+        """
+        p = self.player_ids.get(player)
+        return p is not None and len(self.attackers[p]) > 0
+
+    def get_moving_territories(self, player):
+        """Return a list of territories that are able to move
+
+           Args:
+               player (Player): Relevant player
+
+           Returns:
+               (list): List of territories
+        """
+        p = self.player_ids.get(player)
+        if p is None: return []
+        return self.get_names(self.movers[p])
+
+    def can_move(self, player):
+        """Check if a player has a territory able to move troops
+
+           Args:
+               player (Player): Relevant player
+
+           Returns:
+               (bool): Whether or not the player can move troops
+        """
+        p = self.player_ids.get(player)
+        return p is not None and len(self.movers[p]) > 0
+
+    def get_player_regions(self, player):
+        """Return the regions completely owned by a player
+
+           Args:
+               player (str): Name of player
+
+           Returns:
+               (list(dict(str, value)): List of regions
+        """
+        p = self.player_ids.get(player)
+        if p is None: return []
+        return [self.regions[r] for r in sorted(self.player_regions[p])]
+
+    def count_region_territories(self, r, player):
+        """Count the territories of a region owned by a player
+
+           Args:
+               r (int): Region index
+               player (str): Name of player
+
+           Returns:
+               (int): Number of territories
+        """
+        p = self.player_ids.get(player)
+        return 0 if p is None else self.region_counts[p][r]
+
+    def get_neighbors(self, territory):
+        """Return a list of territories neighboring a given territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (tuple(str)): Tuple of territories
+        """
+        i = self.ids[territory]
+        neighbors = self.neighbors[i]
+        if neighbors is None:
+            names = self.territories
+            neighbors = self.neighbors[i] = tuple([names[j] for j in self.get_neighbor_ids(i)])
+        return neighbors
+
+    def count_neighbors(self, territory):
+        """Count the territories neighboring a given territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (int): Number of neighbors
+        """
+        return self.count_neighbor_ids(self.ids[territory])
+
+    def get_neighbor_ids(self, i):
+        """Return the ids of the territories neighboring a given territory
+
+           Args:
+               i (int): Territory id
+
+           Returns:
+               (memoryview(int)): Territory ids
+        """
+        return self.targets[self.offsets[i]:self.offsets[i+1]]
+
+    def count_neighbor_ids(self, i):
+        """Count the territories neighboring a given territory
+
+           Args:
+               i (int): Territory id
+
+           Returns:
+               (int): Number of neighbors
+        """
+        return self.offsets[i+1] - self.offsets[i]
+
+    def get_friendly_neighbors(self, territory):
+        """Return a list of territories neighboring a given territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (list): List of territories
+        """
+        i, owners = self.ids[territory], self.owners
+        owner = owners[i]
+        return self.get_names([j for j in self.get_neighbor_ids(i) if owners[j] == owner])
+
+    def get_hostile_neighbors(self, territory):
+        """Return a list of territories neighboring a given territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (list): List of territories
+        """
+        i, owners = self.ids[territory], self.owners
+        owner = owners[i]
+        return self.get_names([j for j in self.get_neighbor_ids(i) if owners[j] != owner])
+
+    def get_n_troops(self, territory):
+        """Get number of troops on a territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (int): Number of troops on a territory
+        """
+        return self.troops[self.ids[territory]]
+
+    def set_n_troops(self, territory, n_troops):
+        """Set number of troops on a territory
+
+           Args:
+               territory (str): Name of territory
+               n_troops (int): Number of troops
+        """
+        if n_troops < 0: raise ValueError('# troops must be non-negative')
+        i = self.ids[territory]
+        p, old_n_troops = self.owners[i], self.troops[i]
+        if p >= 0: self.player_troops[p] += n_troops - old_n_troops
+        self.troops[i] = n_troops
+        if (n_troops > 1) != (old_n_troops > 1): self._update_frontiers_at(i)
+
+    def add_troops(self, placements):
+        """Add troops to several territories in a single update
+
+           Args:
+               placements (dict(str, int)): Number of troops to add to each territory
+        """
+        ids, owners, troops = self.ids, self.owners, self.troops
+        for territory, n_troops in placements.items():
+            if n_troops < 0: raise ValueError('# troops must be non-negative')
+            i = ids[territory]
+            troops[i] += n_troops
+            if owners[i] >= 0: self.player_troops[owners[i]] += n_troops
+            if troops[i] - n_troops <= 1 < troops[i]: self._update_frontiers_at(i)
+
+    def get_owner(self, territory):
+        """Get player from territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (str): Name of player who owns the territory
+        """
+        i = self.ids.get(territory)
+        if i is None or self.owners[i] < 0: return None
+        return self.players[self.owners[i]]
+
+    def assign(self, territory, player):
+        """Assign a territory to a player
+
+           Args:
+               territory (str): Name of territory
+               player (str): Name of player
+        """
+        i, owners = self.ids[territory], self.owners
+        p, q, n_troops = self.player_ids.get(player), owners[i], self.troops[i]
+        if p is None: p = self._add_player(player)
+        if p == q: return
+        if q >= 0:
+            self._remove(self.player_territories, self.territory_index, q, i)
+            self.player_troops[q] -= n_troops
+            if not self.player_territories[q]: self.active.remove(q)
+        if not self.player_territories[p]: self.active.append(p)
+        self._insert(self.player_territories, self.territory_index, p, i)
+        self.player_troops[p] += n_troops
+        owners[i] = p
+
+        if self.components:
+            if q >= 0: self.components.remove(territory, self.players[q])
+            self.components.add(territory, player)
+
+        # Update the region counts
+        sizes = self.region_sizes
+        for r in self.get_region_ids(i):
+            if q >= 0:
+                counts = self.region_counts[q]
+                if counts[r] == sizes[r]: self._remove(self.player_regions, self.region_index, q, r)
+                counts[r] -= 1
+            counts = self.region_counts[p]
+            counts[r] += 1
+            if counts[r] == sizes[r]: self._insert(self.player_regions, self.region_index, p, r)
+
+        # Update the hostile neighbor counts and frontiers around the territory
+        if q >= 0:
+            if self.attacker_index[i] >= 0: self._toggle(self.attackers, self.attacker_index, q, i)
+            if self.mover_index[i] >= 0: self._toggle(self.movers, self.mover_index, q, i)
+        counts, n_hostile = self.hostile_counts, 0
+        for j in self.get_neighbor_ids(i):
+            neighbor_owner = owners[j]
+            if neighbor_owner != p: n_hostile += 1
+            change = (neighbor_owner != p) - (neighbor_owner != q)
+            if change:
+                counts[j] += change
+                self._update_frontiers_at(j)
+        counts[i] = n_hostile
+        self._update_frontiers_at(i)
+
+    def _add_player(self, player):
+        """Give a player an id and empty indices
+
+           Args:
+               player (str): Name of player
+
+           Returns:
+               (int): Player id
+        """
+        p = len(self.players)
+        self.players.append(player)
+        self.player_ids[player] = p
+        self.player_territories.append(array('i'))
+        self.player_troops.append(0)
+        self.attackers.append(array('i'))
+        self.movers.append(array('i'))
+        self.region_counts.append(array('i', [0]) * len(self.regions))
+        self.player_regions.append(array('i'))
+        return p
+
+    def _update_frontiers(self, territory):
+        """Add a territory to or remove it from its owner's attacking and moving territories
+
+           Args:
+               territory (str): Name of territory
+        """
+        self._update_frontiers_at(self.ids[territory])
+
+    def _update_frontiers_at(self, i):
+        """Add a territory to or remove it from its owner's attacking and moving territories
+
+           Args:
+               i (int): Territory id
+        """
+        p = self.owners[i]
+        if p < 0: return
+        n_hostile = self.hostile_counts[i]
+        mobile = self.troops[i] > 1
+        index = self.attacker_index
+        if (mobile and n_hostile > 0) != (index[i] >= 0): self._toggle(self.attackers, index, p, i)
+        index = self.mover_index
+        if (mobile and n_hostile < self.count_neighbor_ids(i)) != (index[i] >= 0): self._toggle(self.movers, index, p, i)
+
+    def _toggle(self, members, index, p, i):
+        """Add an id to a player's ids if missing, remove it otherwise
+
+           Args:
+               members (list(array(int))): Ids of each player
+               index (array(int)): Position of each id in the ids of its player
+               p (int): Player id
+               i (int): Id to add or remove
+        """
+        ids, k = members[p], index[i]
+        if k < 0:
+            index[i] = len(ids)
+            ids.append(i)
+            return
+        last = ids.pop()
+        if last != i:
+            ids[k] = last
+            index[last] = k
+        index[i] = -1
+
+    def _insert(self, members, index, p, i):
+        """Add an id to a player's ids
+
+           Args:
+               members (list(array(int))): Ids of each player
+               index (array(int)): Position of each id in the ids of its player
+               p (int): Player id
+               i (int): Id to add
+        """
+        index[i] = len(members[p])
+        members[p].append(i)
+
+    def _remove(self, members, index, p, i):
+        """Remove an id from a player's ids, moving the last id into its place
+
+           Args:
+               members (list(array(int))): Ids of each player
+               index (array(int)): Position of each id in the ids of its player
+               p (int): Player id
+               i (int): Id to remove
+        """
+        ids = members[p]
+        last = ids.pop()
+        if last != i:
+            ids[index[i]] = last
+            index[last] = index[i]
+        index[i] = -1
+
+    def get_graph(self):
+        """Return a graph of the board for drawing
+
+           Returns:
+               (graphscii.Graph): Board graph
+        """
+        from graphscii import Graph
+        graph = Graph()
+        for i, territory in enumerate(self.territories):
+            att = {'o': self.get_owner(territory), 'n': self.troops[i]}
+            graph.add_node(territory, att=att, pos=list(self.positions[2*i:2*i+2]), show_att=True)
+        for i, territory in enumerate(self.territories):
+            for j in self.get_neighbor_ids(i):
+                if i < j: graph.add_edge(territory, self.territories[j], label=self.labels.get((i, j), ''))
+        return graph
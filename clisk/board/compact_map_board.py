@@ -0,0 +1,67 @@
+from .board_map import load_map
+from .compact_board import CompactBoard
+
+class CompactMapBoard(CompactBoard):
+    """A board defined by a board definition file, storing its state in flat arrays
+
+       The borders and positions are views of the compiled map, so they are
+       shared with every other board and process loading the same map.
+
+       Attributes:
+           board_map (BoardMap): Compiled map
+           regions (list(dict(str, val))): Region definitions
+           territories (list(str)): All territories, indexed by territory id
+           ids (dict(str, int)): Territory id of each territory
+           neighbors (list(tuple(str))): Neighboring territories of each territory, filled in on first use (None before)
+           offsets (memoryview(int)): Start of the neighbors of each territory in targets
+           targets (memoryview(int)): Neighboring territory ids of all territories
+           positions (memoryview(float)): x, y position of each territory
+           labels (dict((int, int), str)): Non-empty border labels
+           territory_regions (list(tuple(int))): Indices of the regions containing each territory
+           region_sizes (array(int)): Number of territories in each region
+           players (list(str)): Players, indexed by player id
+           player_ids (dict(str, int)): Player id of each player
+           active (list(int)): Ids of the players owning at least one territory, in the order they gained their first one
+           owners (array(int)): Player id owning each territory (-1 if none)
+           troops (array(int)): Number of troops on each territory
+           player_territories (list(array(int))): Territories owned by each player
+           territory_index (array(int)): Position of each territory in the territories of its owner (-1 if none)
+           player_troops (list(int)): Total number of troops of each player
+           history (list(list((str, str, int)))): Previous owner and troops of the territories changed by each applied action
+           hostile_counts (array(int)): Number of neighbors owned by another player of each territory
+           attackers (list(array(int))): Territories of each player able to attack
+           attacker_index (array(int)): Position of each territory in the attacking territories of its owner (-1 if none)
+           movers (list(array(int))): Territories of each player able to move troops
+           mover_index (array(int)): Position of each territory in the moving territories of its owner (-1 if none)
+           components (Components): Connected territories of each player when troops can move through them (None otherwise)
+           region_counts (list(array(int))): Number of territories owned by each player in each region
+           player_regions (list(array(int))): Indices of the regions completely owned by each player
+           region_index (array(int)): Position of each region in the regions of its owner (-1 if not completely owned)
+    """
+
+    def __init__(self, path):
+        """Initialize board
+
+           Args:
+               path (str): Path of board definition file
+        """
+        super(CompactMapBoard, self).__init__(load_map(path))
+
+    def __getstate__(self):
+        """Return the state to pickle, leaving out what is read from the compiled map
+
+           Returns:
+               (dict(str, val)): Attributes
+        """
+        state = dict(self.__dict__)
+        for name in ('territories', 'ids', 'neighbors', 'offsets', 'targets', 'positions', 'labels'): del state[name]
+        return state
+
+    def __setstate__(self, state):
+        """Restore a pickled board
+
+           Args:
+               state (dict(str, val)): Attributes
+        """
+        self.__dict__.update(state)
+        self.set_map(self.board_map)
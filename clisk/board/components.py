@@ -0,0 +1,166 @@
+class Components(object):
+    """Connected groups of territories owned by the same player
+
+       Kept as a union-find over the territories. Gaining a territory merges
+       it with its friendly neighbors, while losing one marks the previous
+       owner's groups for a rebuild on their next query, since a union-find
+       cannot split.
+
+       Attributes:
+           board (Board): The gameboard
+           parents (dict(str, str)): Parent of each owned territory (roots are their own parent)
+           members (dict(str, list(str))): Territories of the group of each root
+           dirty (dict(str, None)): Players whose groups must be rebuilt
+    """
+
+    def __init__(self, board):
+        """Initialize groups from the current owners of a board
+
+           Args:
+               board (Board): The gameboard
+        """
+        self.board = board
+        self.parents = {}
+        self.members = {}
+        self.dirty = dict((p, None) for p in board.get_players())
+
+    def copy(self, board):
+        """Copy the groups for a copy of the board
+
+           Args:
+               board (Board): Copy of the gameboard
+
+           Returns:
+               (Components): Copy of the groups
+        """
+        components = Components.__new__(Components)
+        components.board = board
+        components.parents = dict(self.parents)
+        components.members = dict((root, list(ts)) for root, ts in self.members.items())
+        components.dirty = dict(self.dirty)
+        return components
+
+    def get_groups(self, player):
+        """Return the groups of a player
+
+           Args:
+               player (str): Name of player
+
+           Returns:
+               (list(list(str))): Territories of each group, root first (None if due for a rebuild)
+        """
+        if player in self.dirty: return None
+        return [self.members[t] for t in self.board.get_territories(player) if self.parents.get(t) == t]
+
+    def set_groups(self, player, groups):
+        """Replace the groups of a player
+
+           Args:
+               player (str): Name of player
+               groups (list(list(str))): Groups returned by get_groups
+        """
+        if groups is None:
+            self.dirty[player] = None
+            return
+        self.dirty.pop(player, None)
+        for territory in self.board.get_territories(player): self.members.pop(territory, None)
+        for territories in groups:
+            root = territories[0]
+            self.members[root] = list(territories)
+            for territory in territories: self.parents[territory] = root
+
+    def find(self, territory):
+        """Return the root of the group of a territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (str): Name of root territory
+        """
+        parents = self.parents
+        while parents[territory] != territory:
+            parents[territory] = parents[parents[territory]]
+            territory = parents[territory]
+        return territory
+
+    def union(self, territory0, territory1):
+        """Merge the groups of two territories, the smaller into the larger
+
+           Args:
+               territory0 (str): Name of first territory
+               territory1 (str): Name of second territory
+        """
+        root0, root1 = self.find(territory0), self.find(territory1)
+        if root0 == root1: return
+        if len(self.members[root0]) < len(self.members[root1]): root0, root1 = root1, root0
+        self.parents[root1] = root0
+        self.members[root0].extend(self.members.pop(root1))
+
+    def add(self, territory, player):
+        """Record that a player gained a territory
+
+           Args:
+               territory (str): Name of territory
+               player (str): Name of player
+        """
+        if player in self.dirty: return
+        self.parents[territory] = territory
+        self.members[territory] = [territory]
+        board = self.board
+        for neighbor in board.get_neighbors(territory):
+            if board.get_owner(neighbor) == player: self.union(territory, neighbor)
+
+    def remove(self, territory, player):
+        """Record that a player lost a territory
+
+           Args:
+               territory (str): Name of territory
+               player (str): Name of player
+        """
+        self.dirty[player] = None
+
+    def rebuild(self, player):
+        """Rebuild the groups of a player
+
+           Args:
+               player (str): Name of player
+        """
+        del self.dirty[player]
+        territories = self.board.get_territories(player)
+        for territory in territories:
+            self.parents[territory] = territory
+            self.members[territory] = [territory]
+        board = self.board
+        for territory in territories:
+            for neighbor in board.get_neighbors(territory):
+                if board.get_owner(neighbor) == player: self.union(territory, neighbor)
+
+    def get_members(self, territory):
+        """Return the territories in the group of a territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (list(str)): Territories connected to the territory through its owner's territories, including itself
+        """
+        owner = self.board.get_owner(territory)
+        if owner is None: return [territory]
+        if owner in self.dirty: self.rebuild(owner)
+        return self.members[self.find(territory)]
+
+    def is_connected(self, territory0, territory1):
+        """Check if two territories are in the same group
+
+           Args:
+               territory0 (str): Name of first territory
+               territory1 (str): Name of second territory
+
+           Returns:
+               (bool): Whether or not troops can move between the territories
+        """
+        owner = self.board.get_owner(territory0)
+        if owner is None or self.board.get_owner(territory1) != owner: return False
+        if owner in self.dirty: self.rebuild(owner)
+        return self.find(territory0) == self.find(territory1)
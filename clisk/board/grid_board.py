@@ -1,11 +1,26 @@
-from board import Board
+from .board import Board
 
 class GridBoard(Board):
     """A 2D grid board
 
        Attributes:
-           graph (graphscii.Graph): Board graph
+           positions (dict(str, list(float))): x, y position of each territory
+           borders (list((str, str, str))): Both territories and label of each border
            regions (list(dict(str, val))): Region definitions
+           neighbors (dict(str, tuple(str))): Neighboring territories of each territory
+           territories (list(str)): All territories in the order they were added
+           player_territories (dict(str, dict(str, None))): Territories owned by each player
+           player_troops (dict(str, int)): Total number of troops of each player
+           owners (dict(str, str)): Player owning each territory
+           troops (dict(str, int)): Number of troops on each territory
+           history (list(list((str, str, int)))): Previous owner and troops of the territories changed by each applied action
+           hostile_counts (dict(str, int)): Number of neighbors owned by another player of each territory (0 if missing)
+           attackers (dict(str, dict(str, None))): Territories of each player able to attack
+           movers (dict(str, dict(str, None))): Territories of each player able to move troops
+           components (Components): Connected territories of each player when troops can move through them (None otherwise)
+           territory_regions (dict(str, list(int))): Indices of the regions containing each territory
+           region_counts (dict(str, list(int))): Number of territories owned by each player in each region
+           player_regions (dict(str, dict(int, None))): Indices of the regions completely owned by each player
     """
 
     def __init__(self, region_size=2, n_regions_per_side=2):
@@ -15,26 +30,23 @@ class GridBoard(Board):
 
         # Add nodes and regions
         total_size = region_size * n_regions_per_side
+        scale = float(max(1, total_size-1))
         for i in range(n_regions_per_side):
             for j in range(n_regions_per_side):
                 territories = []
                 for k in range(region_size):
                     for l in range(region_size):
                         territory = str(i*region_size + k)+'-'+str(j*region_size + l)
-                        self.graph.add_node(territory, pos=[float(i*region_size + k)/float(total_size-1), float(j*region_size + l)/float(total_size-1)], show_att=True)
+                        self.add_territory(territory, pos=[(i*region_size + k)/scale, (j*region_size + l)/scale])
                         territories.append(territory)
-                self.regions.append({
-                    'name': str(i)+'-'+str(j),
-                    'value': region_size * region_size,
-                    'territories': territories
-                })
+                self.add_region(str(i)+'-'+str(j), region_size * region_size, territories)
 
         # Add edges
         for i in range(total_size):
             for j in range(total_size-1):
                 label = '+' if not ((j+1) % region_size) else ''
-                self.graph.add_edge(str(i)+'-'+str(j), str(i)+'-'+str(j+1), label=label)
+                self.add_border(str(i)+'-'+str(j), str(i)+'-'+str(j+1), label=label)
         for i in range(total_size-1):
             for j in range(total_size):
                 label = '+' if not ((i+1) % region_size) else ''
-                self.graph.add_edge(str(i)+'-'+str(j), str(i+1)+'-'+str(j), label=label)
+                self.add_border(str(i)+'-'+str(j), str(i+1)+'-'+str(j), label=label)
@@ -0,0 +1,443 @@
+from array import array
+from .compact_board import CompactBoard
+
+class GridTerritories(object):
+    """Names of the cells of an implicit grid, indexed by territory id, made on demand
+
+       Attributes:
+           board (ImplicitGridBoard): The gameboard
+    """
+
+    def __init__(self, board):
+        """Initialize names
+
+           Args:
+               board (ImplicitGridBoard): The gameboard
+        """
+        self.board = board
+
+    def __len__(self):
+        """Count the cells
+
+           Returns:
+               (int): Number of cells
+        """
+        return self.board.size * self.board.size
+
+    def __getitem__(self, i):
+        """Return the name of a cell
+
+           Args:
+               i (int): Territory id
+
+           Returns:
+               (str): Name of cell (row-column)
+        """
+        board = self.board
+        if not 0 <= i < board.size * board.size: raise IndexError('territory id out of range')
+        region, cell = divmod(i, board.region_cells)
+        region_row, region_col = divmod(region, board.n_regions_per_side)
+        k, l = divmod(cell, board.region_size)
+        return board.coordinates[region_row*board.region_size + k] + '-' + board.coordinates[region_col*board.region_size + l]
+
+    def __iter__(self):
+        """Iterate over the names of the cells in id order
+
+           Returns:
+               (iterator(str)): Names of cells
+        """
+        return (self[i] for i in range(len(self)))
+
+class GridIds(object):
+    """Territory ids of the cells of an implicit grid, parsed from their names
+
+       Attributes:
+           board (ImplicitGridBoard): The gameboard
+    """
+
+    def __init__(self, board):
+        """Initialize ids
+
+           Args:
+               board (ImplicitGridBoard): The gameboard
+        """
+        self.board = board
+
+    def get(self, territory, default=None):
+        """Return the territory id of a cell
+
+           Args:
+               territory (str): Name of cell
+               default (val): Value returned for names that are not cells
+
+           Returns:
+               (int): Territory id
+        """
+        try:
+            row, col = territory.split('-')
+            return self.board.row_ids[row] + self.board.col_ids[col]
+        except (AttributeError, TypeError, ValueError, KeyError):
+            return default
+
+    def __getitem__(self, territory):
+        """Return the territory id of a cell
+
+           Args:
+               territory (str): Name of cell
+
+           Returns:
+               (int): Territory id
+        """
+        try:
+            row, col = territory.split('-')
+            return self.board.row_ids[row] + self.board.col_ids[col]
+        except (AttributeError, TypeError, ValueError):
+            raise KeyError(territory)
+
+    def __contains__(self, territory):
+        """Check if a name is the name of a cell
+
+           Args:
+               territory (str): Name
+
+           Returns:
+               (bool): Whether or not the name is the name of a cell
+        """
+        return self.get(territory) is not None
+
+class GridRegionTerritories(object):
+    """Names of the cells of a region of an implicit grid, made on demand
+
+       Attributes:
+           board (ImplicitGridBoard): The gameboard
+           r (int): Region index
+    """
+
+    def __init__(self, board, r):
+        """Initialize names
+
+           Args:
+               board (ImplicitGridBoard): The gameboard
+               r (int): Region index
+        """
+        self.board = board
+        self.r = r
+
+    def __len__(self):
+        """Count the cells of the region
+
+           Returns:
+               (int): Number of cells
+        """
+        return self.board.region_cells
+
+    def __getitem__(self, k):
+        """Return the name of a cell of the region
+
+           Args:
+               k (int): Index of the cell in the region
+
+           Returns:
+               (str): Name of cell
+        """
+        if not 0 <= k < len(self): raise IndexError('cell index out of range')
+        return self.board.territories[self.r * self.board.region_cells + k]
+
+    def __iter__(self):
+        """Iterate over the names of the cells of the region
+
+           Returns:
+               (iterator(str)): Names of cells
+        """
+        return (self[k] for k in range(len(self)))
+
+    def __eq__(self, other):
+        """Compare with another list of territories
+
+           Args:
+               other (val): List of territories
+
+           Returns:
+               (bool): Whether or not both list the same territories in the same order
+        """
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        """Compare with another list of territories
+
+           Args:
+               other (val): List of territories
+
+           Returns:
+               (bool): Whether or not the lists differ
+        """
+        return not self == other
+
+class GridRegions(object):
+    """Region definitions of an implicit grid, made on demand
+
+       Attributes:
+           board (ImplicitGridBoard): The gameboard
+    """
+
+    def __init__(self, board):
+        """Initialize regions
+
+           Args:
+               board (ImplicitGridBoard): The gameboard
+        """
+        self.board = board
+
+    def __len__(self):
+        """Count the regions
+
+           Returns:
+               (int): Number of regions
+        """
+        return self.board.n_regions_per_side * self.board.n_regions_per_side
+
+    def __getitem__(self, r):
+        """Return a region definition
+
+           Args:
+               r (int): Region index
+
+           Returns:
+               (dict(str, val)): Region definition, listing its territories lazily
+        """
+        if not 0 <= r < len(self): raise IndexError('region index out of range')
+        region_row, region_col = divmod(r, self.board.n_regions_per_side)
+        return {'name': '%i-%i' % (region_row, region_col), 'value': self.board.region_cells, 'territories': GridRegionTerritories(self.board, r)}
+
+    def __iter__(self):
+        """Iterate over the region definitions
+
+           Returns:
+               (iterator(dict(str, val))): Region definitions
+        """
+        return (self[r] for r in range(len(self)))
+
+class ImplicitGridBoard(CompactBoard):
+    """A 2D grid board computing its borders instead of storing them
+
+       Cells get integer ids region by region, in the same order as GridBoard,
+       and names, neighbors, regions and positions are computed from the ids,
+       so nothing is stored per cell but its state, nor per border.
+
+       Attributes:
+           region_size (int): Number of cells along the side of a region
+           n_regions_per_side (int): Number of regions along the side of the grid
+           size (int): Number of cells along the side of the grid
+           region_cells (int): Number of cells in a region
+           coordinates (list(str)): Names of the rows and columns
+           coordinate_ids (dict(str, int)): Index of each row or column, by name
+           row_ids (dict(str, int)): Territory id of the first cell of each row, by name
+           col_ids (dict(str, int)): Difference between the territory ids of the cells of each column and of the first column, by name
+           deltas (list(tuple(int))): Differences between the ids of the neighbors of a cell and its id, by class of row and column
+           row_classes (bytearray): Class of each row or column, from whether it is on the edge of the grid or of a region
+           regions (GridRegions): Region definitions
+           territories (GridTerritories): All territories, indexed by territory id
+           ids (GridIds): Territory id of each territory
+           region_sizes (array(int)): Number of territories in each region
+           players (list(str)): Players, indexed by player id
+           player_ids (dict(str, int)): Player id of each player
+           active (list(int)): Ids of the players owning at least one territory, in the order they gained their first one
+           owners (array(int)): Player id owning each territory (-1 if none)
+           troops (array(int)): Number of troops on each territory
+           player_territories (list(array(int))): Territories owned by each player
+           territory_index (array(int)): Position of each territory in the territories of its owner (-1 if none)
+           player_troops (list(int)): Total number of troops of each player
+           history (list(list((str, str, int)))): Previous owner and troops of the territories changed by each applied action
+           hostile_counts (array(int)): Number of neighbors owned by another player of each territory
+           attackers (list(array(int))): Territories of each player able to attack
+           attacker_index (array(int)): Position of each territory in the attacking territories of its owner (-1 if none)
+           movers (list(array(int))): Territories of each player able to move troops
+           mover_index (array(int)): Position of each territory in the moving territories of its owner (-1 if none)
+           components (Components): Connected territories of each player when troops can move through them (None otherwise)
+           region_counts (list(array(int))): Number of territories owned by each player in each region
+           player_regions (list(array(int))): Indices of the regions completely owned by each player
+           region_index (array(int)): Position of each region in the regions of its owner (-1 if not completely owned)
+    """
+
+    def __init__(self, region_size=2, n_regions_per_side=2):
+        """Initialize board
+
+           Args:
+               region_size (int): Number of cells along the side of a region
+               n_regions_per_side (int): Number of regions along the side of the grid
+        """
+        self.region_size = region_size
+        self.n_regions_per_side = n_regions_per_side
+        self.size = region_size * n_regions_per_side
+        self.region_cells = region_size * region_size
+        self.coordinates = [str(k) for k in range(self.size)]
+        self.coordinate_ids = dict((name, k) for k, name in enumerate(self.coordinates))
+        self.row_ids = dict((name, self.get_cell_id(k, 0)) for k, name in enumerate(self.coordinates))
+        self.col_ids = dict((name, self.get_cell_id(0, k)) for k, name in enumerate(self.coordinates))
+
+        # Neighbor id differences of each class of cell: a row (or column)
+        # is first or last of the grid, and first or last of its region
+        self.row_classes = bytearray(self.size)
+        for row in range(self.size):
+            self.row_classes[row] = (row == 0) | (row == self.size-1) << 1 | (row % region_size == 0) << 2 | (row % region_size == region_size-1) << 3
+        up = (-self.region_cells*n_regions_per_side + (region_size-1)*region_size, -region_size)
+        down = (self.region_cells*n_regions_per_side - (region_size-1)*region_size, region_size)
+        left = (-self.region_cells + region_size-1, -1)
+        right = (self.region_cells - (region_size-1), 1)
+        self.deltas = [None] * 256
+        for row_class in set(self.row_classes):
+            for col_class in set(self.row_classes):
+                deltas = ()
+                if not col_class & 1: deltas += (left[0] if col_class & 4 else left[1],)
+                if not col_class & 2: deltas += (right[0] if col_class & 8 else right[1],)
+                if not row_class & 1: deltas += (up[0] if row_class & 4 else up[1],)
+                if not row_class & 2: deltas += (down[0] if row_class & 8 else down[1],)
+                self.deltas[row_class << 4 | col_class] = deltas
+
+        self.territories = GridTerritories(self)
+        self.ids = GridIds(self)
+        self.regions = GridRegions(self)
+        self.region_sizes = array('i', [self.region_cells]) * len(self.regions)
+        self.init_state()
+
+    def get_names(self, ids):
+        """Return the names of territories
+
+           Args:
+               ids (list(int)): Territory ids
+
+           Returns:
+               (list(str)): Names of territories
+        """
+        names, region_cells, n_regions_per_side, region_size = self.coordinates, self.region_cells, self.n_regions_per_side, self.region_size
+        result = []
+        for i in ids:
+            region, cell = divmod(i, region_cells)
+            region_row, region_col = divmod(region, n_regions_per_side)
+            k, l = divmod(cell, region_size)
+            result.append(names[region_row*region_size + k] + '-' + names[region_col*region_size + l])
+        return result
+
+    def get_region_ids(self, i):
+        """Return the regions containing a territory
+
+           Args:
+               i (int): Territory id
+
+           Returns:
+               (tuple(int)): Region indices
+        """
+        return (i // self.region_cells,)
+
+    def get_cell(self, i):
+        """Return the row and column of a cell
+
+           Args:
+               i (int): Territory id
+
+           Returns:
+               (int, int): Row and column
+        """
+        region, cell = divmod(i, self.region_cells)
+        region_row, region_col = divmod(region, self.n_regions_per_side)
+        row, col = divmod(cell, self.region_size)
+        return region_row*self.region_size + row, region_col*self.region_size + col
+
+    def get_cell_id(self, row, col):
+        """Return the territory id of a cell
+
+           Args:
+               row (int): Row
+               col (int): Column
+
+           Returns:
+               (int): Territory id
+        """
+        region_row, k = divmod(row, self.region_size)
+        region_col, l = divmod(col, self.region_size)
+        return ((region_row*self.n_regions_per_side + region_col)*self.region_size + k)*self.region_size + l
+
+    def get_neighbors(self, territory):
+        """Return a list of territories neighboring a given territory
+
+           Args:
+               territory (str): Name of territory
+
+           Returns:
+               (tuple(str)): Tuple of territories
+        """
+        try:
+            row, col = territory.split('-')
+            k, l = self.coordinate_ids[row], self.coordinate_ids[col]
+        except (AttributeError, TypeError, ValueError):
+            raise KeyError(territory)
+        names, last, neighbors = self.coordinates, self.size-1, []
+        if l > 0: neighbors.append(row + '-' + names[l-1])
+        if l < last: neighbors.append(row + '-' + names[l+1])
+        if k > 0: neighbors.append(names[k-1] + '-' + col)
+        if k < last: neighbors.append(names[k+1] + '-' + col)
+        return tuple(neighbors)
+
+    def get_deltas(self, i):
+        """Return the differences between the ids of the neighbors of a cell and its id
+
+           Args:
+               i (int): Territory id
+
+           Returns:
+               (tuple(int)): Id differences, shared by all cells of the same class
+        """
+        region, cell = divmod(i, self.region_cells)
+        region_row, region_col = divmod(region, self.n_regions_per_side)
+        k, l = divmod(cell, self.region_size)
+        classes = self.row_classes
+        return self.deltas[classes[region_row*self.region_size + k] << 4 | classes[region_col*self.region_size + l]]
+
+    def count_neighbor_ids(self, i):
+        """Count the territories neighboring a given territory
+
+           Args:
+               i (int): Territory id
+
+           Returns:
+               (int): Number of neighbors
+        """
+        return len(self.get_deltas(i))
+
+    def get_neighbor_ids(self, i):
+        """Return the ids of the territories neighboring a given territory
+
+           Args:
+               i (int): Territory id
+
+           Returns:
+               (iterator(int)): Territory ids
+        """
+        region, cell = divmod(i, self.region_cells)
+        region_row, region_col = divmod(region, self.n_regions_per_side)
+        k, l = divmod(cell, self.region_size)
+        classes = self.row_classes
+        return map(i.__add__, self.deltas[classes[region_row*self.region_size + k] << 4 | classes[region_col*self.region_size + l]])
+
+    def get_graph(self):
+        """Return a graph of the board for drawing
+
+           Returns:
+               (graphscii.Graph): Board graph
+        """
+        from graphscii import Graph
+        graph = Graph()
+        scale = float(max(1, self.size-1))
+        for i, territory in enumerate(self.territories):
+            row, col = self.get_cell(i)
+            att = {'o': self.get_owner(territory), 'n': self.troops[i]}
+            graph.add_node(territory, att=att, pos=[row/scale, col/scale], show_att=True)
+        for i in range(self.size):
+            for j in range(self.size-1):
+                label = '+' if not ((j+1) % self.region_size) else ''
+                graph.add_edge(str(i)+'-'+str(j), str(i)+'-'+str(j+1), label=label)
+        for i in range(self.size-1):
+            for j in range(self.size):
+                label = '+' if not ((i+1) % self.region_size) else ''
+                graph.add_edge(str(i)+'-'+str(j), str(i+1)+'-'+str(j), label=label)
+        return graph
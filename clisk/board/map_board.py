@@ -0,0 +1,41 @@
+from .board import Board
+from .board_map import load_map
+
+class MapBoard(Board):
+    """A board defined by a board definition file
+
+       Attributes:
+           positions (dict(str, list(float))): x, y position of each territory
+           borders (list((str, str, str))): Both territories and label of each border
+           regions (list(dict(str, val))): Region definitions
+           neighbors (dict(str, tuple(str))): Neighboring territories of each territory
+           territories (list(str)): All territories in the order they were added
+           player_territories (dict(str, dict(str, None))): Territories owned by each player
+           player_troops (dict(str, int)): Total number of troops of each player
+           owners (dict(str, str)): Player owning each territory
+           troops (dict(str, int)): Number of troops on each territory
+           history (list(list((str, str, int)))): Previous owner and troops of the territories changed by each applied action
+           hostile_counts (dict(str, int)): Number of neighbors owned by another player of each territory (0 if missing)
+           attackers (dict(str, dict(str, None))): Territories of each player able to attack
+           movers (dict(str, dict(str, None))): Territories of each player able to move troops
+           components (Components): Connected territories of each player when troops can move through them (None otherwise)
+           territory_regions (dict(str, list(int))): Indices of the regions containing each territory
+           region_counts (dict(str, list(int))): Number of territories owned by each player in each region
+           player_regions (dict(str, dict(int, None))): Indices of the regions completely owned by each player
+    """
+
+    def __init__(self, path):
+        """Initialize board
+
+           Args:
+               path (str): Path of board definition file
+        """
+        super(MapBoard, self).__init__()
+        board_map = load_map(path)
+        territories, positions = board_map.territories, board_map.positions
+        for i, territory in enumerate(territories):
+            self.add_territory(territory, pos=[positions[2*i], positions[2*i+1]])
+        borders, labels = board_map.borders, board_map.labels
+        for k, label in enumerate(board_map.border_labels):
+            self.add_border(territories[borders[2*k]], territories[borders[2*k+1]], label=labels[label])
+        for region in board_map.get_regions(): self.add_region(region['name'], region['value'], region['territories'])
@@ -0,0 +1,78 @@
+from __future__ import division
+import math
+
+def sample_binomial(n, p, random):
+    """Draw the number of successes of n independent trials
+
+       Uses inversion when few successes are expected and otherwise the
+       transformed rejection method with squeeze (BTRS, Hormann 1993),
+       so a draw takes constant time on average.
+
+       Args:
+           n (int): Number of trials
+           p (float): Probability of success of each trial
+           random (random): Random engine
+
+       Returns:
+           (int): Number of successes
+    """
+    if n <= 0: return 0
+    if p > 0.5: return n - sample_binomial(n, 1. - p, random)
+    if p <= 0.: return 0
+    q = 1. - p
+    if n * p < 10.:
+        # Inversion
+        s, r = p / q, q ** n
+        a = (n + 1) * s
+        while True:
+            u, k, f = random.random(), 0, r
+            while u > f and k < n:
+                u -= f
+                k += 1
+                f *= a / k - s
+            if u <= f: return k
+
+    # Transformed rejection with squeeze
+    spq = math.sqrt(n * p * q)
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    v_r = 0.92 - 4.2 / b
+    alpha = (2.83 + 5.1 / b) * spq
+    lpq = math.log(p / q)
+    m = int((n + 1) * p)
+    h = math.lgamma(m + 1) + math.lgamma(n - m + 1)
+    while True:
+        u = random.random() - 0.5
+        v = random.random()
+        us = 0.5 - abs(u)
+        k = int(math.floor((2. * a / us + b) * u + c))
+        if k < 0 or k > n: continue
+        if us >= 0.07 and v <= v_r: return k
+        v = math.log(v * alpha / (a / (us * us) + b))
+        if v <= h - math.lgamma(k + 1) - math.lgamma(n - k + 1) + (k - m) * lpq: return k
+
+def sample_multinomial(n, n_categories, random):
+    """Split n trials uniformly at random over a number of categories
+
+       Small splits draw a category per trial, larger ones draw one binomial
+       per category conditioned on the trials left.
+
+       Args:
+           n (int): Number of trials
+           n_categories (int): Number of equally likely categories
+           random (random): Random engine
+
+       Returns:
+           (list(int)): Number of trials falling in each category
+    """
+    counts = [0] * n_categories
+    if n <= n_categories:
+        for i in range(n): counts[int(random.random() * n_categories)] += 1
+        return counts
+    for i in range(n_categories - 1):
+        counts[i] = sample_binomial(n, 1. / (n_categories - i), random)
+        n -= counts[i]
+        if not n: return counts
+    counts[-1] = n
+    return counts
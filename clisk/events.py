@@ -0,0 +1,410 @@
+from __future__ import print_function
+
+class Event(object):
+    """Base game event
+    """
+    __slots__ = ()
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description (None if there is nothing to show)
+        """
+        raise NotImplementedError('format not implemented')
+
+class Start(Event):
+    """The game starts
+
+       Attributes:
+           players (list(str)): Names of players in turn order
+           board (Board): Initial state of the game board
+    """
+    __slots__ = ('players', 'board')
+
+    def __init__(self, players, board):
+        """Initialize event
+
+           Args:
+               players (list(str)): Names of players in turn order
+               board (Board): Initial state of the game board
+        """
+        self.players, self.board = players, board
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description (None if there is nothing to show)
+        """
+        return None
+
+class Turn(Event):
+    """A player starts their turn
+
+       Attributes:
+           player (str): Name of player
+           n_turns (int): Number of turns played so far, including this one
+    """
+    __slots__ = ('player', 'n_turns')
+
+    def __init__(self, player, n_turns):
+        """Initialize event
+
+           Args:
+               player (str): Name of player
+               n_turns (int): Number of turns played so far, including this one
+        """
+        self.player, self.n_turns = player, n_turns
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description (None if there is nothing to show)
+        """
+        return None
+
+class Collect(Event):
+    """A player receives troops for the territories they own
+
+       Attributes:
+           player (str): Name of player
+           n_troops (int): Number of troops received
+           n_territories (int): Number of territories owned
+    """
+    __slots__ = ('player', 'n_troops', 'n_territories')
+
+    def __init__(self, player, n_troops, n_territories):
+        """Initialize event
+
+           Args:
+               player (str): Name of player
+               n_troops (int): Number of troops received
+               n_territories (int): Number of territories owned
+        """
+        self.player, self.n_troops, self.n_territories = player, n_troops, n_territories
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description
+        """
+        return 'Player %s receives %i extra troops for owning %i territories' % (self.player, self.n_troops, self.n_territories)
+
+class RegionBonus(Event):
+    """A player receives troops for a region they own
+
+       Attributes:
+           player (str): Name of player
+           region (dict(str, val)): Region definition
+    """
+    __slots__ = ('player', 'region')
+
+    def __init__(self, player, region):
+        """Initialize event
+
+           Args:
+               player (str): Name of player
+               region (dict(str, val)): Region definition
+        """
+        self.player, self.region = player, region
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description
+        """
+        return 'Player %s receives %i extra troops for owning %s' % (self.player, self.region['value'], self.region['name'])
+
+class Placement(Event):
+    """A player places troops on a territory
+
+       Attributes:
+           player (str): Name of player
+           territory (str): Name of territory
+           n_troops (int): Number of troops placed
+    """
+    __slots__ = ('player', 'territory', 'n_troops')
+
+    def __init__(self, player, territory, n_troops):
+        """Initialize event
+
+           Args:
+               player (str): Name of player
+               territory (str): Name of territory
+               n_troops (int): Number of troops placed
+        """
+        self.player, self.territory, self.n_troops = player, territory, n_troops
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description
+        """
+        return 'Player %s is placing %i troop(s) on %s' % (self.player, self.n_troops, self.territory)
+
+class Attack(Event):
+    """A player attacks a territory
+
+       Attributes:
+           player (str): Name of attacking player
+           from_territory (str): Name of territory attacking
+           to_territory (str): Name of territory being attacked
+           to_player (str): Name of defending player
+           n_from_troops (int): Number of troops on the attacking territory
+           n_to_troops (int): Number of troops on the defending territory
+    """
+    __slots__ = ('player', 'from_territory', 'to_territory', 'to_player', 'n_from_troops', 'n_to_troops')
+
+    def __init__(self, player, from_territory, to_territory, to_player, n_from_troops, n_to_troops):
+        """Initialize event
+
+           Args:
+               player (str): Name of attacking player
+               from_territory (str): Name of territory attacking
+               to_territory (str): Name of territory being attacked
+               to_player (str): Name of defending player
+               n_from_troops (int): Number of troops on the attacking territory
+               n_to_troops (int): Number of troops on the defending territory
+        """
+        self.player, self.from_territory, self.to_territory = player, from_territory, to_territory
+        self.to_player, self.n_from_troops, self.n_to_troops = to_player, n_from_troops, n_to_troops
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description
+        """
+        return 'Player %s is attacking %s (o: %s, n: %i) from %s (o: %s, n: %i)' % (self.player, self.to_territory, self.to_player, self.n_to_troops,
+                                                                                   self.from_territory, self.player, self.n_from_troops)
+
+class Roll(Event):
+    """A single roll of the dice
+
+       Attributes:
+           attack_dice (list(int)): Attacking dice, highest first
+           defend_dice (list(int)): Defending dice, highest first
+           losses (list(int)): Number of attacking and defending troops lost
+    """
+    __slots__ = ('attack_dice', 'defend_dice', 'losses')
+
+    def __init__(self, attack_dice, defend_dice, losses):
+        """Initialize event
+
+           Args:
+               attack_dice (list(int)): Attacking dice, highest first
+               defend_dice (list(int)): Defending dice, highest first
+               losses (list(int)): Number of attacking and defending troops lost
+        """
+        self.attack_dice, self.defend_dice, self.losses = attack_dice, defend_dice, losses
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description
+        """
+        return ('Attacker rolled %s, defender rolled %s\n' % (str(self.attack_dice), str(self.defend_dice)) +
+                'Attacker loses %i troops, defender loses %i troops' % (self.losses[0], self.losses[1]))
+
+class Battle(Event):
+    """An attack to completion resolved in a single draw
+
+       Attributes:
+           losses (list(int)): Number of attacking and defending troops lost
+    """
+    __slots__ = ('losses',)
+
+    def __init__(self, losses):
+        """Initialize event
+
+           Args:
+               losses (list(int)): Number of attacking and defending troops lost
+        """
+        self.losses = losses
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description
+        """
+        return 'Attacker loses %i troops, defender loses %i troops' % (self.losses[0], self.losses[1])
+
+class Conquest(Event):
+    """A player conquers a territory
+
+       Attributes:
+           player (str): Name of player
+           from_territory (str): Name of territory attacking
+           to_territory (str): Name of territory conquered
+           n_troops (int): Number of troops moved into the conquered territory
+    """
+    __slots__ = ('player', 'from_territory', 'to_territory', 'n_troops')
+
+    def __init__(self, player, from_territory, to_territory, n_troops):
+        """Initialize event
+
+           Args:
+               player (str): Name of player
+               from_territory (str): Name of territory attacking
+               to_territory (str): Name of territory conquered
+               n_troops (int): Number of troops moved into the conquered territory
+        """
+        self.player, self.from_territory, self.to_territory, self.n_troops = player, from_territory, to_territory, n_troops
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description
+        """
+        return 'Player %s won %s and is moving %i troops' % (self.player, self.to_territory, self.n_troops)
+
+class Move(Event):
+    """A player moves troops between territories
+
+       Attributes:
+           player (str): Name of player
+           from_territory (str): Name of territory moved from
+           to_territory (str): Name of territory moved to
+           n_troops (int): Number of troops moved
+    """
+    __slots__ = ('player', 'from_territory', 'to_territory', 'n_troops')
+
+    def __init__(self, player, from_territory, to_territory, n_troops):
+        """Initialize event
+
+           Args:
+               player (str): Name of player
+               from_territory (str): Name of territory moved from
+               to_territory (str): Name of territory moved to
+               n_troops (int): Number of troops moved
+        """
+        self.player, self.from_territory, self.to_territory, self.n_troops = player, from_territory, to_territory, n_troops
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description
+        """
+        return 'Player %s is moving %i troops from %s to %s' % (self.player, self.n_troops, self.from_territory, self.to_territory)
+
+class GameOver(Event):
+    """A player wins the game
+
+       Attributes:
+           player (str): Name of winning player
+           board (Board): Final state of the game board
+    """
+    __slots__ = ('player', 'board')
+
+    def __init__(self, player, board):
+        """Initialize event
+
+           Args:
+               player (str): Name of winning player
+               board (Board): Final state of the game board
+        """
+        self.player, self.board = player, board
+
+    def format(self):
+        """Describe the event
+
+           Returns:
+               (str): Human readable description
+        """
+        return 'Player %s wins!' % (self.player)
+
+class Sink(object):
+    """Base receiver of game events
+    """
+
+    def handle(self, event):
+        """Receive an event
+
+           Args:
+               event (Event): Game event
+        """
+        raise NotImplementedError('handle not implemented')
+
+    def close(self):
+        """Flush and release any resources
+        """
+        pass
+
+class NullSink(Sink):
+    """Sink discarding all events
+    """
+
+    def handle(self, event):
+        """Receive an event
+
+           Args:
+               event (Event): Game event
+        """
+        pass
+
+class ConsoleSink(Sink):
+    """Sink printing events to the terminal and drawing the final board
+    """
+
+    def handle(self, event):
+        """Receive an event
+
+           Args:
+               event (Event): Game event
+        """
+        text = event.format()
+        if text is not None: print(text)
+        if isinstance(event, GameOver): event.board.draw()
+
+class FileSink(Sink):
+    """Sink writing events to a file in batches
+
+       Attributes:
+           file (file): Output file
+           buffer_size (int): Number of events to hold before writing
+           buffer (list(str)): Events waiting to be written
+    """
+
+    def __init__(self, path, buffer_size=1000):
+        """Initialize sink
+
+           Args:
+               path (str): Path of output file
+               buffer_size (int): Number of events to hold before writing
+        """
+        self.file = open(path, 'w')
+        self.buffer_size = buffer_size
+        self.buffer = []
+
+    def handle(self, event):
+        """Receive an event
+
+           Args:
+               event (Event): Game event
+        """
+        text = event.format()
+        if text is None: return
+        self.buffer.append(text)
+        if len(self.buffer) >= self.buffer_size: self.flush()
+
+    def flush(self):
+        """Write out the buffered events
+        """
+        if self.buffer:
+            self.file.write('\n'.join(self.buffer) + '\n')
+            self.buffer = []
+
+    def close(self):
+        """Flush and release any resources
+        """
+        self.flush()
+        self.file.close()
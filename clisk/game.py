@@ -1,3 +1,9 @@
+from .battle import sample_battle
+from .distributions import sample_multinomial
+from .stats import Stats, Instrumented, clock
+from .events import Start, Turn, Collect, RegionBonus, Placement, Attack, Roll, Battle, Conquest, Move, GameOver
+from .snapshot import PHASES, dump_game, load_game
+
 class Game(object):
     """Game class
 
@@ -5,20 +11,44 @@ class Game(object):
            players (list(Player)): List of players
            board (Board): State of the game board
            random (random): Random engine
+           instant_battles (bool): Whether or not to resolve attacks to completion in a single draw
+           sinks (list(Sink)): Receivers of game events
+           n_turns (int): Number of turns played so far
+           player_index (int): Index of the player whose turn it is or is next
+           phase (str): Phase of the current turn ('start' between turns)
+           started (bool): Whether or not the sinks were sent the start of the game
+           winner (str): Name of the winning player (None while the game is running)
+           stats (Stats): Wall time and call counts of phases, player decisions and board queries (None if not instrumented)
     """
 
-    def __init__(self, players, board, random):
+    def __init__(self, players, board, random, instant_battles=False, setup=True):
         """Initialize game
 
            Args:
                players (list(Player)): List of players
                board (Board): State of the game board
                random (random): Random engine
+               instant_battles (bool): Whether or not to resolve attacks to completion in a single draw
+               setup (bool): Whether or not to randomly distribute territories and troops (if False, continue from the board as is)
         """
         self.players = players
         self.board = board
         self.random = random
+        self.instant_battles = instant_battles
+        self.sinks = []
+        self.n_turns = 0
+        self.player_index = 0
+        self.phase = 'start'
+        self.started = False
+        self.winner = None
+        self.stats = None
+        names = [player.name for player in players]
+        for player in players: player.start_game(names)
+        if setup: self.setup()
 
+    def setup(self):
+        """Randomly distribute territories and starting troops
+        """
         # Randomly distribute territories
         territories = self.board.get_territories()
         n_territories = len(territories)
@@ -39,11 +69,49 @@ class Game(object):
         starting_troops = 40 - (5 * (n_players - 2))
         for player in self.players:
             territories = self.board.get_territories(player.name)
-            total_troops = len(territories)
-            while total_troops < starting_troops:
-                territory = self.random.choice(territories)
-                self.board.set_n_troops(territory, self.board.get_n_troops(territory) + 1)
-                total_troops += 1
+            counts = sample_multinomial(starting_troops - len(territories), len(territories), self.random)
+            self.board.add_troops(dict((t, n) for t, n in zip(territories, counts) if n))
+
+    def instrument(self, stats=None):
+        """Record the wall time and number of calls of each phase, player decision, board query and sink
+
+           Players, the board and sinks are replaced by proxies timing their
+           method calls. The placement phase includes the collection of troops.
+
+           Args:
+               stats (Stats): Stats to record to (if None, start new stats)
+
+           Returns:
+               (Stats): Stats recorded to
+        """
+        self.stats = stats or Stats()
+        self.board = Instrumented(self.board, 'board', self.stats)
+        self.players = [Instrumented(player, 'player.' + player.name, self.stats) for player in self.players]
+        self.sinks = [Instrumented(sink, 'sink', self.stats) for sink in self.sinks]
+        return self.stats
+
+    def add_sink(self, sink):
+        """Send game events to a sink
+
+           Args:
+               sink (Sink): Receiver of game events
+        """
+        if self.stats: sink = Instrumented(sink, 'sink', self.stats)
+        self.sinks.append(sink)
+
+    def close(self):
+        """Close the sinks and players of the game
+        """
+        for sink in self.sinks: sink.close()
+        for player in self.players: player.close()
+
+    def emit(self, event):
+        """Send an event to all sinks
+
+           Args:
+               event (Event): Game event
+        """
+        for sink in self.sinks: sink.handle(event)
 
     def is_game_over(self):
         """Check if game is over
@@ -51,11 +119,11 @@ class Game(object):
            Returns:
                (bool): Whether or not the game is over
         """
-        n_territories = len(self.board.get_territories())
+        n_territories = self.board.count_territories()
         for player in self.players:
-            if len(self.board.get_territories(player.name)) == n_territories:
-                print('Player %s wins!' % (player.name))
-                self.board.draw()
+            if self.board.count_territories(player.name) == n_territories:
+                self.winner = player.name
+                if self.sinks: self.emit(GameOver(player.name, self.board))
                 return True
         return False
 
@@ -72,10 +140,10 @@ class Game(object):
         n_territories = len(territories)
         if not n_territories: return 0
         n_troops = max(3, n_territories // 3)
-        print('Player %s receives %i extra troops for owning %i territories' % (player.name, n_troops, n_territories))
-        regions = self.board.get_regions(territories)
+        if self.sinks: self.emit(Collect(player.name, n_troops, n_territories))
+        regions = self.board.get_player_regions(player.name)
         for region in regions:
-            print('Player %s receives %i extra troops for owning %s' % (player.name, region['value'], region['name']))
+            if self.sinks: self.emit(RegionBonus(player.name, region))
             n_troops += region['value']
         return n_troops
 
@@ -88,14 +156,13 @@ class Game(object):
         """
         attack_dice = sorted([self.random.randint(1, 6) for x in range(n_attack_dice)], reverse=True)
         defend_dice = sorted([self.random.randint(1, 6) for x in range(n_defend_dice)], reverse=True)
-        print('Attacker rolled %s, defender rolled %s' % (str(attack_dice), str(defend_dice)))
         losses = [0, 0]
         for i in range(min(n_attack_dice, n_defend_dice)):
             if attack_dice[i] > defend_dice[i]:
                 losses[1] += 1
             else:
                 losses[0] += 1
-        print('Attacker loses %i troops, defender loses %i troops' % (losses[0], losses[1]))
+        if self.sinks: self.emit(Roll(attack_dice, defend_dice, losses))
         return losses
 
     def attack_to_completion(self, from_territory, to_territory):
@@ -105,19 +172,19 @@ class Game(object):
                from_territory (str): Name of territory attacking
                to_territory (str): Name of territory begin attacked
         """
+        if self.instant_battles: return self.attack_instantly(from_territory, to_territory)
         from_player = self.board.get_owner(from_territory)
         to_player = self.board.get_owner(to_territory)
         while (self.board.get_n_troops(from_territory) > 1):
             n_from_troops = self.board.get_n_troops(from_territory)
             n_to_troops = self.board.get_n_troops(to_territory)
 
-            print('Player %s is attacking %s (o: %s, n: %i) from %s (o: %s, n: %i)' %
-                  (from_player, to_territory, to_player, n_to_troops, from_territory, from_player, n_from_troops))
+            if self.sinks: self.emit(Attack(from_player, from_territory, to_territory, to_player, n_from_troops, n_to_troops))
 
             # Roll the dice
             n_attack_dice = min(3, n_from_troops-1)
             n_defend_dice = min(2, n_to_troops)
-            losses = self.roll(n_attack_dice, n_defend_dice)
+            losses = self.stats.call('roll', self.roll, n_attack_dice, n_defend_dice) if self.stats else self.roll(n_attack_dice, n_defend_dice)
 
             # Apply the losses
             self.board.set_n_troops(from_territory, n_from_troops - losses[0])
@@ -129,35 +196,219 @@ class Game(object):
                 n_move_troops = self.board.get_n_troops(from_territory) - 1
                 self.board.set_n_troops(to_territory, n_move_troops)
                 self.board.set_n_troops(from_territory, 1)
-                print('Player %s won %s and is moving %i troops' % (from_player, to_territory, n_move_troops))
+                if self.sinks: self.emit(Conquest(from_player, from_territory, to_territory, n_move_troops))
                 return
 
-    def play(self):
+    def attack_instantly(self, from_territory, to_territory):
+        """Attack to completion, drawing the final result from the exact battle outcome distribution
+
+           Args:
+               from_territory (str): Name of territory attacking
+               to_territory (str): Name of territory begin attacked
+        """
+        from_player = self.board.get_owner(from_territory)
+        to_player = self.board.get_owner(to_territory)
+        n_from_troops = self.board.get_n_troops(from_territory)
+        n_to_troops = self.board.get_n_troops(to_territory)
+        if n_from_troops < 2: return
+
+        n_from_left, n_to_left = sample_battle(n_from_troops, n_to_troops, self.random)
+        if self.sinks:
+            self.emit(Attack(from_player, from_territory, to_territory, to_player, n_from_troops, n_to_troops))
+            self.emit(Battle([n_from_troops - n_from_left, n_to_troops - n_to_left]))
+
+        # Apply the result
+        if n_to_left:
+            self.board.set_n_troops(from_territory, n_from_left)
+            self.board.set_n_troops(to_territory, n_to_left)
+        else:
+            self.board.set_n_troops(to_territory, 0)
+            self.board.assign(to_territory, from_player)
+            self.board.set_n_troops(to_territory, n_from_left - 1)
+            self.board.set_n_troops(from_territory, 1)
+            if self.sinks: self.emit(Conquest(from_player, from_territory, to_territory, n_from_left - 1))
+
+    def start_turn(self, player):
+        """Begin a player's turn, unless the game stopped in the middle of it
+
+           Args:
+               player (Player): Player whose turn it is
+
+           Returns:
+               (tuple(str)): Phases left to play
+        """
+        if self.phase == 'start':
+            self.n_turns += 1
+            if self.sinks: self.emit(Turn(player.name, self.n_turns))
+            return PHASES[1:]
+        return PHASES[PHASES.index(self.phase):]
+
+    def play_turn(self, player):
+        """Play a single turn (or the rest of it if the game stopped in the middle)
+
+           Args:
+               player (Player): Player whose turn it is
+        """
+        self.decide(self.turn_steps(player))
+
+    def turn_steps(self, player):
+        """Play a single turn (or the rest of it if the game stopped in the middle), yielding the player's decisions
+
+           Args:
+               player (Player): Player whose turn it is
+        """
+        for phase in self.start_turn(player):
+            self.phase = phase
+            if self.stats: start = clock()
+            steps, answer = getattr(self, phase + '_steps')(player), None
+            while True:
+                try:
+                    decision = steps.send(answer)
+                except StopIteration:
+                    break
+                answer = yield decision
+            if self.stats: self.stats.add('phase.' + phase, clock() - start)
+        self.phase = 'start'
+
+        # TODO: Add cards
+
+    def placement_phase(self, player):
+        """Collect and place troops
+
+           Args:
+               player (Player): Player whose turn it is
+        """
+        self.decide(self.placement_steps(player))
+
+    def attack_phase(self, player):
+        """Attack until the player stops
+
+           Args:
+               player (Player): Player whose turn it is
+        """
+        self.decide(self.attack_steps(player))
+
+    def move_phase(self, player):
+        """Move troops at the end of a turn
+
+           Args:
+               player (Player): Player whose turn it is
+        """
+        self.decide(self.move_steps(player))
+
+    def decide(self, steps):
+        """Run steps, answering each decision by calling the player
+
+           Args:
+               steps (generator): Steps yielding decisions
+        """
+        answer = None
+        try:
+            while True:
+                player, method, args = steps.send(answer)
+                answer = getattr(player, method)(self.board, *args)
+        except StopIteration:
+            pass
+
+    def placement_steps(self, player):
+        """Collect and place troops, yielding the player's decisions
+
+           Each decision is a tuple (player, name of Player method, arguments
+           after the board) and expects the method's return value to be sent
+           back.
+
+           Args:
+               player (Player): Player whose turn it is
+        """
+        n_troops = self.stats.call('phase.collect', self.collect_troops, player) if self.stats else self.collect_troops(player)
+        placements = yield player, 'place_troops', (n_troops,)
+        self.board.add_troops(placements)
+        if self.sinks:
+            for territory, n_troops in placements.items(): self.emit(Placement(player.name, territory, n_troops))
+
+    def attack_steps(self, player):
+        """Attack until the player stops, yielding the player's decisions
+
+           Args:
+               player (Player): Player whose turn it is
+        """
+        while (yield player, 'do_attack', ()):
+            from_territory, to_territory = yield player, 'attack', ()
+            if from_territory and to_territory:
+                # TODO: don't always attack until completion
+                if self.stats: self.stats.call('attack_to_completion', self.attack_to_completion, from_territory, to_territory)
+                else: self.attack_to_completion(from_territory, to_territory)
+
+    def move_steps(self, player):
+        """Move troops at the end of a turn, yielding the player's decisions
+
+           Args:
+               player (Player): Player whose turn it is
+        """
+        while (yield player, 'do_move_troops', ()):
+            from_territory, to_territory, n_move_troops = yield player, 'move_troops', ()
+            if from_territory and to_territory and n_move_troops:
+                self.board.set_n_troops(from_territory, self.board.get_n_troops(from_territory) - n_move_troops)
+                self.board.set_n_troops(to_territory, self.board.get_n_troops(to_territory) + n_move_troops)
+                if self.sinks: self.emit(Move(player.name, from_territory, to_territory, n_move_troops))
+                break # Only 1 move per turn
+
+    def steps(self, n_turns=None):
+        """Run the main game loop, yielding the players' decisions
+
+           Lets a caller such as the game server wait for decisions without
+           blocking, see placement_steps for the decisions. The game continues
+           from its current player and phase, so it can be stopped between
+           any two decisions and resumed from a snapshot.
+
+           Args:
+               n_turns (int): Number of turns to play before stopping (if None, play until the game is over)
+        """
+        if self.sinks and not self.started: self.emit(Start([player.name for player in self.players], self.board))
+        self.started = True
+        n_played = 0
+        while self.winner is None and (n_turns is None or n_played < n_turns):
+            if self.player_index == 0 and self.phase == 'start' and self.is_game_over(): break
+            steps, answer = self.turn_steps(self.players[self.player_index]), None
+            while True:
+                try:
+                    decision = steps.send(answer)
+                except StopIteration:
+                    break
+                answer = yield decision
+            self.player_index = (self.player_index + 1) % len(self.players)
+            n_played += 1
+
+    def play(self, n_turns=None):
         """Run the main game loop
+
+           Args:
+               n_turns (int): Number of turns to play before returning (if None, play until the game is over)
+
+           Returns:
+               (str): Name of the winning player (None if the game is not over)
+        """
+        if self.stats: start = clock()
+        self.decide(self.steps(n_turns))
+        if self.stats: self.stats.add('game', clock() - start)
+        return self.winner
+
+    def dumps(self, random=True):
+        """Take a binary snapshot of the game state, see snapshot.dump_game
+
+           Args:
+               random (bool): Whether or not to include the state of the random engines
+
+           Returns:
+               (bytes): Snapshot
+        """
+        return dump_game(self, random)
+
+    def loads(self, data, random=True):
+        """Restore the game state from a binary snapshot, see snapshot.load_game
+
+           Args:
+               data (bytes): Snapshot
+               random (bool): Whether or not to restore the state of the random engines (if False, continue with the current engines, e.g. to fork new continuations)
         """
-        while not self.is_game_over():
-            for player in self.players:
-                # Troop placement phase
-                n_troops = self.collect_troops(player)
-                placements = player.place_troops(self.board, n_troops)
-                for territory, n_troops in placements.items():
-                    self.board.set_n_troops(territory, self.board.get_n_troops(territory) + n_troops)
-                    print('Player %s is placing %i troop(s) on %s' % (player.name, n_troops, territory))
-
-                # Attack phase
-                while(player.do_attack(self.board)):
-                    from_territory, to_territory = player.attack(self.board)
-                    if from_territory and to_territory:
-                        # TODO: don't always attack until completion
-                        self.attack_to_completion(from_territory, to_territory)
-
-                # Troop move phase
-                while(player.do_move_troops(self.board)):
-                    from_territory, to_territory, n_move_troops = player.move_troops(self.board)
-                    if from_territory and to_territory and n_move_troops:
-                        self.board.set_n_troops(from_territory, self.board.get_n_troops(from_territory) - n_move_troops)
-                        self.board.set_n_troops(to_territory, self.board.get_n_troops(to_territory) + n_move_troops)
-                        print('Player %s is moving %i troops from %s to %s' % (player.name, n_move_troops, from_territory, to_territory))
-                        break # Only 1 move per turn
-
-                # TODO: Add cards
+        load_game(self, data, random)
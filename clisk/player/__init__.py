@@ -1,20 +1,36 @@
 import sys
-from human_player import HumanPlayer
-from random_player import RandomPlayer
 
 def create_player(name, type, random):
     """Player factory
 
        Args:
            name (str): Nmae of player
-           type (str): Type of player
+           type (str): Type of player (mcts:<key=value,...> for search options, bot:<command> or bot@<address> for an external bot)
            random (random): Random engine
 
        Returns:
            (Player): Player
     """
-    if type == 'human': return HumanPlayer(name)
-    elif type == 'random': return RandomPlayer(name, random)
+    # Player modules are only imported when selected (human players need readline)
+    if type == 'human':
+        from .human_player import HumanPlayer
+        return HumanPlayer(name)
+    elif type == 'random':
+        from .random_player import RandomPlayer
+        return RandomPlayer(name, random)
+    elif type == 'mcts' or type.startswith('mcts:'):
+        from .mcts_player import MCTSPlayer, parse_options
+        try:
+            return MCTSPlayer(name, random, **parse_options(type[5:]))
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+    elif type == 'greedy':
+        from .greedy_player import GreedyPlayer
+        return GreedyPlayer(name)
+    elif type.startswith('bot:') or type.startswith('bot@'):
+        from .bot_player import BotPlayer, get_client
+        return BotPlayer(name, get_client(type))
     else:
         print('error: Unrecognized player type: %s' % (type))
         sys.exit(1)
@@ -0,0 +1,266 @@
+import json, shlex, socket, subprocess
+from ..protocol import get_topology, get_state, parse_answer
+from .player import Player
+
+class BotClient(object):
+    """Connection to an external bot answering decisions in batches
+
+       The bot reads and writes one JSON object per line, over its standard
+       input and output or over a socket:
+
+           -> {"type": "start", "seat": 0, "name": "ai", "players": [...], "territories": [...], "neighbors": [...]}
+           -> {"type": "decisions", "requests": [{"seat": 0, "method": "place_troops", "args": [3], "owners": [...], "troops": [...]}, ...]}
+           <- {"type": "answers", "answers": [{"Alaska": 3}, ...]}
+           -> {"type": "game_over", "seat": 0, "winner": "ai"}
+
+       Each seat is one bot player in one game, started before its first
+       decision. Only the decisions message expects a reply, with one answer
+       per request in order, each in the JSON form of the return value of
+       the Player method. Neighbors, owners and troops are listed in the
+       order of the territories of the start message, neighbors as territory
+       indices. Game over is only sent for games played with play_games.
+
+       Attributes:
+           process (subprocess.Popen): Bot process (None if connected over a socket)
+           socket (socket.socket): Bot socket (None if connected over a pipe)
+           input (file): Stream of bot messages
+           output (file): Stream of messages to the bot
+           n_seats (int): Number of seats created so far
+           n_requests (int): Number of decision messages sent so far
+    """
+
+    def __init__(self, command=None, address=None):
+        """Start a bot process or connect to a running bot
+
+           Args:
+               command (str): Command starting the bot process
+               address (str): Address of a running bot, as host:port or the path of a Unix socket (used if command is None)
+        """
+        self.process, self.socket = None, None
+        if command is not None:
+            self.process = subprocess.Popen(shlex.split(command), stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            self.input, self.output = self.process.stdout, self.process.stdin
+        else:
+            host, _, port = address.rpartition(':')
+            if host and port.isdigit():
+                self.socket = socket.create_connection((host, int(port)))
+            else:
+                self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.socket.connect(address)
+            self.input, self.output = self.socket.makefile('rb'), self.socket.makefile('wb')
+        self.n_seats = 0
+        self.n_requests = 0
+
+    def send(self, message):
+        """Write a message
+
+           Args:
+               message (dict(str, val)): Message
+        """
+        self.output.write((json.dumps(message, separators=(',', ':')) + '\n').encode('utf-8'))
+
+    def receive(self):
+        """Wait for the next message
+
+           Returns:
+               (dict(str, val)): Message
+        """
+        line = self.input.readline()
+        if not line: raise IOError('bot closed the connection')
+        return json.loads(line.decode('utf-8'))
+
+    def add_seat(self):
+        """Reserve a seat for a bot player
+
+           Returns:
+               (int): Seat number
+        """
+        self.n_seats += 1
+        return self.n_seats - 1
+
+    def decide(self, requests):
+        """Request a batch of decisions in a single round trip
+
+           Args:
+               requests (list((BotPlayer, Board, str, tuple))): Player, gameboard, name of Player method and arguments after the board of each decision
+
+           Returns:
+               (list(val)): Return value of the method of each decision
+        """
+        messages = []
+        for player, board, method, args in requests:
+            if not player.started:
+                territories, neighbors = get_topology(board)
+                self.send({'type': 'start', 'seat': player.seat, 'name': player.name, 'players': board.get_players(),
+                           'territories': territories, 'neighbors': neighbors})
+                player.started = True
+            owners, troops = get_state(board)
+            messages.append({'seat': player.seat, 'method': method, 'args': list(args), 'owners': owners, 'troops': troops})
+        self.send({'type': 'decisions', 'requests': messages})
+        self.output.flush()
+        self.n_requests += 1
+        message = self.receive()
+        answers = message.get('answers')
+        if message.get('type') != 'answers' or not isinstance(answers, list) or len(answers) != len(requests):
+            raise ValueError('bot did not answer the %i decisions requested' % (len(requests)))
+        values = []
+        for (player, board, method, args), answer in zip(requests, answers):
+            try:
+                values.append(parse_answer(board, player.name, method, args, answer))
+            except (ValueError, TypeError, KeyError) as e:
+                raise ValueError('bot answered %s to %s for %s: %s' % (json.dumps(answer), method, player.name, e))
+        return values
+
+    def end(self, player, winner):
+        """Tell the bot that the game of a seat is over
+
+           Args:
+               player (BotPlayer): Bot player of the seat
+               winner (str): Name of the winning player
+        """
+        if not player.started: return
+        self.send({'type': 'game_over', 'seat': player.seat, 'winner': winner})
+        self.output.flush()
+
+    def close(self):
+        """Disconnect from the bot (a bot process exits once its input is closed)
+        """
+        self.output.close()
+        if self.process: self.process.wait()
+        if self.socket: self.socket.close()
+
+# Bot connections by player type, shared by all the games of a process
+clients = {}
+
+def get_client(type):
+    """Return the connection to the bot of a player type, connecting on first use
+
+       Args:
+           type (str): Player type, bot:<command> to start a bot process or bot@<address> to connect to a running bot
+
+       Returns:
+           (BotClient): Bot connection
+    """
+    if type not in clients:
+        if type.startswith('bot:'): clients[type] = BotClient(command=type[4:])
+        else: clients[type] = BotClient(address=type[4:])
+    return clients[type]
+
+class BotPlayer(Player):
+    """BotPlayer class forwarding decisions to an external bot
+
+       Attributes:
+           name (str): Player name
+           client (BotClient): Bot connection
+           seat (int): Seat number of the player with the bot
+           started (bool): Whether or not the bot was sent the start of the game
+    """
+    slow = True
+
+    def __init__(self, name, client):
+        """Initialize player
+
+           Args:
+               name (str): Player name
+               client (BotClient): Bot connection
+        """
+        super(BotPlayer, self).__init__(name)
+        self.client = client
+        self.seat = client.add_seat()
+        self.started = False
+
+    def place_troops(self, board, n_troops):
+        """Place troops on territories
+
+           Args:
+               board (Gameboard): The gameboard
+               n_troops (int): Number of new troops to deploy
+
+           Returns:
+               (dict(str, int)): Dictionary of territories with number of troops to be deployed
+        """
+        return self.client.decide([(self, board, 'place_troops', (n_troops,))])[0]
+
+    def do_attack(self, board):
+        """Decide whether or not to continue attacking
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (bool): Whether or not to continue attacking
+        """
+        return self.client.decide([(self, board, 'do_attack', ())])[0]
+
+    def attack(self, board):
+        """Attack phase
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (str, str): from_territory, to_territory
+        """
+        return self.client.decide([(self, board, 'attack', ())])[0]
+
+    def do_move_troops(self, board):
+        """Decide whether or not to move troops
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (bool): Whether or not to move troops
+        """
+        return self.client.decide([(self, board, 'do_move_troops', ())])[0]
+
+    def move_troops(self, board):
+        """Troop movement phase
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (str, str, int): from_territory, to_territory, n_troops
+        """
+        return self.client.decide([(self, board, 'move_troops', ())])[0]
+
+def play_games(games):
+    """Play games together, sending the pending decisions of all their bot players in one batch per bot
+
+       Other players decide as in Game.play.
+
+       Args:
+           games (list(Game)): Games to play
+
+       Returns:
+           (list(str)): Name of the winning player of each game
+    """
+    steps = [game.steps() for game in games]
+    answers = [None] * len(games)
+    active = list(range(len(games)))
+    while active:
+        # Run each game up to its next bot decision
+        batches, waiting = {}, []
+        for i in active:
+            game = games[i]
+            try:
+                while True:
+                    player, method, args = steps[i].send(answers[i])
+                    client = getattr(player, 'client', None)
+                    if client is None:
+                        answers[i] = getattr(player, method)(game.board, *args)
+                    else:
+                        batches.setdefault(client, []).append((i, (player, game.board, method, args)))
+                        waiting.append(i)
+                        break
+            except StopIteration:
+                for player in game.players:
+                    if getattr(player, 'client', None): player.client.end(player, game.winner)
+
+        # Ask each bot for all of its decisions at once
+        for client, requests in batches.items():
+            values = client.decide([request for i, request in requests])
+            for (i, request), value in zip(requests, values): answers[i] = value
+        active = waiting
+    return [game.winner for game in games]
@@ -0,0 +1,258 @@
+from __future__ import division
+from ..battle import get_win_probability
+from .player import Player
+
+def get_region_value(board, player, territory):
+    """Value a player gets from the regions of a territory by conquering it
+
+       Args:
+           board (Board): The gameboard
+           player (str): Name of player
+           territory (str): Name of territory
+
+       Returns:
+           (float): Region values weighted by the square of the share of each region the player would own, plus the value of the regions the conquest takes from its owner
+    """
+    owner = board.get_owner(territory)
+    value = 0.
+    for r in board.get_territory_regions(territory):
+        region = board.regions[r]
+        n_territories = len(region['territories'])
+        value += region['value'] * ((board.count_region_territories(r, player) + 1) / n_territories) ** 2
+        if owner is not None and owner != player and board.count_region_territories(r, owner) == n_territories: value += region['value']
+    return value
+
+def get_threat(board, player, territory):
+    """Return the largest attack a territory faces from another player
+
+       Args:
+           board (Board): The gameboard
+           player (str): Name of player holding or taking the territory
+           territory (str): Name of territory
+
+       Returns:
+           (int): Number of troops on the strongest neighbor owned by another player (0 if none can attack)
+    """
+    n_troops = 0
+    for neighbor in board.get_neighbors(territory):
+        if board.get_owner(neighbor) != player: n_troops = max(n_troops, board.get_n_troops(neighbor))
+    return n_troops if n_troops > 1 else 0
+
+class GreedyPlayer(Player):
+    """GreedyPlayer class picking the attack of highest expected value, without search
+
+       Attacks are scored by their probability of conquest, read from the
+       odds table of battle.get_win_probability, times the value of the
+       territory and its regions and the probability of holding it against
+       the strongest neighbor. Each decision only looks at border territories
+       and their neighbors.
+
+       Attributes:
+           name (str): Player name
+           loss_weight (float): Cost of a failed attack, in territories
+           defense_share (float): Largest share of new troops placed to defend owned regions
+           planned_attack (tuple): Attack chosen by do_attack (from_territory, to_territory)
+           planned_move (tuple): Move chosen by do_move_troops (from_territory, to_territory, n_troops)
+    """
+
+    def __init__(self, name, loss_weight=0.5, defense_share=0.5):
+        """Initialize player
+
+           Args:
+               name (str): Player name
+               loss_weight (float): Cost of a failed attack, in territories
+               defense_share (float): Largest share of new troops placed to defend owned regions
+        """
+        super(GreedyPlayer, self).__init__(name)
+        self.loss_weight = loss_weight
+        self.defense_share = defense_share
+        self.planned_attack = None
+        self.planned_move = None
+
+    def get_state(self):
+        """Return the state kept between decisions, for game snapshots
+
+           Returns:
+               (dict(str, val)): JSON serializable state
+        """
+        return {'planned_attack': self.planned_attack, 'planned_move': self.planned_move}
+
+    def set_state(self, state):
+        """Restore the state kept between decisions from a game snapshot
+
+           Args:
+               state (dict(str, val)): State returned by get_state
+        """
+        self.planned_attack = tuple(state['planned_attack']) if state.get('planned_attack') else None
+        self.planned_move = tuple(state['planned_move']) if state.get('planned_move') else None
+
+    def get_borders(self, board):
+        """Return the player's territories next to another player's
+
+           Found from the attacking territories of all players, so only the
+           territories of the other players able to attack and those with a
+           troop to spare are looked at.
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (list(str)): Border territories
+        """
+        borders = dict.fromkeys(board.get_attacking_territories(self.name))
+        for player in board.get_players():
+            if player == self.name: continue
+            for territory in board.get_attacking_territories(player):
+                for neighbor in board.get_hostile_neighbors(territory):
+                    if board.get_owner(neighbor) == self.name: borders[neighbor] = None
+        if not borders: borders = dict.fromkeys(t for t in board.get_territories(self.name) if board.get_hostile_neighbors(t))
+        return list(borders)
+
+    def get_targets(self, board, territories):
+        """Value and threat of the territories attackable from some territories
+
+           Args:
+               board (Gameboard): The gameboard
+               territories (list(str)): Attacking territories
+
+           Returns:
+               (dict(str, (float, int))): Value in territories and threat after conquest of each hostile neighbor
+        """
+        targets = {}
+        for territory in territories:
+            for neighbor in board.get_hostile_neighbors(territory):
+                if neighbor not in targets:
+                    targets[neighbor] = (1. + get_region_value(board, self.name, neighbor), get_threat(board, self.name, neighbor))
+        return targets
+
+    def score_attack(self, n_from_troops, n_to_troops, value, threat):
+        """Expected value of an attack to completion
+
+           Args:
+               n_from_troops (int): Number of troops on the attacking territory
+               n_to_troops (int): Number of troops on the defending territory
+               value (float): Value of the defending territory in territories
+               threat (int): Largest attack the defending territory faces once conquered
+
+           Returns:
+               (float): Expected gain in territories
+        """
+        p_win = get_win_probability(n_from_troops, n_to_troops)
+        p_hold = 1. - get_win_probability(threat, max(1, n_from_troops - 1 - n_to_troops)) if threat else 1.
+        return p_win * p_hold * value - (1. - p_win) * self.loss_weight
+
+    def place_troops(self, board, n_troops):
+        """Place troops on territories
+
+           Up to defense_share of the troops go to borders of owned regions
+           facing a stronger neighbor, the rest to the territory with the
+           best attack once reinforced.
+
+           Args:
+               board (Gameboard): The gameboard
+               n_troops (int): Number of new troops to deploy
+
+           Returns:
+               (dict(str, int)): Dictionary of territories with number of troops to be deployed
+        """
+        borders = self.get_borders(board)
+        if not n_troops or not borders: return {}
+        placements = {}
+
+        # Defend owned regions, the most valuable first
+        defenses = []
+        for territory in borders:
+            stake = sum(board.regions[r]['value'] for r in board.get_territory_regions(territory)
+                        if board.count_region_territories(r, self.name) == len(board.regions[r]['territories']))
+            n_needed = get_threat(board, self.name, territory) - board.get_n_troops(territory) + 1
+            if stake and n_needed > 0: defenses.append((stake, n_needed, territory))
+        n_defense = int(n_troops * self.defense_share)
+        for stake, n_needed, territory in sorted(defenses, reverse=True):
+            if not n_defense: break
+            n = min(n_needed, n_defense)
+            placements[territory] = n
+            n_defense -= n
+
+        # Mass the rest where it makes the best attack
+        n_left = n_troops - sum(placements.values())
+        if n_left:
+            targets = self.get_targets(board, borders)
+            best_score, best_territory = None, borders[0]
+            for territory in borders:
+                n_from_troops = board.get_n_troops(territory) + placements.get(territory, 0) + n_left
+                for neighbor in board.get_hostile_neighbors(territory):
+                    score = self.score_attack(n_from_troops, board.get_n_troops(neighbor), *targets[neighbor])
+                    if best_score is None or score > best_score: best_score, best_territory = score, territory
+            placements[best_territory] = placements.get(best_territory, 0) + n_left
+        return placements
+
+    def do_attack(self, board):
+        """Decide whether or not to continue attacking
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (bool): Whether or not to continue attacking
+        """
+        best_score, self.planned_attack = 0., None
+        attackers = board.get_attacking_territories(self.name)
+        targets = self.get_targets(board, attackers)
+        for from_territory in attackers:
+            n_from_troops = board.get_n_troops(from_territory)
+            for to_territory in board.get_hostile_neighbors(from_territory):
+                score = self.score_attack(n_from_troops, board.get_n_troops(to_territory), *targets[to_territory])
+                if score > best_score: best_score, self.planned_attack = score, (from_territory, to_territory)
+        return self.planned_attack is not None
+
+    def attack(self, board):
+        """Attack phase
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (str, str): from_territory, to_territory
+        """
+        if not self.planned_attack: return None, None
+        from_territory, to_territory = self.planned_attack
+        self.planned_attack = None
+        return from_territory, to_territory
+
+    def do_move_troops(self, board):
+        """Decide whether or not to move troops
+
+           Plans moving the troops of the largest interior territory to the
+           most threatened border it can reach.
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (bool): Whether or not to move troops
+        """
+        self.planned_move = None
+        interior = [t for t in board.get_moving_territories(self.name) if not board.get_hostile_neighbors(t)]
+        if not interior: return False
+        from_territory = max(interior, key=board.get_n_troops)
+        best_need = None
+        for to_territory in board.get_move_targets(from_territory):
+            if not board.get_hostile_neighbors(to_territory): continue
+            need = get_threat(board, self.name, to_territory) - board.get_n_troops(to_territory)
+            if best_need is None or need > best_need:
+                best_need, self.planned_move = need, (from_territory, to_territory, board.get_n_troops(from_territory) - 1)
+        return self.planned_move is not None
+
+    def move_troops(self, board):
+        """Troop movement phase
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (str, str, int): from_territory, to_territory, n_troops
+        """
+        if not self.planned_move: return None, None, 0
+        from_territory, to_territory, n_troops = self.planned_move
+        self.planned_move = None
+        return from_territory, to_territory, n_troops
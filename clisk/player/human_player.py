@@ -1,5 +1,10 @@
 import readline
-from player import Player
+from .player import Player
+
+try:
+    input = raw_input
+except NameError:
+    pass
 
 class HumanPlayer(Player):
     """HumanPlayer class
@@ -109,7 +114,7 @@ class HumanPlayer(Player):
         # Get moving territories and number of troops from user
         from_territory = self.get_territory(from_territories, prompt='Enter a territory to move from')
         if from_territory:
-            to_territory = self.get_territory(board.get_friendly_neighbors(from_territory), prompt='Enter a territory to move to')
+            to_territory = self.get_territory(board.get_move_targets(from_territory), prompt='Enter a territory to move to')
             if to_territory:
                 min_troops, max_troops = 1, board.get_n_troops(from_territory)-1
                 n_troops = self.get_n_troops(min_troops, max_troops, prompt='Enter number of troops to move', default=max_troops)
@@ -149,7 +154,7 @@ class HumanPlayer(Player):
         prompt += '): '
         while True:
             try:
-                choice = raw_input(prompt)
+                choice = input(prompt)
                 if not choice: choice = default
                 if choice == 'y' or choice == 'Y': return True
                 if choice == 'n' or choice == 'N': return False
@@ -174,7 +179,7 @@ class HumanPlayer(Player):
         prompt += ': '
         while True:
             try:
-                territory = raw_input(prompt)
+                territory = input(prompt)
                 if use_default and (not territory): return default
                 if not (territory in territories): raise ValueError('"%s" is not a valid territory' % (territory))
                 return territory
@@ -200,7 +205,7 @@ class HumanPlayer(Player):
         prompt += '): '
         while True:
             try:
-                n_troops = raw_input(prompt)
+                n_troops = input(prompt)
                 if use_default and (not n_troops): return default
                 if not n_troops.isdigit(): raise TypeError('Must be a positive integer')
                 n_troops = int(n_troops)
@@ -0,0 +1,373 @@
+from __future__ import division
+import math, multiprocessing, random, time
+from ..game import Game
+from ..battle import sample_battle
+from .player import Player
+from .random_player import RandomPlayer
+
+# Options of the mcts:<options> player type, with the keyword argument of MCTSPlayer, type and minimum value of each
+OPTIONS = {
+    'budget': ('time_budget', float, 0.),
+    'iterations': ('n_iterations', int, 1),
+    'workers': ('n_workers', int, 1),
+    'depth': ('max_depth', int, 1),
+    'rounds': ('rollout_rounds', int, 0),
+    'exploration': ('exploration', float, 0.),
+}
+
+def parse_options(options):
+    """Parse the options of an MCTS player type
+
+       Args:
+           options (str): Comma separated key=value options (e.g. budget=0.5,workers=4), budget or iterations being none
+               to only use the other
+
+       Returns:
+           (dict(str, val)): Keyword arguments of MCTSPlayer
+    """
+    kwargs = {}
+    for option in options.split(',') if options else []:
+        key, sep, value = option.partition('=')
+        if not sep or key not in OPTIONS: raise ValueError('error: Unrecognized MCTS option: %s (options: %s)' % (option, ', '.join(sorted(OPTIONS))))
+        arg, convert, minimum = OPTIONS[key]
+        if value == 'none' and key in ('budget', 'iterations'):
+            kwargs[arg] = None
+            continue
+        try:
+            kwargs[arg] = convert(value)
+        except ValueError:
+            raise ValueError('error: Invalid value of MCTS option %s: %s' % (key, value))
+        if kwargs[arg] < minimum: raise ValueError('error: MCTS option %s must be at least %s' % (key, minimum))
+    if kwargs.get('time_budget', 0.) is None and kwargs.get('n_iterations') is None: raise ValueError('error: MCTS options budget and iterations cannot both be none')
+    return kwargs
+
+class Node(object):
+    """Search tree node
+
+       Attributes:
+           n_visits (int): Number of iterations through the node
+           total_reward (float): Sum of the rewards of those iterations
+           children (dict(tuple, Node)): Child node of each action tried from the node
+    """
+    __slots__ = ('n_visits', 'total_reward', 'children')
+
+    def __init__(self):
+        """Initialize node
+        """
+        self.n_visits = 0
+        self.total_reward = 0.
+        self.children = {}
+
+def get_attacks(board, player):
+    """Return all attacks a player can make
+
+       Args:
+           board (Board): The gameboard
+           player (str): Name of player
+
+       Returns:
+           (list(tuple)): List of ('attack', from_territory, to_territory) actions
+    """
+    return [('attack', f, t) for f in board.get_attacking_territories(player) for t in board.get_hostile_neighbors(f)]
+
+def get_moves(board, player):
+    """Return all moves of troops towards a territory with a hostile neighbor
+
+       Args:
+           board (Board): The gameboard
+           player (str): Name of player
+
+       Returns:
+           (list(tuple)): List of ('move', from_territory, to_territory, n_troops) actions
+    """
+    return [('move', f, t, board.get_n_troops(f) - 1) for f in board.get_moving_territories(player)
+            for t in board.get_move_targets(f) if board.get_hostile_neighbors(t)]
+
+def apply_action(board, action, random):
+    """Apply an action, sampling the outcome of attacks
+
+       Args:
+           board (Board): The gameboard
+           action (tuple): Action (None to pass)
+           random (random): Random engine
+    """
+    if action is None: return
+    if action[0] == 'attack':
+        from_territory, to_territory = action[1:]
+        n_from_troops, n_to_troops = sample_battle(board.get_n_troops(from_territory), board.get_n_troops(to_territory), random)
+        board.apply(('battle', from_territory, to_territory, n_from_troops, n_to_troops))
+    else:
+        board.apply(action)
+
+def evaluate(board, player):
+    """Score a board for a player
+
+       Args:
+           board (Board): The gameboard
+           player (str): Name of player
+
+       Returns:
+           (float): 1 for a win, 0 for a loss, and otherwise the mean of the player's shares of territories and troops
+    """
+    n_territories = board.count_territories(player)
+    if not n_territories: return 0.
+    if n_territories == board.count_territories(): return 1.
+    n_troops = sum(board.total_troops(p) for p in board.get_players())
+    return 0.5 * n_territories / board.count_territories() + 0.5 * board.total_troops(player) / n_troops
+
+def rollout(board, player, turn_order, phase, action, random, n_rounds):
+    """Finish the turn and play a number of rounds with random players
+
+       Args:
+           board (Board): The gameboard, which is played on
+           player (str): Name of player whose turn it is
+           turn_order (list(str)): Names of the players in turn order (if None, in order of the board)
+           phase (str): Phase of the last searched action ('place', 'attack' or 'move')
+           action (tuple): Last searched action
+           random (random): Random engine
+           n_rounds (int): Number of rounds to play after the turn
+
+       Returns:
+           (float): Score of the final board for the player
+    """
+    players = [p for p in turn_order if board.count_territories(p)] if turn_order else board.get_players()
+    i = players.index(player)
+    players = [RandomPlayer(p, random) for p in players[i:] + players[:i]]
+    game = Game(players, board, random, instant_battles=True, setup=False)
+    if phase == 'place' or (phase == 'attack' and action is not None): game.attack_phase(players[0])
+    if phase != 'move': game.move_phase(players[0])
+    for n in range(n_rounds):
+        for p in players[1:] + players[:1]:
+            if game.is_game_over(): return evaluate(board, player)
+            game.play_turn(p)
+    return evaluate(board, player)
+
+def run_search(job):
+    """Run Monte Carlo tree search from a decision
+
+       Nodes are reached by sequences of actions and the battles along the
+       way are sampled again on every iteration. Only consecutive attacks
+       are expanded into a tree, every other decision is searched one action
+       deep before the rollout.
+
+       Args:
+           job (tuple(Board, str, list(str), str, list(tuple), dict(str, val), int)): Board, player name, turn order,
+               phase, candidate actions, search settings and random seed
+
+       Returns:
+           (dict(tuple, (int, float))): Number of visits and total reward of each candidate action
+    """
+    board, player, turn_order, phase, actions, settings, seed = job
+    rng = random.Random(seed)
+    root = Node()
+    n_iterations, time_budget = settings['n_iterations'], settings['time_budget']
+    start = time.time()
+    while not root.n_visits or ((n_iterations is None or root.n_visits < n_iterations) and
+                                (time_budget is None or time.time() - start < time_budget)):
+        node, path, node_actions, depth = root, [root], actions, 0
+        sim = board.copy()
+        while True:
+            action = select(node, node_actions, settings['exploration'])
+            child = node.children.get(action)
+            if child is None: child = node.children[action] = Node()
+            path.append(child)
+            apply_action(sim, action, rng)
+            depth += 1
+            if not child.n_visits or phase != 'attack' or action is None or depth >= settings['max_depth']: break
+            node, node_actions = child, get_attacks(sim, player) + [None]
+        reward = rollout(sim, player, turn_order, phase, action, rng, settings['rollout_rounds'])
+        for node in path:
+            node.n_visits += 1
+            node.total_reward += reward
+    return dict((action, (child.n_visits, child.total_reward)) for action, child in root.children.items())
+
+def select(node, actions, exploration):
+    """Select an action by upper confidence bound, trying every action once first
+
+       Args:
+           node (Node): Current node
+           actions (list(tuple)): Available actions
+           exploration (float): Exploration constant
+
+       Returns:
+           (tuple): Selected action
+    """
+    log_n_visits = math.log(node.n_visits + 1)
+    best_action, best_score = None, None
+    for action in actions:
+        child = node.children.get(action)
+        if child is None or not child.n_visits: return action
+        score = child.total_reward / child.n_visits + exploration * math.sqrt(log_n_visits / child.n_visits)
+        if best_score is None or score > best_score: best_action, best_score = action, score
+    return best_action
+
+class MCTSPlayer(Player):
+    """MCTSPlayer class that places, attacks and moves by Monte Carlo tree search with random rollouts
+
+       Attributes:
+           name (str): Player name
+           random (random): Random engine
+           settings (dict(str, val)): Search settings
+           n_workers (int): Number of worker processes searching in parallel
+           pool (multiprocessing.Pool): Worker processes (None until first needed)
+           turn_order (list(str)): Names of the players of the game in turn order (None until the game starts)
+           planned_attack (tuple): Attack chosen by do_attack
+           planned_move (tuple): Move chosen by do_move_troops
+    """
+    slow = True
+
+    def __init__(self, name, random, time_budget=0.1, n_iterations=None, n_workers=1, max_depth=3, rollout_rounds=1, exploration=1.4):
+        """Initialize player
+
+           Args:
+               name (str): Player name
+               random (random): Random engine
+               time_budget (float): Seconds of search per decision (if None, only use n_iterations)
+               n_iterations (int): Number of search iterations per decision and worker (if None, only use time_budget)
+               n_workers (int): Number of worker processes searching in parallel (searches run in turn in daemonic processes)
+               max_depth (int): Maximum number of consecutive attacks expanded in the tree
+               rollout_rounds (int): Number of rounds played by random players after the turn
+               exploration (float): Exploration constant
+        """
+        super(MCTSPlayer, self).__init__(name)
+        if time_budget is None and n_iterations is None: raise ValueError('time_budget or n_iterations is required')
+        self.random = random
+        self.settings = {
+            'time_budget': time_budget,
+            'n_iterations': n_iterations,
+            'max_depth': max_depth,
+            'rollout_rounds': rollout_rounds,
+            'exploration': exploration,
+        }
+        self.n_workers = n_workers
+        self.pool = None
+        self.turn_order = None
+        self.planned_attack = None
+        self.planned_move = None
+
+    def start_game(self, players):
+        """Learn the players of the game, before any decision
+
+           Args:
+               players (list(str)): Names of the players in turn order
+        """
+        self.turn_order = list(players)
+
+    def close(self):
+        """Stop the worker processes, once the game is over
+        """
+        if self.pool:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def get_state(self):
+        """Return the state kept between decisions, for game snapshots
+
+           Returns:
+               (dict(str, val)): JSON serializable state
+        """
+        return {'planned_attack': self.planned_attack, 'planned_move': self.planned_move}
+
+    def set_state(self, state):
+        """Restore the state kept between decisions from a game snapshot
+
+           Args:
+               state (dict(str, val)): State returned by get_state
+        """
+        self.planned_attack = tuple(state['planned_attack']) if state.get('planned_attack') else None
+        self.planned_move = tuple(state['planned_move']) if state.get('planned_move') else None
+
+    def search(self, board, phase, actions):
+        """Pick the most visited action of a search
+
+           Args:
+               board (Board): The gameboard
+               phase (str): Phase of the decision ('place', 'attack' or 'move')
+               actions (list(tuple)): Candidate actions
+
+           Returns:
+               (tuple): Chosen action
+        """
+        jobs = [(board, self.name, self.turn_order, phase, actions, self.settings, self.random.getrandbits(32)) for i in range(self.n_workers)]
+        if self.n_workers > 1 and not multiprocessing.current_process().daemon:
+            if not self.pool: self.pool = multiprocessing.Pool(self.n_workers)
+            results = self.pool.map(run_search, jobs)
+        else:
+            # Workers of clisk-sim and clisk-tournament are daemonic and cannot start processes, so search in turn
+            results = [run_search(job) for job in jobs]
+        n_visits = dict((action, 0) for action in actions)
+        for result in results:
+            for action, (n, total_reward) in result.items(): n_visits[action] += n
+        return max(actions, key=lambda action: n_visits[action])
+
+    def place_troops(self, board, n_troops):
+        """Place troops on territories
+
+           Args:
+               board (Gameboard): The gameboard
+               n_troops (int): Number of new troops to deploy
+
+           Returns:
+               (dict(str, int)): Dictionary of territories with number of troops to be deployed
+        """
+        territories = board.get_territories(self.name)
+        if not n_troops or not territories: return {}
+        borders = [t for t in territories if board.get_hostile_neighbors(t)] or territories
+        if len(borders) == 1: return {borders[0]: n_troops}
+        action = self.search(board, 'place', [('place', t, n_troops) for t in borders])
+        return {action[1]: n_troops}
+
+    def do_attack(self, board):
+        """Decide whether or not to continue attacking
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (bool): Whether or not to continue attacking
+        """
+        attacks = get_attacks(board, self.name)
+        self.planned_attack = self.search(board, 'attack', attacks + [None]) if attacks else None
+        return self.planned_attack is not None
+
+    def attack(self, board):
+        """Attack phase
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (str, str): from_territory, to_territory
+        """
+        if not self.planned_attack: return None, None
+        from_territory, to_territory = self.planned_attack[1:]
+        self.planned_attack = None
+        return from_territory, to_territory
+
+    def do_move_troops(self, board):
+        """Decide whether or not to move troops
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (bool): Whether or not to move troops
+        """
+        moves = get_moves(board, self.name)
+        self.planned_move = self.search(board, 'move', moves + [None]) if moves else None
+        return self.planned_move is not None
+
+    def move_troops(self, board):
+        """Troop movement phase
+
+           Args:
+               board (Gameboard): The gameboard
+
+           Returns:
+               (str, str, int): from_territory, to_territory, n_troops
+        """
+        if not self.planned_move: return None, None, 0
+        from_territory, to_territory, n_troops = self.planned_move[1:]
+        self.planned_move = None
+        return from_territory, to_territory, n_troops
@@ -3,7 +3,9 @@ class Player(object):
 
        Attributes:
            name (str): Player name
+           slow (bool): Whether or not decisions can take long enough to hold up other games (searches, external bots)
     """
+    slow = False
 
     def __init__(self, name):
         """Initialize player
@@ -13,6 +15,35 @@ class Player(object):
         """
         self.name = name
 
+    def start_game(self, players):
+        """Learn the players of the game, before any decision
+
+           Args:
+               players (list(str)): Names of the players in turn order
+        """
+        pass
+
+    def close(self):
+        """Release the resources held by the player, once the game is over
+        """
+        pass
+
+    def get_state(self):
+        """Return the state kept between decisions, for game snapshots
+
+           Returns:
+               (dict(str, val)): JSON serializable state
+        """
+        return {}
+
+    def set_state(self, state):
+        """Restore the state kept between decisions from a game snapshot
+
+           Args:
+               state (dict(str, val)): State returned by get_state
+        """
+        pass
+
     def place_troops(self, board, n_troops):
         """Place troops on territories
 
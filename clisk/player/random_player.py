@@ -1,4 +1,5 @@
-from player import Player
+from ..distributions import sample_multinomial
+from .player import Player
 
 class RandomPlayer(Player):
     """RandomPlayer class that attacks randomly until it wins a battle or can't attack anymore, and moves randomly
@@ -20,6 +21,22 @@ class RandomPlayer(Player):
         self.random = random
         self.last_attacked_territory = None
 
+    def get_state(self):
+        """Return the state kept between decisions, for game snapshots
+
+           Returns:
+               (dict(str, val)): JSON serializable state
+        """
+        return {'last_attacked_territory': self.last_attacked_territory}
+
+    def set_state(self, state):
+        """Restore the state kept between decisions from a game snapshot
+
+           Args:
+               state (dict(str, val)): State returned by get_state
+        """
+        self.last_attacked_territory = state.get('last_attacked_territory')
+
     def place_troops(self, board, n_troops):
         """Place troops on territories
 
@@ -31,12 +48,8 @@ class RandomPlayer(Player):
                (dict(str, int)): Dictionary of territories with number of troops to be deployed
         """
         territories = board.get_territories(self.name)
-        placements = {}
-        for i in range(n_troops):
-            territory = self.random.choice(territories)
-            if territory in placements: placements[territory] += 1
-            else: placements[territory] = 1
-        return placements
+        counts = sample_multinomial(n_troops, len(territories), self.random)
+        return dict((t, n) for t, n in zip(territories, counts) if n)
 
     def do_attack(self, board):
         """Decide whether or not to continue attacking
@@ -50,7 +63,7 @@ class RandomPlayer(Player):
         if self.last_attacked_territory and (board.get_owner(self.last_attacked_territory) == self.name):
             self.last_attacked_territory = None
             return False
-        return len(board.get_attacking_territories(self.name)) > 0
+        return board.can_attack(self.name)
 
     def attack(self, board):
         """Attack phase
@@ -75,7 +88,7 @@ class RandomPlayer(Player):
            Returns:
                (bool): Whether or not to move troops
         """
-        return len(board.get_moving_territories(self.name)) > 0
+        return board.can_move(self.name)
 
     def move_troops(self, board):
         """Troop movement phase
@@ -87,6 +100,6 @@ class RandomPlayer(Player):
                (str, str, int): from_territory, to_territory, n_troops
         """
         from_territory = self.random.choice(board.get_moving_territories(self.name))
-        to_territory = self.random.choice(board.get_friendly_neighbors(from_territory))
+        to_territory = self.random.choice(board.get_move_targets(from_territory))
         n_troops = board.get_n_troops(from_territory) - 1
         return from_territory, to_territory, n_troops
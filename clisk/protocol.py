@@ -0,0 +1,63 @@
+def get_topology(board):
+    """Describe the territories of a board for an external player
+
+       Args:
+           board (Board): The gameboard
+
+       Returns:
+           (list(str), list(list(int))): Names of territories and indices of the neighbors of each territory
+    """
+    territories = board.get_territories()
+    ids = dict((t, i) for i, t in enumerate(territories))
+    return territories, [[ids[n] for n in board.get_neighbors(t)] for t in territories]
+
+def get_state(board):
+    """Describe the state of a board for an external player
+
+       Args:
+           board (Board): The gameboard
+
+       Returns:
+           (list(str), list(int)): Owner and number of troops of each territory, in the order of get_topology
+    """
+    territories = board.get_territories()
+    return [board.get_owner(t) for t in territories], [board.get_n_troops(t) for t in territories]
+
+def parse_answer(board, player, method, args, value):
+    """Check and convert the answer of an external player to a decision
+
+       Args:
+           board (Board): The gameboard
+           player (str): Name of player
+           method (str): Name of Player method answered
+           args (tuple): Arguments of method after the board
+           value (val): Decoded answer
+
+       Returns:
+           (val): Return value of method
+    """
+    if method in ('do_attack', 'do_move_troops'):
+        if not isinstance(value, bool): raise TypeError('expected true or false')
+        return value
+    if method == 'place_troops':
+        if not isinstance(value, dict): raise TypeError('expected an object of territories and numbers of troops')
+        placements = dict((str(t), int(n)) for t, n in value.items())
+        if any(board.get_owner(t) != player for t in placements): raise ValueError('can only place troops on own territories')
+        if any(n < 0 for n in placements.values()) or sum(placements.values()) != args[0]: raise ValueError('must place exactly %i troops' % (args[0]))
+        return placements
+    if method == 'attack':
+        if not isinstance(value, list) or len(value) != 2: raise TypeError('expected [from_territory, to_territory]')
+        from_territory, to_territory = value
+        if from_territory is None or to_territory is None: return None, None
+        if board.get_owner(from_territory) != player or board.get_n_troops(from_territory) < 2: raise ValueError('cannot attack from %s' % (from_territory))
+        if to_territory not in board.get_hostile_neighbors(from_territory): raise ValueError('cannot attack %s from %s' % (to_territory, from_territory))
+        return from_territory, to_territory
+    if method == 'move_troops':
+        if not isinstance(value, list) or len(value) != 3: raise TypeError('expected [from_territory, to_territory, n_troops]')
+        from_territory, to_territory, n_troops = value
+        if from_territory is None or to_territory is None: return None, None, 0
+        if board.get_owner(from_territory) != player: raise ValueError('cannot move troops from %s' % (from_territory))
+        if to_territory not in board.get_move_targets(from_territory): raise ValueError('cannot move troops from %s to %s' % (from_territory, to_territory))
+        if not 0 <= int(n_troops) < board.get_n_troops(from_territory): raise ValueError('can move at most %i troops' % (board.get_n_troops(from_territory) - 1))
+        return from_territory, to_territory, int(n_troops)
+    raise ValueError('unknown decision %s' % (method))
@@ -0,0 +1,277 @@
+from .events import Sink, Start, Turn, Placement, Attack, Roll, Battle, Conquest, Move, GameOver
+
+MAGIC = b'CLSK'
+VERSION = 1
+
+# Record operations
+TURN, PLACE, BATTLE, CONQUEST, MOVE, END = range(1, 7)
+
+def write_varint(buffer, n):
+    """Append a non-negative integer to a buffer as a little-endian base 128 varint
+
+       Args:
+           buffer (bytearray): Output buffer
+           n (int): Non-negative integer
+    """
+    while n > 0x7f:
+        buffer.append((n & 0x7f) | 0x80)
+        n >>= 7
+    buffer.append(n)
+
+def read_varint(buffer, pos):
+    """Read a varint from a buffer
+
+       Args:
+           buffer (bytearray): Input buffer
+           pos (int): Position of the varint
+
+       Returns:
+           (int, int): Integer and position following it
+    """
+    n, shift = 0, 0
+    while True:
+        byte = buffer[pos]
+        pos += 1
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80: return n, pos
+        shift += 7
+
+def write_string(buffer, s):
+    """Append a length-prefixed UTF-8 string to a buffer
+
+       Args:
+           buffer (bytearray): Output buffer
+           s (str): String
+    """
+    data = s.encode('utf-8')
+    write_varint(buffer, len(data))
+    buffer.extend(data)
+
+def read_string(buffer, pos):
+    """Read a length-prefixed UTF-8 string from a buffer
+
+       Args:
+           buffer (bytearray): Input buffer
+           pos (int): Position of the string
+
+       Returns:
+           (str, int): String and position following it
+    """
+    n, pos = read_varint(buffer, pos)
+    return str(buffer[pos:pos+n].decode('utf-8')), pos + n
+
+class RecordWriter(Sink):
+    """Sink streaming a compact binary record of a game to a file
+
+       Territories and players are written as integer ids, and all numbers
+       as varints. Each attack to completion is written as a single battle
+       with its total losses, so the record can be replayed without dice.
+
+       Attributes:
+           file (file): Output file
+           seed (str): Seed of the game
+           buffer_size (int): Number of bytes to hold before writing
+           buffer (bytearray): Bytes waiting to be written
+           territory_ids (dict(str, int)): Territory id of each territory
+           player_ids (dict(str, int)): Player id of each player
+           battle (list(int)): Territory ids and losses of the current attack
+    """
+
+    def __init__(self, path, seed=None, buffer_size=1 << 16):
+        """Initialize writer
+
+           Args:
+               path (str): Path of output file
+               seed (int): Seed of the game
+               buffer_size (int): Number of bytes to hold before writing
+        """
+        self.file = open(path, 'wb')
+        self.seed = '' if seed is None else str(seed)
+        self.buffer_size = buffer_size
+        self.buffer = bytearray()
+        self.territory_ids = {}
+        self.player_ids = {}
+        self.battle = None
+
+    def handle(self, event):
+        """Receive an event
+
+           Args:
+               event (Event): Game event
+        """
+        if isinstance(event, (Roll, Battle)):
+            self.battle[2] += event.losses[0]
+            self.battle[3] += event.losses[1]
+            return
+        buffer, ids = self.buffer, self.territory_ids
+        if isinstance(event, Attack) and self.battle and self.battle[:2] == [ids[event.from_territory], ids[event.to_territory]]:
+            return
+        if self.battle: self.write_battle()
+        if isinstance(event, Placement):
+            buffer.append(PLACE)
+            write_varint(buffer, ids[event.territory])
+            write_varint(buffer, event.n_troops)
+        elif isinstance(event, Attack):
+            self.battle = [ids[event.from_territory], ids[event.to_territory], 0, 0]
+        elif isinstance(event, Conquest):
+            buffer.append(CONQUEST)
+            write_varint(buffer, ids[event.from_territory])
+            write_varint(buffer, ids[event.to_territory])
+            write_varint(buffer, event.n_troops)
+        elif isinstance(event, Move):
+            buffer.append(MOVE)
+            write_varint(buffer, ids[event.from_territory])
+            write_varint(buffer, ids[event.to_territory])
+            write_varint(buffer, event.n_troops)
+        elif isinstance(event, Turn):
+            buffer.append(TURN)
+            write_varint(buffer, self.player_ids[event.player])
+        elif isinstance(event, Start):
+            self.write_header(event.players, event.board)
+        elif isinstance(event, GameOver):
+            buffer.append(END)
+            write_varint(buffer, self.player_ids[event.player])
+            self.flush()
+        if len(buffer) >= self.buffer_size: self.flush()
+
+    def write_header(self, players, board):
+        """Write the seed, players and initial board state
+
+           Args:
+               players (list(str)): Names of players in turn order
+               board (Board): Initial state of the game board
+        """
+        territories = board.get_territories()
+        self.territory_ids = dict((t, i) for i, t in enumerate(territories))
+        self.player_ids = dict((p, i) for i, p in enumerate(players))
+        buffer = self.buffer
+        buffer.extend(MAGIC)
+        buffer.append(VERSION)
+        write_string(buffer, self.seed)
+        write_varint(buffer, len(players))
+        for player in players: write_string(buffer, player)
+        write_varint(buffer, len(territories))
+        for territory in territories:
+            write_varint(buffer, self.player_ids[board.get_owner(territory)])
+            write_varint(buffer, board.get_n_troops(territory))
+
+    def write_battle(self):
+        """Write the total losses of the current attack
+        """
+        self.buffer.append(BATTLE)
+        for n in self.battle: write_varint(self.buffer, n)
+        self.battle = None
+
+    def flush(self):
+        """Write out the buffered bytes
+        """
+        if self.battle: self.write_battle()
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+
+    def close(self):
+        """Flush and release any resources
+        """
+        self.flush()
+        self.file.close()
+
+class RecordReader(object):
+    """Reader of binary game records
+
+       Attributes:
+           seed (str): Seed of the game
+           players (list(str)): Names of players in turn order
+           owners (list(int)): Initial player id owning each territory
+           troops (list(int)): Initial number of troops on each territory
+           winner (str): Name of the winning player (None if the record is incomplete)
+           n_turns (int): Number of turns in the record
+           data (bytearray): Raw record
+           start (int): Position of the first operation
+    """
+
+    def __init__(self, path):
+        """Read a record
+
+           Args:
+               path (str): Path of record file
+        """
+        with open(path, 'rb') as f: self.data = bytearray(f.read())
+        data = self.data
+        if bytes(data[:len(MAGIC)]) != MAGIC: raise ValueError('%s is not a clisk game record' % (path))
+        if data[len(MAGIC)] != VERSION: raise ValueError('Unsupported record version: %i' % (data[len(MAGIC)]))
+        pos = len(MAGIC) + 1
+        self.seed, pos = read_string(data, pos)
+        n_players, pos = read_varint(data, pos)
+        self.players = []
+        for i in range(n_players):
+            player, pos = read_string(data, pos)
+            self.players.append(player)
+        n_territories, pos = read_varint(data, pos)
+        self.owners, self.troops = [], []
+        for i in range(n_territories):
+            owner, pos = read_varint(data, pos)
+            n_troops, pos = read_varint(data, pos)
+            self.owners.append(owner)
+            self.troops.append(n_troops)
+        self.start = pos
+        self.winner = None
+        self.n_turns = 0
+        for op, args in self.operations():
+            if op == TURN: self.n_turns += 1
+            elif op == END: self.winner = self.players[args[0]]
+
+    def operations(self):
+        """Iterate over the recorded operations
+
+           Returns:
+               (generator((int, list(int)))): Operation code and arguments
+        """
+        n_args = {TURN: 1, PLACE: 2, BATTLE: 4, CONQUEST: 3, MOVE: 3, END: 1}
+        data, pos = self.data, self.start
+        while pos < len(data):
+            op = data[pos]
+            pos += 1
+            args = []
+            for i in range(n_args[op]):
+                n, pos = read_varint(data, pos)
+                args.append(n)
+            yield op, args
+
+    def replay(self, board, n_turns=None):
+        """Rebuild the state of a board from the record
+
+           Args:
+               board (Board): Board of the same type as the recorded game, which is overwritten
+               n_turns (int): Number of turns to replay (if None, replay the whole game)
+
+           Returns:
+               (Board): Board as it was before turn n_turns + 1
+        """
+        territories = board.get_territories()
+        if len(territories) != len(self.owners): raise ValueError('Board does not match the record')
+        for territory, owner, n_troops in zip(territories, self.owners, self.troops):
+            board.assign(territory, self.players[owner])
+            board.set_n_troops(territory, n_troops)
+        i_turn = 0
+        for op, args in self.operations():
+            if op == TURN:
+                if i_turn == n_turns: break
+                i_turn += 1
+            elif op == PLACE:
+                territory = territories[args[0]]
+                board.set_n_troops(territory, board.get_n_troops(territory) + args[1])
+            elif op == BATTLE:
+                from_territory, to_territory = territories[args[0]], territories[args[1]]
+                board.set_n_troops(from_territory, board.get_n_troops(from_territory) - args[2])
+                board.set_n_troops(to_territory, board.get_n_troops(to_territory) - args[3])
+            elif op == CONQUEST:
+                from_territory, to_territory = territories[args[0]], territories[args[1]]
+                board.assign(to_territory, board.get_owner(from_territory))
+                board.set_n_troops(to_territory, args[2])
+                board.set_n_troops(from_territory, board.get_n_troops(from_territory) - args[2])
+            elif op == MOVE:
+                from_territory, to_territory = territories[args[0]], territories[args[1]]
+                board.set_n_troops(from_territory, board.get_n_troops(from_territory) - args[2])
+                board.set_n_troops(to_territory, board.get_n_troops(to_territory) + args[2])
+        return board
@@ -0,0 +1,108 @@
+import hashlib, random
+
+class SeedSequence(object):
+    """Root seed and spawn key identifying an independent random stream
+
+       As numpy's SeedSequence, streams form a tree: child i of a sequence
+       extends its spawn key with i, and the seed of a stream hashes the root
+       seed with the whole key, so every stream can be rebuilt on its own
+       from the root seed and its key.
+
+       Attributes:
+           entropy (str): Root seed
+           spawn_key (tuple(int)): Path from the root to this stream
+           n_children_spawned (int): Number of children created by spawn
+    """
+
+    def __init__(self, entropy=0, spawn_key=()):
+        """Initialize sequence
+
+           Args:
+               entropy (val): Root seed (any value, compared by its string)
+               spawn_key (tuple(int)): Path from the root to this stream
+        """
+        self.entropy = str(entropy)
+        self.spawn_key = tuple(spawn_key)
+        self.n_children_spawned = 0
+
+    @classmethod
+    def parse(cls, text):
+        """Rebuild a sequence from its description
+
+           Args:
+               text (str): Description written by str, root seed and spawn key separated by a colon
+
+           Returns:
+               (SeedSequence): Sequence
+        """
+        entropy, _, spawn_key = str(text).rpartition(':')
+        if not entropy: return cls(text)
+        return cls(entropy, [int(i) for i in spawn_key.split('.') if i])
+
+    def __str__(self):
+        """Describe the sequence
+
+           Returns:
+               (str): Root seed and spawn key, e.g. 0:3.1 for child 1 of child 3 of root seed 0
+        """
+        if not self.spawn_key: return self.entropy
+        return '%s:%s' % (self.entropy, '.'.join(str(i) for i in self.spawn_key))
+
+    def get_child(self, i):
+        """Return a child stream
+
+           Args:
+               i (int): Child number
+
+           Returns:
+               (SeedSequence): Child sequence
+        """
+        return SeedSequence(self.entropy, self.spawn_key + (i,))
+
+    def spawn(self, n_children):
+        """Create new child streams, numbered after those already spawned
+
+           Args:
+               n_children (int): Number of children
+
+           Returns:
+               (list(SeedSequence)): Child sequences
+        """
+        children = [self.get_child(i) for i in range(self.n_children_spawned, self.n_children_spawned + n_children)]
+        self.n_children_spawned += n_children
+        return children
+
+    def generate_seed(self, n_bits=128):
+        """Hash the root seed and spawn key into a seed
+
+           Args:
+               n_bits (int): Number of bits of the seed (at most 256)
+
+           Returns:
+               (int): Seed
+        """
+        key = '%s/%s' % (self.entropy, ','.join(str(i) for i in self.spawn_key))
+        return int(hashlib.sha256(key.encode('utf-8')).hexdigest(), 16) >> (256 - n_bits)
+
+    def random(self):
+        """Create a random engine seeded by the stream
+
+           Returns:
+               (random.Random): Random engine
+        """
+        return random.Random(self.generate_seed())
+
+def create_streams(seed_sequence, n_players):
+    """Create the random engines of a game and of each of its players
+
+       The game draws from child 0 of its sequence and player i from child
+       i + 1, so no player's choices shift the dice or another player's draws.
+
+       Args:
+           seed_sequence (SeedSequence): Sequence of the game
+           n_players (int): Number of players
+
+       Returns:
+           (random.Random, list(random.Random)): Random engine of the game and of each player
+    """
+    return seed_sequence.get_child(0).random(), [seed_sequence.get_child(i + 1).random() for i in range(n_players)]
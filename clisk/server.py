@@ -0,0 +1,354 @@
+from __future__ import print_function
+import argparse, asyncio, concurrent.futures, itertools, json, logging, sys
+from .board import create_board
+from .player import create_player
+from .player.player import Player
+from .game import Game
+from .events import Sink
+from .protocol import get_topology, get_state, parse_answer
+from .rng import SeedSequence, create_streams
+
+logger = logging.getLogger(__name__)
+
+class Connection(object):
+    """Client connection exchanging one JSON message per line
+
+       Attributes:
+           reader (asyncio.StreamReader): Incoming stream
+           writer (asyncio.StreamWriter): Outgoing stream
+           closed (bool): Whether or not the client has gone away
+    """
+
+    def __init__(self, reader, writer):
+        """Initialize connection
+
+           Args:
+               reader (asyncio.StreamReader): Incoming stream
+               writer (asyncio.StreamWriter): Outgoing stream
+        """
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+
+    def send(self, message):
+        """Queue a message (written out when the connection next waits)
+
+           Args:
+               message (dict(str, val)): Message
+        """
+        if self.closed: return
+        self.writer.write((json.dumps(message, separators=(',', ':')) + '\n').encode())
+
+    def poll(self):
+        """Check whether or not the client has gone away, without waiting for a message
+
+           Returns:
+               (bool): Whether or not the connection is closed
+        """
+        if not self.closed and (self.reader.at_eof() or self.writer.is_closing()): self.closed = True
+        return self.closed
+
+    async def receive(self):
+        """Wait for the next message
+
+           Returns:
+               (dict(str, val)): Message (None once the client has gone away)
+        """
+        if self.closed: return None
+        try:
+            await self.writer.drain()
+            line = await self.reader.readline()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            line = b''
+        if not line:
+            self.closed = True
+            return None
+        try:
+            message = json.loads(line.decode())
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            self.send({'type': 'error', 'message': 'expected a JSON object per line'})
+            return {}
+        return message
+
+    async def close(self):
+        """Flush and close the connection
+        """
+        if self.closed: return
+        self.closed = True
+        try:
+            await self.writer.drain()
+            self.writer.close()
+        except ConnectionError:
+            pass
+
+class RemotePlayer(Player):
+    """Player answering decisions over a connection
+
+       The Player methods are not used directly, the server awaits decide
+       instead. If the client goes away, a random player takes over the seat.
+
+       Attributes:
+           name (str): Player name
+           connection (Connection): Client connection
+           fallback (Player): Player taking over the seat if the client goes away
+           n_decisions (int): Number of decisions requested so far
+    """
+
+    def __init__(self, name, connection, random):
+        """Initialize player
+
+           Args:
+               name (str): Player name
+               connection (Connection): Client connection
+               random (random): Random engine of the fallback player
+        """
+        super(RemotePlayer, self).__init__(name)
+        self.connection = connection
+        self.fallback = create_player(name, 'random', random)
+        self.n_decisions = 0
+
+    async def decide(self, board, method, args):
+        """Request a decision from the client until it sends a valid answer
+
+           Args:
+               board (Board): The gameboard
+               method (str): Name of Player method to answer
+               args (tuple): Arguments of method after the board
+
+           Returns:
+               (val): Return value of method
+        """
+        self.n_decisions += 1
+        owners, troops = get_state(board)
+        request = {'type': 'decision', 'id': self.n_decisions, 'method': method, 'args': list(args), 'owners': owners, 'troops': troops}
+        while not self.connection.closed:
+            self.connection.send(request)
+            message = await self.connection.receive()
+            if message is None: break
+            if message.get('type') != 'answer' or message.get('id') != self.n_decisions:
+                self.connection.send({'type': 'error', 'message': 'expected the answer to decision %i' % (self.n_decisions)})
+                continue
+            try:
+                return parse_answer(board, self.name, method, args, message.get('value'))
+            except (ValueError, TypeError, KeyError) as e:
+                self.connection.send({'type': 'error', 'message': 'invalid answer: %s' % (e)})
+        return getattr(self.fallback, method)(board, *args)
+
+class BroadcastSink(Sink):
+    """Sink sending events to the clients of a game
+
+       Attributes:
+           connections (list(Connection)): Client connections
+    """
+
+    def __init__(self, connections):
+        """Initialize sink
+
+           Args:
+               connections (list(Connection)): Client connections
+        """
+        self.connections = connections
+
+    def handle(self, event):
+        """Receive an event
+
+           Args:
+               event (Event): Game event
+        """
+        text = event.format()
+        if text is None: return
+        for connection in self.connections: connection.send({'type': 'event', 'text': text})
+
+class Server(object):
+    """Server matching connecting clients into games run as coroutines
+
+       Clients send a join message, wait for the game to start and then
+       answer decision requests, one JSON object per line in each direction:
+
+           -> {"type": "join", "name": "alice"}
+           <- {"type": "waiting", "n_waiting": 1, "n_clients": 2}
+           <- {"type": "start", "game": 0, "name": "alice", "players": [...], "territories": [...], "neighbors": [...]}
+           <- {"type": "event", "text": "..."}
+           <- {"type": "decision", "id": 1, "method": "place_troops", "args": [3], "owners": [...], "troops": [...]}
+           -> {"type": "answer", "id": 1, "value": {"Alaska": 3}}
+           <- {"type": "game_over", "winner": "alice", "turns": 120}
+
+       Neighbors, owners and troops are listed in the order of the
+       territories of the start message, neighbors as territory indices.
+       Answers take the JSON form of the return value of the Player method,
+       invalid answers are reported with an error message and the decision
+       is requested again.
+
+       Attributes:
+           board_type (str): Type of board
+           board_args (dict(str, val)): Keyword arguments of create_board
+           n_clients (int): Number of clients per game
+           bot_types (list(list(str))): Name and type of the server side players added to each game
+           instant_battles (bool): Whether or not to resolve attacks in a single draw
+           seed (int): Root seed (game i draws from child i of its SeedSequence)
+           waiting (list((str, Connection))): Names and connections of clients waiting for a game
+           games (dict(int, asyncio.Task)): Running games
+           n_games (int): Number of games started so far
+           executor (concurrent.futures.ThreadPoolExecutor): Threads running the decisions of slow server side players
+    """
+
+    def __init__(self, board_type='classic', board_args=None, n_clients=2, bot_types=None, instant_battles=False, seed=0, n_threads=None):
+        """Initialize server
+
+           Args:
+               board_type (str): Type of board
+               board_args (dict(str, val)): Keyword arguments of create_board
+               n_clients (int): Number of clients per game
+               bot_types (list(list(str))): Name and type of the server side players added to each game
+               instant_battles (bool): Whether or not to resolve attacks in a single draw
+               seed (int): Root seed (game i draws from child i of its SeedSequence)
+               n_threads (int): Number of threads running the decisions of slow server side players (if None, as concurrent.futures)
+        """
+        self.board_type = board_type
+        self.board_args = board_args or {}
+        self.n_clients = n_clients
+        self.bot_types = bot_types or []
+        self.instant_battles = instant_battles
+        self.seed = seed
+        self.waiting = []
+        self.games = {}
+        self.n_games = 0
+        self.executor = concurrent.futures.ThreadPoolExecutor(n_threads)
+
+    async def handle_client(self, reader, writer):
+        """Register a connecting client in the lobby
+
+           Args:
+               reader (asyncio.StreamReader): Incoming stream
+               writer (asyncio.StreamWriter): Outgoing stream
+        """
+        connection = Connection(reader, writer)
+        message = await connection.receive()
+        if message is None: return
+        name = message.get('name')
+        if message.get('type') != 'join' or not isinstance(name, str) or not name:
+            connection.send({'type': 'error', 'message': 'expected {"type": "join", "name": ...}'})
+            await connection.close()
+            return
+        self.waiting = [(n, c) for n, c in self.waiting if not c.poll()]
+        self.waiting.append((name, connection))
+        connection.send({'type': 'waiting', 'n_waiting': len(self.waiting), 'n_clients': self.n_clients})
+        if len(self.waiting) >= self.n_clients:
+            clients, self.waiting = self.waiting[:self.n_clients], self.waiting[self.n_clients:]
+            game_id = self.n_games
+            self.n_games += 1
+            self.games[game_id] = asyncio.ensure_future(self.play_game(game_id, clients))
+            self.games[game_id].add_done_callback(lambda task: self.end_game(game_id, task))
+
+    def end_game(self, game_id, task):
+        """Forget a finished game and log the error it failed with, if any
+
+           Args:
+               game_id (int): Game number
+               task (asyncio.Task): Finished game
+        """
+        self.games.pop(game_id)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error('game %i failed', game_id, exc_info=task.exception())
+
+    async def play_game(self, game_id, clients):
+        """Play a game between clients and server side players
+
+           Args:
+               game_id (int): Game number
+               clients (list((str, Connection))): Names and connections of clients
+
+           Returns:
+               (str): Name of the winning player
+        """
+        game_random, player_randoms = create_streams(SeedSequence(self.seed).get_child(game_id), len(clients) + len(self.bot_types))
+        names = set(name for [name, type] in self.bot_types)
+        players, connections = [], []
+        for name, connection in clients:
+            # Clients may pick names already taken in the game
+            unique_name = name
+            for i in itertools.count(2):
+                if unique_name not in names: break
+                unique_name = '%s-%i' % (name, i)
+            names.add(unique_name)
+            players.append(RemotePlayer(unique_name, connection, player_randoms[len(players)]))
+            connections.append(connection)
+        players += [create_player(name, type, rng) for [name, type], rng in zip(self.bot_types, player_randoms[len(clients):])]
+        game = Game(players, create_board(self.board_type, **self.board_args), game_random, self.instant_battles)
+        game.add_sink(BroadcastSink(connections))
+        territories, neighbors = get_topology(game.board)
+        for player in players[:len(clients)]:
+            player.connection.send({'type': 'start', 'game': game_id, 'name': player.name, 'players': [p.name for p in players], 'territories': territories, 'neighbors': neighbors})
+
+        loop = asyncio.get_running_loop()
+        try:
+            steps, answer = game.steps(), None
+            while True:
+                try:
+                    player, method, args = steps.send(answer)
+                except StopIteration:
+                    break
+                if isinstance(player, RemotePlayer):
+                    answer = await player.decide(game.board, method, args)
+                elif player.slow:
+                    # Let other games run while slow server side players think
+                    answer = await loop.run_in_executor(self.executor, getattr(player, method), game.board, *args)
+                else:
+                    answer = getattr(player, method)(game.board, *args)
+            for connection in connections: connection.send({'type': 'game_over', 'winner': game.winner, 'turns': game.n_turns})
+            return game.winner
+        finally:
+            # Server side players may hold worker processes
+            await loop.run_in_executor(self.executor, game.close)
+            for connection in connections: await connection.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, path=None, backlog=1024):
+        """Accept clients until cancelled
+
+           Args:
+               host (str): Address to listen on
+               port (int): TCP port to listen on
+               path (str): Unix socket to listen on instead of TCP (if not None)
+               backlog (int): Number of pending connections allowed
+        """
+        if path: server = await asyncio.start_unix_server(self.handle_client, path, backlog=backlog)
+        else: server = await asyncio.start_server(self.handle_client, host, port, backlog=backlog)
+        try:
+            async with server: await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False)
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description='clisk-server: Host many games between clients connecting over TCP or a Unix socket.')
+    parser.add_argument('-b', '--board', metavar='board', help='board type (classic, grid or a board definition file)', default='classic')
+    parser.add_argument('-c', '--compact', action='store_true', help='store the board state in flat arrays (grids then compute their borders)')
+    parser.add_argument('-m', '--connected-moves', action='store_true', help='allow moving troops to any territory connected through own territories')
+    parser.add_argument('-n', '--n-clients', metavar='n', type=int, help='number of clients per game', default=2)
+    parser.add_argument('-p', '--player', metavar=('name', 'type'), nargs=2, action='append', help='server side player added to each game', default=[])
+    parser.add_argument('-i', '--instant-battles', action='store_true', help='resolve each attack in a single draw')
+    parser.add_argument('-s', '--seed', metavar='seed', type=int, help='root seed of the games', default=0)
+    parser.add_argument('--host', metavar='host', help='address to listen on', default='127.0.0.1')
+    parser.add_argument('--port', metavar='port', type=int, help='TCP port to listen on', default=8765)
+    parser.add_argument('--unix', metavar='path', help='listen on a Unix socket instead of TCP', default=None)
+    parser.add_argument('--threads', metavar='n', type=int, help='number of threads running the decisions of slow server side players (e.g. mcts)', default=None)
+    args = parser.parse_args()
+    if args.n_clients < 1:
+        print('error: Need at least 1 client per game')
+        sys.exit(1)
+    if args.threads is not None and args.threads < 1:
+        print('error: Need at least 1 thread')
+        sys.exit(1)
+    if args.n_clients + len(args.player) < 2:
+        print('error: Need at least 2 players per game')
+        sys.exit(1)
+
+    # Serve
+    board_args = {'compact': args.compact, 'connected_moves': args.connected_moves}
+    server = Server(args.board, board_args, args.n_clients, args.player, args.instant_battles, args.seed, args.threads)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,188 @@
+from __future__ import print_function, division
+import argparse, itertools, json, multiprocessing, os, sys, time
+from .board import create_board
+from .player import create_player
+from .game import Game
+from .record import RecordWriter
+from .stats import Stats
+from .rng import SeedSequence, create_streams
+
+def play_game(job):
+    """Play a single headless game
+
+       Args:
+           job (tuple(SeedSequence, list(list(str)), str, dict(str, val), bool, str, bool)): Seed sequence, player names and
+               types, board type, board options, instant battles flag, record directory and timing flag
+
+       Returns:
+           (dict(str, val)): Seed, winner, number of turns and wall time of the game (and timing stats if requested)
+    """
+    return play_batch([job])[0]
+
+def play_batch(jobs):
+    """Play headless games together, batching the decisions of bot players
+
+       Args:
+           jobs (list(tuple)): Seed sequence, player names and types, board type, board options, instant battles flag, record
+               directory and timing flag of each game
+
+       Returns:
+           (list(dict(str, val))): Seed, winner, number of turns and wall time of each game (and timing stats if requested),
+               games played together sharing their wall time evenly
+    """
+    start = time.time()
+    games = []
+    try:
+        for seed_sequence, player_types, board_type, board_args, instant_battles, record_dir, timing in jobs:
+            game_random, player_randoms = create_streams(seed_sequence, len(player_types))
+            players = [create_player(name, type, rng) for [name, type], rng in zip(player_types, player_randoms)]
+            game = Game(players, create_board(board_type, **board_args), game_random, instant_battles)
+            if record_dir: game.add_sink(RecordWriter(os.path.join(record_dir, 'game-%i.clr' % (seed_sequence.spawn_key[-1])), seed_sequence))
+            if timing: game.instrument()
+            games.append(game)
+        # Only bot players gain from playing games together, and loading them pulls in sockets and processes
+        if len(games) > 1 and any(type.startswith('bot:') or type.startswith('bot@') for job in jobs for [name, type] in job[1]):
+            from .player.bot_player import play_games
+            play_games(games)
+        else:
+            for game in games: game.play()
+    finally:
+        for game in games: game.close()
+    elapsed = (time.time() - start) / len(games)
+    results = []
+    for job, game in zip(jobs, games):
+        result = {'seed': str(job[0]), 'winner': game.winner, 'turns': game.n_turns, 'time': elapsed}
+        if job[-1]: result['stats'] = game.stats.to_dict()
+        results.append(result)
+    return results
+
+def run(player_types, board_type='classic', n_games=1, seed=0, n_workers=None, board_args=None, instant_battles=False, record_dir=None, callback=None, timing=False, batch_size=1, vectorized=False):
+    """Play many headless games over a pool of worker processes
+
+       Args:
+           player_types (list(list(str))): Name and type of each player
+           board_type (str): Type of board
+           n_games (int): Number of games to play
+           seed (int): Root seed (game i draws from child i of its SeedSequence, so it can be replayed alone with clisk -s seed -g i)
+           n_workers (int): Number of worker processes (if None, use all cores)
+           board_args (dict(str, val)): Keyword arguments of create_board
+           instant_battles (bool): Whether or not to resolve attacks in a single draw
+           record_dir (str): Directory to write a binary record of each game to (if None, do not record)
+           callback (function(dict(str, val))): Called with the result of each game
+           timing (bool): Whether or not to time the phases, player decisions and board queries of the games
+           batch_size (int): Number of games each worker plays together, sending the decisions of bot players in batches
+           vectorized (bool): Whether or not to step the games of each batch together as arrays (random players only, see
+               vector.VectorGames), which only makes whole batches reproducible, so results depend on batch_size
+
+       Returns:
+           (dict(str, val)): Aggregate results
+    """
+    n_workers = n_workers or multiprocessing.cpu_count()
+    if vectorized: from .vector import play_batch as play_function
+    else: play_function = play_batch
+    board_args = board_args or {}
+    root = SeedSequence(seed)
+    jobs = [(root.get_child(i), player_types, board_type, board_args, instant_battles, record_dir, timing) for i in range(n_games)]
+    batches = [jobs[i:i + batch_size] for i in range(0, n_games, batch_size)]
+    stats = {
+        'games': 0,
+        'workers': n_workers,
+        'wins': dict((name, 0) for [name, type] in player_types),
+        'turns': {'total': 0, 'min': None, 'max': None},
+        'time': {'total': 0., 'min': None, 'max': None},
+    }
+    timing_stats = Stats()
+    start = time.time()
+    pool = multiprocessing.Pool(n_workers)
+    try:
+        chunksize = max(1, min(100, len(batches) // (4 * n_workers)))
+        for result in itertools.chain.from_iterable(pool.imap_unordered(play_function, batches, chunksize)):
+            stats['games'] += 1
+            stats['wins'][result['winner']] += 1
+            for key in ['turns', 'time']:
+                s = stats[key]
+                s['total'] += result[key]
+                s['min'] = result[key] if s['min'] is None else min(s['min'], result[key])
+                s['max'] = result[key] if s['max'] is None else max(s['max'], result[key])
+            if timing: timing_stats.merge(result.pop('stats'))
+            if callback: callback(result)
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    stats['wall_time'] = time.time() - start
+    if timing: stats['timing'] = timing_stats.to_dict()
+    return stats
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description='clisk-sim: Play many headless clisk games in parallel.')
+    parser.add_argument('-p', '--player', metavar=('name', 'type'), nargs=2, action='append',
+                        dest='players', help='player type (e.g. ai1 random, ai2 random, etc.)', required=True)
+    parser.add_argument('-b', '--board', metavar='board', help='board type (e.g. classic, grid, etc.)', default='classic')
+    parser.add_argument('-c', '--compact', action='store_true', help='store the board state in flat arrays (grids then compute their borders)')
+    parser.add_argument('--region-size', metavar='n', type=int, help='number of cells along the side of a grid region', default=2)
+    parser.add_argument('--regions-per-side', metavar='n', type=int, help='number of regions along the side of a grid', default=2)
+    parser.add_argument('-m', '--connected-moves', action='store_true', help='allow moving troops through any chain of owned territories')
+    parser.add_argument('-i', '--instant-battles', action='store_true', help='resolve each attack in a single draw')
+    parser.add_argument('-n', '--n-games', metavar='n', type=int, help='number of games', default=100)
+    parser.add_argument('-j', '--jobs', metavar='n', type=int, help='number of worker processes (default: all cores)', default=None)
+    parser.add_argument('-s', '--seed', metavar='seed', type=int, help='root seed of the games', default=0)
+    parser.add_argument('-r', '--record-dir', metavar='dir', help='write a binary record of each game to a directory', default=None)
+    parser.add_argument('--batch-size', metavar='n', type=int, help='number of games each worker plays together, batching bot decisions (default: 1, or 1000 if vectorized)', default=None)
+    parser.add_argument('-V', '--vectorized', action='store_true', help='step the games of each batch together as arrays (random players only, needs numpy)')
+    parser.add_argument('-o', '--output', metavar='file', help='write the result of each game to a JSON lines file', default=None)
+    parser.add_argument('-t', '--timing', action='store_true', help='report the time spent in each phase, player decision and board query')
+    parser.add_argument('--timing-output', metavar='file', help='write the timing report to a JSON file', default=None)
+    args = parser.parse_args()
+
+    # Additional argument checks
+    try:
+        if len(args.players) < 2: raise ValueError('error: At least 2 players are required.')
+        if len(set([name for [name, type] in args.players])) != len(args.players): raise ValueError('error: Player names must all be different.')
+        if args.region_size < 1 or args.regions_per_side < 1 or args.region_size * args.regions_per_side < 2:
+            raise ValueError('error: --region-size and --regions-per-side must be at least 1, with at least 2 cells per side.')
+        if any(type == 'human' for [name, type] in args.players): raise ValueError('error: Human players cannot play headless games.')
+        for [name, type] in args.players:
+            if type.startswith('mcts:'):
+                # Only loaded for search players, as are players in create_player
+                from .player.mcts_player import parse_options
+                parse_options(type[5:])
+        if args.n_games < 1: raise ValueError('error: At least 1 game is required.')
+        if args.batch_size is None: args.batch_size = 1000 if args.vectorized else 1
+        if args.batch_size < 1: raise ValueError('error: The batch size must be at least 1.')
+        if args.vectorized:
+            if any(type != 'random' for [name, type] in args.players): raise ValueError('error: Vectorized games only support random players.')
+            if args.record_dir or args.timing or args.timing_output or args.connected_moves:
+                raise ValueError('error: Vectorized games cannot be recorded, timed or use connected moves.')
+    except Exception as e:
+        print(e)
+        parser.print_usage()
+        sys.exit(1)
+
+    # Play games
+    output = open(args.output, 'w') if args.output else None
+    try:
+        callback = (lambda result: output.write(json.dumps(result) + '\n')) if output else None
+        board_args = {'compact': args.compact, 'region_size': args.region_size, 'n_regions_per_side': args.regions_per_side,
+                      'connected_moves': args.connected_moves}
+        stats = run(args.players, args.board, args.n_games, args.seed, args.jobs, board_args, args.instant_battles, args.record_dir, callback,
+                    args.timing or bool(args.timing_output), args.batch_size, args.vectorized)
+    finally:
+        if output: output.close()
+
+    # Report
+    n_games = stats['games']
+    print('Played %i games in %.2f s (%.1f games/s) with %i workers' % (n_games, stats['wall_time'], n_games / stats['wall_time'], stats['workers']))
+    for name, n_wins in sorted(stats['wins'].items()):
+        print('Player %s wins: %i (%.1f%%)' % (name, n_wins, 100. * n_wins / n_games))
+    turns, times = stats['turns'], stats['time']
+    print('Turns per game: mean %.1f, min %i, max %i' % (turns['total'] / n_games, turns['min'], turns['max']))
+    print('Time per game: mean %.1f ms, min %.1f ms, max %.1f ms' % (1e3 * times['total'] / n_games, 1e3 * times['min'], 1e3 * times['max']))
+    if 'timing' in stats:
+        timing_stats = Stats()
+        timing_stats.merge(stats['timing'])
+        if args.timing: print(timing_stats.report())
+        if args.timing_output: timing_stats.save(args.timing_output)
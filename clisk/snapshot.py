@@ -0,0 +1,223 @@
+import json, struct
+from .record import write_varint, read_varint, write_string, read_string
+
+MAGIC = b'CLSN'
+VERSION = 1
+
+# Phases of a turn, as numbered in snapshots (see Game.phase)
+PHASES = ('start', 'placement', 'attack', 'move')
+
+# Mersenne Twister state: 624 words and the position in them
+MT_STATE = struct.Struct('<625I')
+GAUSS = struct.Struct('<d')
+
+def write_random(buffer, random):
+    """Append the state of a random engine to a buffer
+
+       Args:
+           buffer (bytearray): Output buffer
+           random (random.Random): Random engine
+    """
+    version, internal, gauss_next = random.getstate()
+    write_varint(buffer, version)
+    buffer.extend(MT_STATE.pack(*internal))
+    if gauss_next is None:
+        buffer.append(0)
+    else:
+        buffer.append(1)
+        buffer.extend(GAUSS.pack(gauss_next))
+
+def read_random(buffer, pos):
+    """Read the state of a random engine from a buffer
+
+       Args:
+           buffer (bytearray): Input buffer
+           pos (int): Position of the state
+
+       Returns:
+           (tuple, int): State as returned by random.getstate and position following it
+    """
+    version, pos = read_varint(buffer, pos)
+    internal = MT_STATE.unpack_from(bytes(buffer[pos:pos+MT_STATE.size]))
+    pos += MT_STATE.size
+    gauss_next = None
+    has_gauss = buffer[pos]
+    pos += 1
+    if has_gauss:
+        gauss_next = GAUSS.unpack_from(bytes(buffer[pos:pos+GAUSS.size]))[0]
+        pos += GAUSS.size
+    return (version, internal, gauss_next), pos
+
+def write_ids(buffer, territories, territory_ids):
+    """Append a list of territories to a buffer as territory ids
+
+       Args:
+           buffer (bytearray): Output buffer
+           territories (list(str)): Names of territories
+           territory_ids (dict(str, int)): Territory id of each territory
+    """
+    write_varint(buffer, len(territories))
+    for territory in territories: write_varint(buffer, territory_ids[territory])
+
+def read_ids(buffer, pos, territories):
+    """Read a list of territories written by write_ids
+
+       Args:
+           buffer (bytearray): Input buffer
+           pos (int): Position of the list
+           territories (list(str)): All territories, indexed by territory id
+
+       Returns:
+           (list(str), int): Names of territories and position following the list
+    """
+    n, pos = read_varint(buffer, pos)
+    result = []
+    for i in range(n):
+        i_territory, pos = read_varint(buffer, pos)
+        result.append(territories[i_territory])
+    return result, pos
+
+def dump_game(game, random=True):
+    """Take a compact binary snapshot of a game
+
+       The snapshot holds the owner and troops of each territory and the
+       order of the board indices (see Board.get_orders), the turn, player
+       and phase the game is at, the state of the random engines and the
+       state players keep between decisions (see Player.get_state). The
+       board layout is not included, it is rebuilt by the caller, so huge
+       boards snapshot in a few bytes per territory.
+
+       Args:
+           game (Game): Game
+           random (bool): Whether or not to include the state of the random engines
+
+       Returns:
+           (bytes): Snapshot
+    """
+    names = [player.name for player in game.players]
+    player_ids = dict((name, i) for i, name in enumerate(names))
+    buffer = bytearray(MAGIC)
+    buffer.append(VERSION)
+    write_varint(buffer, game.n_turns)
+    write_varint(buffer, game.player_index)
+    buffer.append(PHASES.index(game.phase))
+    write_varint(buffer, 0 if game.winner is None else player_ids[game.winner] + 1)
+    write_varint(buffer, len(names))
+    for name in names: write_string(buffer, name)
+
+    # Board state, owners as player ids + 1 (0 if unowned)
+    territories = game.board.get_territories()
+    write_varint(buffer, len(territories))
+    for territory in territories:
+        owner = game.board.get_owner(territory)
+        write_varint(buffer, 0 if owner is None else player_ids[owner] + 1)
+        write_varint(buffer, game.board.get_n_troops(territory))
+
+    # Order of the board indices, which decides the order of query results
+    territory_ids = dict((t, i) for i, t in enumerate(territories))
+    orders = game.board.get_orders()
+    write_varint(buffer, len(orders))
+    for player, player_territories, attackers, movers, groups in orders:
+        write_varint(buffer, player_ids[player])
+        for ts in (player_territories, attackers, movers): write_ids(buffer, ts, territory_ids)
+        if groups is None:
+            buffer.append(0)
+        else:
+            buffer.append(1)
+            write_varint(buffer, len(groups))
+            for ts in groups: write_ids(buffer, ts, territory_ids)
+
+    # Random engines of the game and players (players without one are flagged)
+    buffer.append(1 if random else 0)
+    if random: write_random(buffer, game.random)
+    for player in game.players:
+        player_random = getattr(player, 'random', None)
+        if random and hasattr(player_random, 'getstate'):
+            buffer.append(1)
+            write_random(buffer, player_random)
+        else:
+            buffer.append(0)
+        write_string(buffer, json.dumps(player.get_state(), separators=(',', ':')))
+    return bytes(buffer)
+
+def load_game(game, data, random=True):
+    """Restore a game from a snapshot
+
+       The game must have the same players, in the same order, and a board
+       of the same layout as the game the snapshot was taken from. The game
+       then continues from the phase it was at, asking the current player
+       for its first decision of the phase again if the snapshot was taken
+       in the middle of one. On Python 3 the resumed game plays exactly as
+       the original would have, on Python 2 dictionaries have no order to
+       restore, so it continues from the same position but may differ.
+
+       Args:
+           game (Game): Game, set up with setup=False
+           data (bytes): Snapshot
+           random (bool): Whether or not to restore the state of the random engines (if False, continue with the current engines, e.g. to fork new continuations)
+    """
+    buffer = bytearray(data)
+    if bytes(buffer[:len(MAGIC)]) != MAGIC: raise ValueError('not a clisk snapshot')
+    if buffer[len(MAGIC)] != VERSION: raise ValueError('unsupported snapshot version: %i' % (buffer[len(MAGIC)]))
+    pos = len(MAGIC) + 1
+    n_turns, pos = read_varint(buffer, pos)
+    player_index, pos = read_varint(buffer, pos)
+    phase = PHASES[buffer[pos]]
+    pos += 1
+    winner_id, pos = read_varint(buffer, pos)
+    n_players, pos = read_varint(buffer, pos)
+    names = []
+    for i in range(n_players):
+        name, pos = read_string(buffer, pos)
+        names.append(name)
+    if names != [player.name for player in game.players]:
+        raise ValueError('snapshot players %s do not match the game players' % (', '.join(names)))
+
+    # Board state
+    territories = game.board.get_territories()
+    n_territories, pos = read_varint(buffer, pos)
+    if n_territories != len(territories):
+        raise ValueError('snapshot has %i territories, the board %i' % (n_territories, len(territories)))
+    for territory in territories:
+        owner_id, pos = read_varint(buffer, pos)
+        n_troops, pos = read_varint(buffer, pos)
+        if owner_id: game.board.assign(territory, names[owner_id - 1])
+        game.board.set_n_troops(territory, n_troops)
+    n_orders, pos = read_varint(buffer, pos)
+    orders = []
+    for i in range(n_orders):
+        player_id, pos = read_varint(buffer, pos)
+        player_territories, pos = read_ids(buffer, pos, territories)
+        attackers, pos = read_ids(buffer, pos, territories)
+        movers, pos = read_ids(buffer, pos, territories)
+        groups = None
+        has_groups = buffer[pos]
+        pos += 1
+        if has_groups:
+            n_groups, pos = read_varint(buffer, pos)
+            groups = []
+            for j in range(n_groups):
+                ts, pos = read_ids(buffer, pos, territories)
+                groups.append(ts)
+        orders.append((names[player_id], player_territories, attackers, movers, groups))
+    game.board.set_orders(orders)
+
+    # Random engines and player state
+    has_random = buffer[pos]
+    pos += 1
+    if has_random:
+        state, pos = read_random(buffer, pos)
+        if random: game.random.setstate(state)
+    for player in game.players:
+        has_random = buffer[pos]
+        pos += 1
+        if has_random:
+            state, pos = read_random(buffer, pos)
+            if random: player.random.setstate(state)
+        player_state, pos = read_string(buffer, pos)
+        player.set_state(json.loads(player_state))
+
+    game.n_turns = n_turns
+    game.player_index = player_index
+    game.phase = phase
+    game.winner = names[winner_id - 1] if winner_id else None
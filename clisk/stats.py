@@ -0,0 +1,156 @@
+from __future__ import division
+import json
+from timeit import default_timer as clock
+
+class Stats(object):
+    """Wall time and call counts of named operations
+
+       Attributes:
+           calls (dict(str, int)): Number of calls of each operation
+           times (dict(str, float)): Total seconds spent in each operation
+    """
+
+    def __init__(self):
+        """Initialize stats
+        """
+        self.calls = {}
+        self.times = {}
+
+    def add(self, name, seconds, n_calls=1):
+        """Record calls of an operation
+
+           Args:
+               name (str): Name of operation
+               seconds (float): Seconds spent in the calls
+               n_calls (int): Number of calls
+        """
+        self.calls[name] = self.calls.get(name, 0) + n_calls
+        self.times[name] = self.times.get(name, 0.) + seconds
+
+    def call(self, name, function, *args):
+        """Call a function and record its wall time
+
+           Args:
+               name (str): Name of operation
+               function (function): Function to call
+               *args: Arguments of function
+
+           Returns:
+               (val): Return value of function
+        """
+        start = clock()
+        try:
+            return function(*args)
+        finally:
+            self.add(name, clock() - start)
+
+    def merge(self, stats):
+        """Add the calls and times of other stats
+
+           Args:
+               stats (dict(str, dict(str, val))): Stats exported by to_dict
+        """
+        for name, s in stats.items(): self.add(name, s['time'], s['calls'])
+
+    def to_dict(self):
+        """Export the stats
+
+           Returns:
+               (dict(str, dict(str, val))): Number of calls and total seconds of each operation
+        """
+        return dict((name, {'calls': self.calls[name], 'time': self.times[name]}) for name in self.calls)
+
+    def save(self, path):
+        """Write the stats to a JSON file
+
+           Args:
+               path (str): Path of output file
+        """
+        with open(path, 'w') as f: json.dump(self.to_dict(), f, indent=4, sort_keys=True)
+
+    def report(self):
+        """Describe the stats, slowest operations first
+
+           Returns:
+               (str): Table of calls, total time and mean time of each operation
+        """
+        lines = ['%-40s %10s %12s %12s' % ('operation', 'calls', 'total (ms)', 'mean (us)')]
+        for name in sorted(self.times, key=lambda name: -self.times[name]):
+            n_calls, seconds = self.calls[name], self.times[name]
+            lines.append('%-40s %10i %12.3f %12.3f' % (name, n_calls, 1e3 * seconds, 1e6 * seconds / max(1, n_calls)))
+        return '\n'.join(lines)
+
+class Instrumented(object):
+    """Proxy recording the wall time of every public method call of an object
+
+       Other attributes are read from and written to the object itself.
+       Calls the object makes on itself are not recorded.
+
+       Attributes:
+           _target (object): Proxied object
+           _prefix (str): Prefix of the recorded operation names
+           _stats (Stats): Stats to record to
+    """
+
+    def __init__(self, target, prefix, stats):
+        """Initialize proxy
+
+           Args:
+               target (object): Object to proxy
+               prefix (str): Prefix of the recorded operation names
+               stats (Stats): Stats to record to
+        """
+        self.__dict__.update(_target=target, _prefix=prefix, _stats=stats)
+
+    def __getattr__(self, name):
+        """Return an attribute of the object, timing methods
+
+           Args:
+               name (str): Name of attribute
+
+           Returns:
+               (val): Attribute
+        """
+        if name.startswith('__'): raise AttributeError(name)
+        value = getattr(self._target, name)
+        if name.startswith('_') or not callable(value): return value
+        key, stats = self._prefix + '.' + name, self._stats
+        def method(*args, **kwargs):
+            start = clock()
+            try:
+                return value(*args, **kwargs)
+            finally:
+                stats.add(key, clock() - start)
+        self.__dict__[name] = method
+        return method
+
+    def __setattr__(self, name, value):
+        """Set an attribute of the object
+
+           Args:
+               name (str): Name of attribute
+               value (val): Value
+        """
+        setattr(self._target, name, value)
+
+    def __reduce_ex__(self, protocol):
+        """Pickle the object itself, so other processes receive it without the proxy
+
+           Args:
+               protocol (int): Pickle protocol
+
+           Returns:
+               (tuple): Function and arguments to rebuild the object
+        """
+        return unwrap, (self._target,)
+
+def unwrap(target):
+    """Return an unpickled object in place of its proxy
+
+       Args:
+           target (object): Proxied object
+
+       Returns:
+           (object): The object
+    """
+    return target
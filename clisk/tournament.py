@@ -0,0 +1,345 @@
+from __future__ import print_function, division
+import argparse, itertools, json, math, multiprocessing, sys, time
+from .sim import play_game
+from .rng import SeedSequence
+
+def get_expected_score(elo):
+    """Get the probability of winning against an opponent
+
+       Args:
+           elo (float): Rating difference with the opponent
+
+       Returns:
+           (float): Probability of winning
+    """
+    return 1. / (1. + 10. ** (-elo / 400.))
+
+def get_llr(n_wins, n_losses, elo0, elo1):
+    """Get the log-likelihood ratio of two rating differences given the results of a match
+
+       Args:
+           n_wins (int): Number of games won
+           n_losses (int): Number of games lost
+           elo0 (float): Rating difference under the null hypothesis
+           elo1 (float): Rating difference under the alternative hypothesis
+
+       Returns:
+           (float): Log-likelihood ratio of the alternative over the null hypothesis
+    """
+    p0, p1 = get_expected_score(elo0), get_expected_score(elo1)
+    return n_wins * math.log(p1 / p0) + n_losses * math.log((1. - p1) / (1. - p0))
+
+def get_sprt_result(n_wins, n_losses, elo, alpha=0.05, beta=0.05):
+    """Run a sequential probability ratio test of which player of a match is stronger
+
+       Tests a rating difference of -elo against +elo, so the test ends once
+       either player is shown stronger by the margin.
+
+       Args:
+           n_wins (int): Number of games won by the first player
+           n_losses (int): Number of games lost by the first player
+           elo (float): Rating margin
+           alpha (float): Probability of wrongly finding the first player stronger
+           beta (float): Probability of wrongly finding the second player stronger
+
+       Returns:
+           (int): 1 if the first player is stronger, -1 if the second is and 0 if the test must go on
+    """
+    llr = get_llr(n_wins, n_losses, -elo, elo)
+    if llr >= math.log((1. - beta) / alpha): return 1
+    if llr <= math.log(beta / (1. - alpha)): return -1
+    return 0
+
+def invert(matrix):
+    """Invert a small matrix by Gauss-Jordan elimination
+
+       Args:
+           matrix (list(list(float))): Square matrix
+
+       Returns:
+           (list(list(float))): Inverse matrix
+    """
+    n = len(matrix)
+    rows = [list(row) + [float(i == j) for j in range(n)] for i, row in enumerate(matrix)]
+    for i in range(n):
+        pivot = max(range(i, n), key=lambda k: abs(rows[k][i]))
+        rows[i], rows[pivot] = rows[pivot], rows[i]
+        p = rows[i][i]
+        rows[i] = [x / p for x in rows[i]]
+        for k in range(n):
+            if k != i and rows[k][i]:
+                f = rows[k][i]
+                rows[k] = [x - f * y for x, y in zip(rows[k], rows[i])]
+    return [row[n:] for row in rows]
+
+def fit_ratings(names, wins, n_iterations=1000, tolerance=1e-9):
+    """Fit Bradley-Terry ratings to the results of all games
+
+       Strengths are fitted by minorization-maximization (Hunter 2004), each
+       pair of players that met getting one extra virtual draw so that
+       unbeaten players keep a finite rating. Ratings are on the Elo scale,
+       centered on 0, with standard errors from the inverse Fisher
+       information. Players without games are left out, as unrated.
+
+       Args:
+           names (list(str)): Names of players
+           wins (dict((str, str), int)): Number of games won by the first player of each pair against the second
+           n_iterations (int): Maximum number of iterations
+           tolerance (float): Largest relative change of a strength to stop at
+
+       Returns:
+           (dict(str, float), dict(str, float)): Rating and standard error of the rating of each rated player
+    """
+    names = [name for name in names if any(n_wins for (a, b), n_wins in wins.items() if name in (a, b))]
+    n = len(names)
+    if not n: return {}, {}
+    ids = dict((name, i) for i, name in enumerate(names))
+    w = [[0.] * n for i in range(n)]
+    for (a, b), n_wins in wins.items():
+        if n_wins: w[ids[a]][ids[b]] += n_wins
+    for i, j in itertools.combinations(range(n), 2):
+        if w[i][j] + w[j][i]: w[i][j], w[j][i] = w[i][j] + 0.5, w[j][i] + 0.5
+    games = [[w[i][j] + w[j][i] for j in range(n)] for i in range(n)]
+
+    # Strengths
+    strengths = [1.] * n
+    for iteration in range(n_iterations):
+        previous = strengths
+        strengths = []
+        for i in range(n):
+            denominator = sum(games[i][j] / (previous[i] + previous[j]) for j in range(n) if games[i][j])
+            strengths.append(sum(w[i]) / denominator if denominator else previous[i])
+        mean = math.exp(sum(math.log(s) for s in strengths) / n)
+        strengths = [s / mean for s in strengths]
+        if max(abs(s / p - 1.) for s, p in zip(strengths, previous)) < tolerance: break
+    thetas = [math.log(s) for s in strengths]
+
+    # Covariance of the centered log-strengths
+    information = [[0.] * n for i in range(n)]
+    for i, j in itertools.combinations(range(n), 2):
+        if not games[i][j]: continue
+        p = 1. / (1. + math.exp(thetas[j] - thetas[i]))
+        f = games[i][j] * p * (1. - p)
+        information[i][i] += f
+        information[j][j] += f
+        information[i][j] -= f
+        information[j][i] -= f
+    covariance = invert([[x + 1. / n for x in row] for row in information])
+
+    scale = 400. / math.log(10.)
+    ratings = dict((name, scale * thetas[i]) for i, name in enumerate(names))
+    errors = dict((name, scale * math.sqrt(max(0., covariance[i][i] - 1. / n))) for i, name in enumerate(names))
+    return ratings, errors
+
+def pair_swiss(names, scores, played, byes):
+    """Pair players of similar scores that have not met yet
+
+       With an odd number of players, the lowest ranked player without a bye
+       so far sits out.
+
+       Args:
+           names (list(str)): Names of players, in order of seeding
+           scores (dict(str, float)): Score of each player
+           played (dict((str, str), None)): Pairs of players that have met, in both orders
+           byes (dict(str, None)): Players that have sat out a round
+
+       Returns:
+           (list((str, str)), str): Pairs of players and the player sitting out (None if there is an even number of players)
+    """
+    ranked = sorted(names, key=lambda name: -scores[name])
+    bye = None
+    if len(ranked) % 2:
+        bye = next((name for name in reversed(ranked) if name not in byes), ranked[-1])
+        ranked.remove(bye)
+    pairs = []
+    while ranked:
+        a = ranked.pop(0)
+        b = next((b for b in ranked if (a, b) not in played), ranked[0])
+        ranked.remove(b)
+        pairs.append((a, b))
+    return pairs, bye
+
+class Match(object):
+    """Games between two players, stopped by a sequential test
+
+       Attributes:
+           players (list(list(str))): Name and type of both players
+           n_wins (int): Number of games won by the first player
+           n_losses (int): Number of games won by the second player
+           n_scheduled (int): Number of games started
+           result (int): 1 if the first player is stronger, -1 if the second is and 0 if undecided
+           seed_sequence (SeedSequence): Seed sequence of the match (game i draws from its child i)
+    """
+
+    def __init__(self, player0, player1, seed_sequence):
+        """Initialize match
+
+           Args:
+               player0 (list(str)): Name and type of first player
+               player1 (list(str)): Name and type of second player
+               seed_sequence (SeedSequence): Seed sequence of the match (game i draws from its child i)
+        """
+        self.players = [player0, player1]
+        self.n_wins = 0
+        self.n_losses = 0
+        self.n_scheduled = 0
+        self.result = 0
+        self.seed_sequence = seed_sequence
+
+    def get_jobs(self, n_games, boards, instant_battles):
+        """Schedule games, the players taking turns moving first and the boards taking turns
+
+           Args:
+               n_games (int): Number of games
+               boards (list((str, dict(str, val)))): Type and keyword arguments of create_board of each board
+               instant_battles (bool): Whether or not to resolve attacks in a single draw
+
+           Returns:
+               (list(tuple)): Jobs of sim.play_game
+        """
+        jobs = []
+        for i in range(self.n_scheduled, self.n_scheduled + n_games):
+            board_type, board_args = boards[i % len(boards)]
+            jobs.append((self.seed_sequence.get_child(i), self.players[i % 2:] + self.players[:i % 2], board_type, board_args, instant_battles, None, False))
+        self.n_scheduled += n_games
+        return jobs
+
+def run(entrants, boards, format='round-robin', n_rounds=None, max_games=400, batch_size=20, elo=50., alpha=0.05, beta=0.05,
+        seed=0, n_workers=None, instant_battles=False, callback=None):
+    """Play a tournament between player types over a pool of worker processes
+
+       Each pairing plays batches of games until a sequential probability
+       ratio test decides which player is stronger by the rating margin, or
+       until it reaches the maximum number of games.
+
+       Args:
+           entrants (list(list(str))): Name and type of each player
+           boards (list((str, dict(str, val)))): Type and keyword arguments of create_board of each board played on in turn
+           format (str): round-robin (every pair meets) or swiss (players of similar scores meet, over n_rounds rounds)
+           n_rounds (int): Number of rounds of a Swiss tournament (if None, use log2 of the number of players, rounded up)
+           max_games (int): Maximum number of games per pairing
+           batch_size (int): Number of games per pairing played between two tests
+           elo (float): Rating margin of the sequential tests
+           alpha (float): Probability of wrongly finding the first player of a pairing stronger
+           beta (float): Probability of wrongly finding the second player of a pairing stronger
+           seed (int): Root seed (match i draws from child i of its SeedSequence)
+           n_workers (int): Number of worker processes (if None, use all cores)
+           instant_battles (bool): Whether or not to resolve attacks in a single draw
+           callback (function(Match)): Called with each finished pairing
+
+       Returns:
+           (dict(str, val)): Matches, wins and losses, ratings and their standard errors
+    """
+    n_workers = n_workers or multiprocessing.cpu_count()
+    root = SeedSequence(seed)
+    names = [name for [name, type] in entrants]
+    if format == 'round-robin': rounds = [list(itertools.combinations(entrants, 2))]
+    else: rounds = [None] * (n_rounds or max(1, int(math.ceil(math.log(len(entrants), 2)))))
+    matches, played, byes, scores = [], {}, {}, dict((name, 0.) for name in names)
+
+    start = time.time()
+    pool = multiprocessing.Pool(n_workers)
+    try:
+        for pairs in rounds:
+            if pairs is None:
+                types = dict((name, [name, type]) for [name, type] in entrants)
+                pairs, bye = pair_swiss(names, scores, played, byes)
+                pairs = [(types[a], types[b]) for a, b in pairs]
+                if bye is not None:
+                    # A bye scores as a won pairing
+                    byes[bye] = None
+                    scores[bye] += 1.
+            active = [Match(a, b, root.get_child(len(matches) + i)) for i, (a, b) in enumerate(pairs)]
+            matches += active
+            while active:
+                jobs = []
+                for match in active:
+                    jobs += [(match, job) for job in match.get_jobs(min(batch_size, max_games - match.n_scheduled), boards, instant_battles)]
+                results = pool.imap(play_game, [job for match, job in jobs])
+                for (match, job), result in zip(jobs, results):
+                    if result['winner'] == match.players[0][0]: match.n_wins += 1
+                    else: match.n_losses += 1
+                for match in active:
+                    match.result = get_sprt_result(match.n_wins, match.n_losses, elo, alpha, beta)
+                    if (match.result or match.n_scheduled >= max_games) and callback: callback(match)
+                active = [match for match in active if not match.result and match.n_scheduled < max_games]
+            for match in matches[-len(pairs):]:
+                a, b = match.players[0][0], match.players[1][0]
+                played[(a, b)] = played[(b, a)] = None
+                n_games = match.n_wins + match.n_losses
+                scores[a] += match.n_wins / n_games
+                scores[b] += match.n_losses / n_games
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    wins = {}
+    for match in matches:
+        a, b = match.players[0][0], match.players[1][0]
+        wins[(a, b)] = wins.get((a, b), 0) + match.n_wins
+        wins[(b, a)] = wins.get((b, a), 0) + match.n_losses
+    ratings, errors = fit_ratings(names, wins)
+    return {
+        'matches': [{'players': [m.players[0][0], m.players[1][0]], 'wins': m.n_wins, 'losses': m.n_losses, 'result': m.result} for m in matches],
+        'scores': scores,
+        'ratings': ratings,
+        'errors': errors,
+        'games': sum(m.n_wins + m.n_losses for m in matches),
+        'wall_time': time.time() - start,
+    }
+
+def main():
+    # Parse arguments
+    parser = argparse.ArgumentParser(description='clisk-tournament: Rate player types by playing a tournament between them.')
+    parser.add_argument('-p', '--player', metavar=('name', 'type'), nargs=2, action='append',
+                        dest='players', help='player type (e.g. ai1 random, ai2 mcts, etc.)', required=True)
+    parser.add_argument('-b', '--board', metavar='board', action='append', dest='boards', help='board type, repeat to play on several boards in turn (default: classic)', default=None)
+    parser.add_argument('-c', '--compact', action='store_true', help='store the board state in flat arrays (grids then compute their borders)')
+    parser.add_argument('-f', '--format', choices=['round-robin', 'swiss'], help='tournament format', default='round-robin')
+    parser.add_argument('-r', '--rounds', metavar='n', type=int, help='number of rounds of a Swiss tournament (default: log2 of the number of players)', default=None)
+    parser.add_argument('-n', '--max-games', metavar='n', type=int, help='maximum number of games per pairing', default=400)
+    parser.add_argument('--batch-size', metavar='n', type=int, help='number of games per pairing between two sequential tests', default=20)
+    parser.add_argument('--elo', metavar='x', type=float, help='rating margin the sequential tests decide on', default=50.)
+    parser.add_argument('--alpha', metavar='p', type=float, help='error rate of the sequential tests', default=0.05)
+    parser.add_argument('-i', '--instant-battles', action='store_true', help='resolve each attack in a single draw')
+    parser.add_argument('-j', '--jobs', metavar='n', type=int, help='number of worker processes (default: all cores)', default=None)
+    parser.add_argument('-s', '--seed', metavar='seed', type=int, help='root seed of the games', default=0)
+    parser.add_argument('-o', '--output', metavar='file', help='write the results to a JSON file', default=None)
+    args = parser.parse_args()
+
+    # Additional argument checks
+    try:
+        if len(args.players) < 2: raise ValueError('error: At least 2 players are required.')
+        if len(set([name for [name, type] in args.players])) != len(args.players): raise ValueError('error: Player names must all be different.')
+        if any(type == 'human' for [name, type] in args.players): raise ValueError('error: Human players cannot play headless games.')
+        for [name, type] in args.players:
+            if type.startswith('mcts:'):
+                # Only loaded for search players, as are players in create_player
+                from .player.mcts_player import parse_options
+                parse_options(type[5:])
+        if args.max_games < 1 or args.batch_size < 1: raise ValueError('error: At least 1 game per pairing and batch is required.')
+    except Exception as e:
+        print(e)
+        parser.print_usage()
+        sys.exit(1)
+
+    # Play tournament
+    boards = [(board, {'compact': args.compact}) for board in args.boards or ['classic']]
+    callback = lambda match: print('%s vs %s: %i-%i (%s)' % (match.players[0][0], match.players[1][0], match.n_wins, match.n_losses,
+                                   {1: match.players[0][0] + ' stronger', -1: match.players[1][0] + ' stronger', 0: 'undecided'}[match.result]))
+    results = run(args.players, boards, args.format, args.rounds, args.max_games, args.batch_size, args.elo, args.alpha, args.alpha,
+                  args.seed, args.jobs, args.instant_battles, callback)
+    if args.output:
+        with open(args.output, 'w') as f: json.dump(results, f, indent=4, sort_keys=True)
+
+    # Report
+    print('Played %i games in %.2f s' % (results['games'], results['wall_time']))
+    print('%-20s %10s %10s %10s' % ('player', 'rating', '95% CI', 'score'))
+    ratings, errors = results['ratings'], results['errors']
+    for name in sorted(ratings, key=lambda name: -ratings[name]):
+        print('%-20s %10.1f %10.1f %10.2f' % (name, ratings[name], 1.96 * errors[name], results['scores'][name]))
+    for [name, type] in args.players:
+        if name not in ratings: print('%-20s %10s %10s %10.2f' % (name, 'unrated', '', results['scores'][name]))
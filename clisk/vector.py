@@ -0,0 +1,317 @@
+from __future__ import division
+import time
+import numpy as np
+from .board import create_board
+from .battle import roll_outcomes, max_table_rounds, get_battle_outcomes, get_round_outcomes
+
+def get_padded_cumulatives(cumulatives, n_outcomes):
+    """Stack cumulative distributions, padded with impossible outcomes
+
+       Args:
+           cumulatives (list(list(float))): Cumulative probabilities of each distribution
+           n_outcomes (int): Number of outcomes to pad to
+
+       Returns:
+           (np.ndarray): Cumulative probabilities, with the last possible outcome of each distribution at 1 so an index
+               drawn by counting the cumulatives below a uniform number is always possible
+    """
+    padded = np.ones((len(cumulatives), n_outcomes))
+    for i, cumulative in enumerate(cumulatives):
+        padded[i, :len(cumulative) - 1] = cumulative[:-1]
+    return padded
+
+# Losses of a roll by number of attacking and defending dice
+roll_dice = [(a, d) for a in range(4) for d in range(3)]
+roll_losses = np.zeros((4, 3, 3, 2), dtype=np.int64)
+for a, d in roll_dice:
+    if (a, d) in roll_outcomes: roll_losses[a, d, :len(roll_outcomes[(a, d)])] = [losses for losses, p in roll_outcomes[(a, d)]]
+roll_cumulatives = get_padded_cumulatives([np.cumsum([p for losses, p in roll_outcomes.get(dice, [((0, 0), 1.)])]) for dice in roll_dice], 3).reshape(4, 3, 3)
+
+# Final state of battles with up to max_table_troops on each side
+max_table_troops = 20
+battles = [get_battle_outcomes(a, d) if a + d else ([(0, 0)], [1.]) for a in range(max_table_troops + 1) for d in range(max_table_troops + 1)]
+battle_outcomes = np.zeros((max_table_troops + 1, max_table_troops + 1, 2 * max_table_troops + 1, 2), dtype=np.int64)
+for i, (outcomes, cumulative) in enumerate(battles): battle_outcomes[i // (max_table_troops + 1), i % (max_table_troops + 1), :len(outcomes)] = outcomes
+battle_cumulatives = get_padded_cumulatives([cumulative for outcomes, cumulative in battles], 2 * max_table_troops + 1)
+battle_cumulatives = battle_cumulatives.reshape(max_table_troops + 1, max_table_troops + 1, 2 * max_table_troops + 1)
+
+# Attacker losses over consecutive 3 vs. 2 dice rolls
+round_cumulatives = get_padded_cumulatives([get_round_outcomes(n) for n in range(max_table_rounds + 1)], 2 * max_table_rounds + 1)
+
+class VectorGames(object):
+    """Many games between random players on the same board, stepped together as arrays
+
+       All games take their turns in lock-step and each decision of
+       RandomPlayer is drawn for every game at once: troops are placed
+       uniformly on owned territories, attacks go from a random attacking
+       territory to a random hostile neighbor until a territory is conquered
+       or no territory can attack, and one random move is made to a friendly
+       neighbor. Attacks are resolved roll by roll from the exact loss
+       distribution of each roll. Games follow the same distributions as
+       Game.play with RandomPlayers, not the same random draws.
+
+       Attributes:
+           players (list(str)): Names of players in turn order
+           territories (list(str)): Names of territories
+           neighbors (np.ndarray): Indices of the neighbors of each territory, padded with 0 (T x D)
+           neighbor_mask (np.ndarray): Whether or not each neighbor slot is used (T x D)
+           region_masks (np.ndarray): Whether or not each territory is in each region (R x T)
+           region_sizes (np.ndarray): Number of territories of each region (R)
+           region_values (np.ndarray): Number of extra troops for owning each region (R)
+           owners (np.ndarray): Player index owning each territory of each game (K x T)
+           troops (np.ndarray): Number of troops on each territory of each game (K x T)
+           n_turns (np.ndarray): Number of turns played so far in each game (K)
+           winners (np.ndarray): Player index of the winner of each game (-1 while the game is running)
+           random (np.random.Generator): Random engine
+    """
+
+    def __init__(self, players, board, n_games, random):
+        """Initialize games and randomly distribute territories and starting troops
+
+           Args:
+               players (list(str)): Names of players in turn order
+               board (Board): Gameboard whose territories, borders and regions are played on (its state is ignored)
+               n_games (int): Number of games
+               random (np.random.Generator): Random engine
+        """
+        self.players = list(players)
+        self.random = random
+
+        # Topology
+        self.territories = list(board.get_territories())
+        ids = dict((t, i) for i, t in enumerate(self.territories))
+        neighbors = [[ids[n] for n in board.get_neighbors(t)] for t in self.territories]
+        n_territories, max_degree = len(neighbors), max(len(ns) for ns in neighbors)
+        self.neighbors = np.zeros((n_territories, max_degree), dtype=np.intp)
+        self.neighbor_mask = np.zeros((n_territories, max_degree), dtype=bool)
+        for i, ns in enumerate(neighbors):
+            self.neighbors[i, :len(ns)] = ns
+            self.neighbor_mask[i, :len(ns)] = True
+        self.region_masks = np.zeros((len(board.regions), n_territories), dtype=bool)
+        for r, region in enumerate(board.regions): self.region_masks[r, [ids[t] for t in region['territories']]] = True
+        self.region_sizes = self.region_masks.sum(1)
+        self.region_values = np.array([region['value'] for region in board.regions], dtype=np.int64)
+
+        # State
+        self.owners = np.zeros((n_games, n_territories), dtype=np.int8)
+        self.troops = np.ones((n_games, n_territories), dtype=np.int64)
+        self.n_turns = np.zeros(n_games, dtype=np.int64)
+        self.winners = np.full(n_games, -1, dtype=np.int64)
+        self.setup()
+
+    def setup(self):
+        """Randomly distribute territories and starting troops, as Game.setup
+        """
+        n_games, n_territories = self.owners.shape
+        n_players = len(self.players)
+        assignment = [p for p in range(n_players) for i in range(n_territories // n_players)]
+        assignment += list(range(n_territories - len(assignment)))
+        order = np.argsort(self.random.random((n_games, n_territories)), axis=1)
+        np.put_along_axis(self.owners, order, np.array(assignment, dtype=np.int8)[None, :], axis=1)
+        starting_troops = 40 - (5 * (n_players - 2))
+        games = np.arange(n_games)
+        for p in range(n_players):
+            # Players with more territories than starting troops place none, as sample_multinomial
+            self.place_troops(p, games, np.full(n_games, np.maximum(0, starting_troops - assignment.count(p))))
+
+    def choose(self, mask):
+        """Pick a random True column in each row of a mask
+
+           Args:
+               mask (np.ndarray): Candidates of each row, with at least one per row (N x M)
+
+           Returns:
+               (np.ndarray): Column index picked in each row (N)
+        """
+        return (self.random.random(mask.shape) * mask).argmax(1)
+
+    def place_troops(self, p, games, n_troops):
+        """Place each troop of a player on one of its territories drawn uniformly
+
+           Args:
+               p (int): Player index
+               games (np.ndarray): Indices of games
+               n_troops (np.ndarray): Number of troops to place in each game
+        """
+        n_territories = self.owners.shape[1]
+        owned = self.owners[games] == p
+        rows = np.repeat(np.arange(len(games)), n_troops)
+        if not len(rows): return
+        cumulative = owned.cumsum(1) + (n_territories * np.arange(len(games)))[:, None]
+        ranks = (self.random.random(len(rows)) * owned.sum(1)[rows]).astype(np.int64)
+        cells = np.searchsorted(cumulative.ravel(), n_territories * rows + ranks, side='right')
+        counts = np.bincount(cells, minlength=len(games) * n_territories).reshape(len(games), n_territories)
+        self.troops[games] += counts
+
+    def collect_troops(self, p, games):
+        """Count the troops a player collects at the beginning of their turn
+
+           Args:
+               p (int): Player index
+               games (np.ndarray): Indices of games
+
+           Returns:
+               (np.ndarray): Number of new troops to deploy in each game
+        """
+        owned = self.owners[games] == p
+        n_territories = owned.sum(1)
+        n_troops = np.where(n_territories > 0, np.maximum(3, n_territories // 3), 0)
+        completed = owned.astype(np.int64).dot(self.region_masks.T) == self.region_sizes
+        return n_troops + completed.dot(self.region_values)
+
+    def attack(self, from_territories, to_territories, games):
+        """Attack to completion, as sample_battle
+
+           Battles with at most max_table_troops on each side are drawn in a
+           single step from their exact outcome distribution, larger ones
+           first jump over up to max_table_rounds 3 vs. 2 dice rolls at once.
+
+           Args:
+               from_territories (np.ndarray): Attacking territory of each game
+               to_territories (np.ndarray): Defending territory of each game
+               games (np.ndarray): Indices of games
+
+           Returns:
+               (np.ndarray): Whether or not each attack conquered the defending territory
+        """
+        n_from = self.troops[games, from_territories]
+        n_to = self.troops[games, to_territories]
+        running = np.arange(len(games))
+        while True:
+            a, d = n_from[running], n_to[running]
+            large = (a > max_table_troops) | (d > max_table_troops)
+            if not large.any(): break
+            running, a, d = running[large], a[large], d[large]
+            u = self.random.random(len(running))
+
+            # Consecutive 3 vs. 2 dice rolls
+            jump = (a > 3) & (d > 1)
+            i, a_i, d_i = running[jump], a[jump], d[jump]
+            n_rounds = np.minimum(np.minimum((a_i - 4) // 2, (d_i - 2) // 2) + 1, max_table_rounds)
+            from_losses = (u[jump][:, None] >= round_cumulatives[n_rounds]).sum(1)
+            n_from[i] -= from_losses
+            n_to[i] -= 2 * n_rounds - from_losses
+
+            # Single rolls with few dice on one side
+            i, a_i, d_i = running[~jump], a[~jump], d[~jump]
+            n_attack_dice, n_defend_dice = np.minimum(3, a_i - 1), np.minimum(2, d_i)
+            outcomes = (u[~jump][:, None] >= roll_cumulatives[n_attack_dice, n_defend_dice]).sum(1)
+            losses = roll_losses[n_attack_dice, n_defend_dice, outcomes]
+            n_from[i] -= losses[:, 0]
+            n_to[i] -= losses[:, 1]
+            running = np.flatnonzero((n_from > 1) & (n_to > 0))
+
+        # Final state of the remaining small battles
+        a, d = n_from[running], n_to[running]
+        outcomes = (self.random.random(len(running))[:, None] >= battle_cumulatives[a, d]).sum(1)
+        n_from[running], n_to[running] = battle_outcomes[a, d, outcomes].T
+
+        # Apply the results
+        conquered = n_to == 0
+        self.owners[games[conquered], to_territories[conquered]] = self.owners[games[conquered], from_territories[conquered]]
+        self.troops[games, to_territories] = np.where(conquered, n_from - 1, n_to)
+        self.troops[games, from_territories] = np.where(conquered, 1, n_from)
+        return conquered
+
+    def attack_phase(self, p, games):
+        """Attack until each game's player conquers a territory or cannot attack
+
+           Args:
+               p (int): Player index
+               games (np.ndarray): Indices of games
+        """
+        # Owners only change by a conquest, which ends the phase, and a
+        # failed attack only leaves its attacking territory unable to attack
+        owners = self.owners[games]
+        attacking = (owners == p) & (self.troops[games] > 1) & ((owners[:, self.neighbors] != p) & self.neighbor_mask).any(2)
+        while True:
+            can_attack = attacking.any(1)
+            games, attacking = games[can_attack], attacking[can_attack]
+            if not len(games): return
+            rows = np.arange(len(games))
+            from_territories = self.choose(attacking)
+            neighbors = self.neighbors[from_territories]
+            slots = self.choose((self.owners[games[:, None], neighbors] != p) & self.neighbor_mask[from_territories])
+            conquered = self.attack(from_territories, neighbors[rows, slots], games)
+            attacking[rows, from_territories] = False
+            games, attacking = games[~conquered], attacking[~conquered]
+
+    def move_phase(self, p, games):
+        """Make one move of all but one troop to a friendly neighbor, if any
+
+           Args:
+               p (int): Player index
+               games (np.ndarray): Indices of games
+        """
+        owners = self.owners[games]
+        friendly = (owners[:, self.neighbors] == p) & self.neighbor_mask
+        moving = (owners == p) & (self.troops[games] > 1) & friendly.any(2)
+        games, moving, friendly = games[moving.any(1)], moving[moving.any(1)], friendly[moving.any(1)]
+        if not len(games): return
+        from_territories = self.choose(moving)
+        slots = self.choose(friendly[np.arange(len(games)), from_territories])
+        to_territories = self.neighbors[from_territories, slots]
+        n_troops = self.troops[games, from_territories] - 1
+        self.troops[games, from_territories] -= n_troops
+        self.troops[games, to_territories] += n_troops
+
+    def play_turn(self, p, games):
+        """Play a single turn of a player in each game
+
+           Args:
+               p (int): Player index
+               games (np.ndarray): Indices of games
+        """
+        self.n_turns[games] += 1
+        self.place_troops(p, games, self.collect_troops(p, games))
+        self.attack_phase(p, games)
+        self.move_phase(p, games)
+
+    def get_running_games(self):
+        """Record the winners of finished games and return the others
+
+           Returns:
+               (np.ndarray): Indices of games still running
+        """
+        over = (self.owners == self.owners[:, :1]).all(1) & (self.winners < 0)
+        self.winners[over] = self.owners[over, 0]
+        return np.flatnonzero(self.winners < 0)
+
+    def play(self):
+        """Run the main game loop of all games
+
+           Returns:
+               (list(str)): Name of the winning player of each game
+        """
+        games = self.get_running_games()
+        while len(games):
+            for p in range(len(self.players)):
+                self.play_turn(p, games)
+            games = self.get_running_games()
+        return [self.players[w] for w in self.winners]
+
+def play_batch(jobs):
+    """Play headless games between random players together, as sim.play_batch
+
+       The games share one random engine seeded by the sequence of the first
+       game, so only the whole batch can be reproduced, from that sequence
+       and the same number of games, and the outcomes of a run change with
+       its batch size. Results name the batch seed and the position of the
+       game in the batch instead of a seed of their own.
+
+       Args:
+           jobs (list(tuple)): Seed sequence, player names and types, board type, board options, instant battles flag, record
+               directory and timing flag of each game
+
+       Returns:
+           (list(dict(str, val))): Batch seed, position in the batch, winner, number of turns and wall time of each game,
+               sharing the wall time evenly
+    """
+    start = time.time()
+    seed_sequence, player_types, board_type, board_args = jobs[0][:4]
+    games = VectorGames([name for [name, type] in player_types], create_board(board_type, **board_args), len(jobs),
+                        np.random.default_rng(seed_sequence.generate_seed()))
+    winners = games.play()
+    elapsed = (time.time() - start) / len(jobs)
+    return [{'batch_seed': str(seed_sequence), 'batch_game': i, 'winner': winner, 'turns': int(n_turns), 'time': elapsed}
+            for i, (winner, n_turns) in enumerate(zip(winners, games.n_turns))]
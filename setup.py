@@ -49,7 +49,7 @@ setup(
         'Intended Audience :: Developers',
         'Intended Audience :: End Users/Desktop',
         'Topic :: Games/Entertainment',
-        'Topic :: Games/Entertainment :: Board Games'
+        'Topic :: Games/Entertainment :: Board Games',
 
         # Pick your license as you wish (should match "license" above)
         'License :: OSI Approved :: MIT License',
@@ -59,17 +59,23 @@ setup(
         'Programming Language :: Python :: 2',
         'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
     ],
 
+    # Python 2.7 runs everything but clisk-server, which needs asyncio.run (Python 3.7)
+    python_requires='>=2.7, !=3.0.*, !=3.1.*, !=3.2.*, !=3.3.*, !=3.4.*, !=3.5.*, !=3.6.*',
+
     # What does your project relate to?
     keywords='cli risk',
 
     # You can just specify the packages manually here if your project is
     # simple. Or you can use find_packages().
-    packages=find_packages(exclude=['examples']),
+    packages=find_packages(exclude=['examples', 'tests']),
 
     # Alternatively, if you want to distribute just a my_module.py, uncomment
     # this:
@@ -88,13 +94,15 @@ setup(
     extras_require={
     #    'dev': ['check-manifest'],
     #    'test': ['coverage'],
+        'test': ['pytest'],
+        'vector': ['numpy'],
     },
 
     # If there are data files included in your packages that need to be
     # installed, specify them here.  If using Python 2.6 or less, then these
     # have to be included in MANIFEST.in as well.
     package_data={
-    #    'sample': ['package_data.dat'],
+        'clisk.board': ['maps/*.json'],
     },
 
     # Although 'package_data' is the preferred approach, in some case you may
@@ -110,6 +118,10 @@ setup(
     entry_points={
         'console_scripts': [
             'clisk=clisk:main',
+            'clisk-sim=clisk.sim:main',
+            'clisk-bench=clisk.bench:main',
+            'clisk-server=clisk.server:main',
+            'clisk-tournament=clisk.tournament:main',
         ],
     },
 )
@@ -0,0 +1,95 @@
+import random
+import pytest
+from clisk.battle import sample_battle
+from clisk.bench import make_game
+from clisk.player.mcts_player import get_attacks, get_moves
+
+BOARDS = [
+    ('classic', {}),
+    ('classic', {'compact': True}),
+    ('grid', {}),
+    ('grid', {'compact': True}),
+    ('grid', {'connected_moves': True}),
+    ('grid', {'compact': True, 'connected_moves': True}),
+]
+
+def get_state(board, players):
+    """Return everything the queries of a board tell about its state
+
+       Territories are compared as sets, since undoing may reorder the
+       incremental indices.
+
+       Args:
+           board (Board): The gameboard
+           players (list(str)): Names of players
+
+       Returns:
+           (dict(str, val)): State of the territories, of each player and of the regions
+    """
+    territories = board.get_territories()
+    return {
+        'territories': [(t, board.get_owner(t), board.get_n_troops(t), sorted(board.get_hostile_neighbors(t)),
+                         sorted(board.get_move_targets(t))) for t in territories],
+        'players': sorted(board.get_players()),
+        'counts': board.count_territories(),
+        'player': dict((p, (sorted(board.get_territories(p)), sorted(board.get_attacking_territories(p)),
+                            sorted(board.get_moving_territories(p)), board.count_territories(p), board.total_troops(p),
+                            [r['name'] for r in board.get_player_regions(p)],
+                            [board.count_region_territories(r, p) for r in range(len(board.regions))])) for p in players),
+    }
+
+def get_actions(board, players, rng):
+    """Return the actions available on a board, with sampled battle outcomes
+
+       Args:
+           board (Board): The gameboard
+           players (list(str)): Names of players
+           rng (random): Random engine
+
+       Returns:
+           (list(tuple)): Place, battle and move actions
+    """
+    actions = []
+    for player in players:
+        actions += [('place', t, rng.randint(1, 5)) for t in board.get_territories(player)[:3]]
+        for kind, from_territory, to_territory in get_attacks(board, player):
+            n_from_troops, n_to_troops = sample_battle(board.get_n_troops(from_territory), board.get_n_troops(to_territory), rng)
+            actions.append(('battle', from_territory, to_territory, n_from_troops, n_to_troops))
+        actions += get_moves(board, player)
+    return actions
+
+@pytest.mark.parametrize('board_type, board_args', BOARDS)
+def test_undo_restores_board(board_type, board_args):
+    """Undoing applied actions one by one goes back through the same states
+    """
+    rng = random.Random(0)
+    for seed in range(3):
+        game = make_game(board_type, board_args, seed=seed)
+        board, players = game.board, [player.name for player in game.players]
+        states = [get_state(board, players)]
+        for i in range(60):
+            actions = get_actions(board, players, rng)
+            if not actions: break
+            board.apply(rng.choice(actions))
+            states.append(get_state(board, players))
+        for state in reversed(states[:-1]):
+            board.undo()
+            assert get_state(board, players) == state
+        assert not board.history
+
+@pytest.mark.parametrize('board_type, board_args', BOARDS)
+def test_copy_is_independent(board_type, board_args):
+    """Actions applied to a copy leave the original board as it was
+    """
+    rng = random.Random(1)
+    game = make_game(board_type, board_args)
+    board, players = game.board, [player.name for player in game.players]
+    state = get_state(board, players)
+    sim = board.copy()
+    for i in range(30):
+        actions = get_actions(sim, players, rng)
+        if not actions: break
+        sim.apply(rng.choice(actions))
+    assert get_state(board, players) == state
+    while sim.history: sim.undo()
+    assert get_state(sim, players) == state
@@ -0,0 +1,124 @@
+from __future__ import division
+import itertools, math, random
+import pytest
+from clisk import battle
+from clisk.battle import get_roll_outcomes, get_battle_outcomes, get_round_outcomes, sample_battle, get_win_probability, roll_outcomes
+from clisk.bench import make_game
+
+# Exact distribution of the losses of each roll, from all the dice combinations
+rolls = dict(((a, d), get_roll_outcomes(a, d)) for a, d in itertools.product([1, 2, 3], [1, 2]))
+
+def get_exact_outcomes(n_from_troops, n_to_troops, cache):
+    """Compute the distribution of the final state of an attack to completion roll by roll
+
+       Args:
+           n_from_troops (int): Number of troops on the attacking territory
+           n_to_troops (int): Number of troops on the defending territory
+           cache (dict((int, int), dict((int, int), float))): Distributions already computed
+
+       Returns:
+           (dict((int, int), float)): Probability of each final (attacking troops, defending troops)
+    """
+    key = (n_from_troops, n_to_troops)
+    if n_from_troops < 2 or not n_to_troops: return {key: 1.}
+    if key not in cache:
+        final = {}
+        for (from_losses, to_losses), p_roll in rolls[(min(3, n_from_troops - 1), min(2, n_to_troops))].items():
+            for state, p in get_exact_outcomes(n_from_troops - from_losses, n_to_troops - to_losses, cache).items():
+                final[state] = final.get(state, 0.) + p_roll * p
+        cache[key] = final
+    return cache[key]
+
+def get_probabilities(outcomes, cumulative):
+    """Turn outcomes and cumulative probabilities into a distribution
+
+       Args:
+           outcomes (list((int, int))): Final states
+           cumulative (list(float)): Cumulative probabilities
+
+       Returns:
+           (dict((int, int), float)): Probability of each final state
+    """
+    return dict((state, p - p_previous) for state, p, p_previous in zip(outcomes, cumulative, [0.] + cumulative[:-1]))
+
+def check_samples(counts, expected, n_samples):
+    """Check sampled counts against a distribution, within 5 standard deviations
+
+       Args:
+           counts (dict((int, int), int)): Number of samples of each final state
+           expected (dict((int, int), float)): Probability of each final state
+           n_samples (int): Number of samples
+    """
+    assert set(counts) <= set(expected)
+    for state, p in expected.items():
+        assert abs(counts.get(state, 0) - n_samples * p) <= 5 * math.sqrt(n_samples * p * (1 - p)) + 1, state
+
+def test_roll_outcomes():
+    """The tabulated roll outcomes are the exact ones
+    """
+    for dice, exact in rolls.items():
+        outcomes = dict(roll_outcomes[dice])
+        assert sorted(outcomes) == sorted(exact)
+        for losses, p in exact.items(): assert outcomes[losses] == pytest.approx(p, abs=1e-15)
+
+def test_battle_outcomes():
+    """Battle outcomes are the distributions of rolling dice by dice
+    """
+    cache = {}
+    for n_from_troops, n_to_troops in itertools.product(range(1, 16), range(1, 16)):
+        probabilities = get_probabilities(*get_battle_outcomes(n_from_troops, n_to_troops))
+        exact = get_exact_outcomes(n_from_troops, n_to_troops, cache)
+        assert sorted(probabilities) == sorted(s for s, p in exact.items() if p)
+        for state, p in exact.items(): assert probabilities.get(state, 0.) == pytest.approx(p, abs=1e-12)
+        assert get_win_probability(n_from_troops, n_to_troops) == pytest.approx(sum(p for (n_from, n_to), p in exact.items() if not n_to), abs=1e-12)
+
+def test_round_outcomes():
+    """Consecutive 3 vs. 2 rolls lose troops as independent rolls do
+    """
+    p_roll = rolls[(3, 2)]
+    p = {0: 1.}
+    for n_rounds in range(1, 8):
+        p_next = {}
+        for n_losses, p_i in p.items():
+            for (from_losses, to_losses), p_j in p_roll.items(): p_next[n_losses + from_losses] = p_next.get(n_losses + from_losses, 0.) + p_i * p_j
+        p = p_next
+        cumulative = get_round_outcomes(n_rounds)
+        assert len(cumulative) == 2 * n_rounds + 1
+        for n_losses, p_total in enumerate(cumulative): assert p_total == pytest.approx(sum(p[i] for i in range(n_losses + 1)), abs=1e-12)
+
+@pytest.mark.parametrize('max_table_troops', [battle.max_table_troops, 0])
+def test_sample_battle(monkeypatch, max_table_troops):
+    """Sampled battles follow the exact distribution, drawn from the tables or by jumping over rounds
+    """
+    monkeypatch.setattr(battle, 'max_table_troops', max_table_troops)
+    rng, cache, n_samples = random.Random(0), {}, 10000
+    for n_from_troops, n_to_troops in [(2, 1), (4, 3), (12, 10), (30, 12)]:
+        counts = {}
+        for i in range(n_samples):
+            state = sample_battle(n_from_troops, n_to_troops, rng)
+            counts[state] = counts.get(state, 0) + 1
+        check_samples(counts, get_exact_outcomes(n_from_troops, n_to_troops, cache), n_samples)
+
+def test_attack_to_completion():
+    """Attacks played dice by dice and instantly both follow the exact distribution
+    """
+    n_from_troops, n_to_troops, n_samples = 6, 4, 5000
+    exact = get_exact_outcomes(n_from_troops, n_to_troops, {})
+    for instant_battles in [False, True]:
+        game = make_game()
+        game.instant_battles = instant_battles
+        board = game.board
+        from_territory = board.get_territories()[0]
+        to_territory = board.get_neighbors(from_territory)[0]
+        from_player, to_player = game.players[0].name, game.players[1].name
+        counts = {}
+        for i in range(n_samples):
+            board.assign(from_territory, from_player)
+            board.assign(to_territory, to_player)
+            board.set_n_troops(from_territory, n_from_troops)
+            board.set_n_troops(to_territory, n_to_troops)
+            game.attack_to_completion(from_territory, to_territory)
+            if board.get_owner(to_territory) == from_player: state = (board.get_n_troops(from_territory) + board.get_n_troops(to_territory), 0)
+            else: state = (board.get_n_troops(from_territory), board.get_n_troops(to_territory))
+            counts[state] = counts.get(state, 0) + 1
+        check_samples(counts, exact, n_samples)
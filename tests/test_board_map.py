@@ -0,0 +1,22 @@
+from clisk.board.board_map import load_map
+from clisk.board.classic_board import CLASSIC_MAP
+
+def test_no_cache_by_default(tmpdir, monkeypatch):
+    """Maps are compiled in memory unless a cache directory is set
+    """
+    monkeypatch.delenv('CLISK_CACHE_DIR', raising=False)
+    monkeypatch.setenv('HOME', str(tmpdir))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir.join('cache')))
+    board_map = load_map(CLASSIC_MAP)
+    assert board_map.path is None and len(board_map.territories) == 42
+    assert not tmpdir.listdir()
+
+def test_cache_dir(tmpdir, monkeypatch):
+    """Maps compiled into the cache directory are mapped from there
+    """
+    monkeypatch.setenv('CLISK_CACHE_DIR', str(tmpdir))
+    board_map = load_map(CLASSIC_MAP)
+    assert [p.basename.endswith('.clm') for p in tmpdir.listdir()] == [True]
+    cached = load_map(CLASSIC_MAP)
+    assert cached.path == board_map.path == str(tmpdir.listdir()[0])
+    assert cached.get_regions() == board_map.get_regions()
@@ -0,0 +1,103 @@
+import random
+import pytest
+from clisk.bench import make_game
+from clisk.board.components import Components
+
+BOARDS = [
+    ('classic', {'connected_moves': True}),
+    ('classic', {'compact': True, 'connected_moves': True}),
+    ('grid', {'connected_moves': True, 'n_regions_per_side': 3}),
+    ('grid', {'compact': True, 'connected_moves': True, 'n_regions_per_side': 3}),
+]
+
+def get_group(board, territory):
+    """Find the territories connected to a territory through its owner's territories, by breadth-first search
+
+       Args:
+           board (Board): The gameboard
+           territory (str): Name of territory
+
+       Returns:
+           (set(str)): Territories of the group, including the territory
+    """
+    owner = board.get_owner(territory)
+    group, frontier = set([territory]), [territory]
+    while frontier:
+        for neighbor in board.get_neighbors(frontier.pop()):
+            if neighbor not in group and board.get_owner(neighbor) == owner:
+                group.add(neighbor)
+                frontier.append(neighbor)
+    return group
+
+def check_groups(board, territories):
+    """Check the groups of some territories against a search of the board
+
+       Args:
+           board (Board): The gameboard, with connected moves
+           territories (list(str)): Territories to check
+    """
+    for territory in territories:
+        group = get_group(board, territory)
+        assert sorted(board.components.get_members(territory)) == sorted(group)
+        assert sorted(board.get_move_targets(territory)) == sorted(group - set([territory]))
+        for other in list(board.get_neighbors(territory)) + territories[:5]:
+            assert board.components.is_connected(territory, other) == (other in group)
+
+def conquer(board, rng, players):
+    """Give a random territory to another player
+
+       Args:
+           board (Board): The gameboard
+           rng (random): Random engine
+           players (list(str)): Names of players
+    """
+    territory = rng.choice(board.get_territories())
+    board.assign(territory, rng.choice([p for p in players if p != board.get_owner(territory)]))
+
+@pytest.mark.parametrize('board_type, board_args', BOARDS)
+def test_groups_after_assign(board_type, board_args):
+    """Groups follow conquests, whether queried after every change or after many
+    """
+    rng = random.Random(0)
+    game = make_game(board_type, board_args)
+    board, players = game.board, [player.name for player in game.players]
+    territories = board.get_territories()
+    check_groups(board, territories)
+    for i in range(200):
+        conquer(board, rng, players)
+        # Queries rebuild the groups of players who lost territories, conquests after that merge groups
+        check_groups(board, rng.sample(territories, 3))
+    for i in range(50): conquer(board, rng, players)
+    check_groups(board, territories)
+
+@pytest.mark.parametrize('board_type, board_args', BOARDS)
+def test_groups_after_merge(board_type, board_args):
+    """Taking over every territory merges them into a single group
+    """
+    game = make_game(board_type, board_args)
+    board, player = game.board, game.players[0].name
+    territories = board.get_territories()
+    check_groups(board, territories)
+    for territory in territories: board.assign(territory, player)
+    assert sorted(board.components.get_members(territories[0])) == sorted(territories)
+    check_groups(board, territories)
+
+@pytest.mark.parametrize('board_type, board_args', BOARDS)
+def test_copy_and_groups(board_type, board_args):
+    """Copies keep their own groups, and groups carry over to a board with the same owners
+    """
+    rng = random.Random(1)
+    game = make_game(board_type, board_args)
+    board, players = game.board, [player.name for player in game.players]
+    territories = board.get_territories()
+    check_groups(board, territories)
+    groups = dict((player, board.components.get_groups(player)) for player in players)
+    sim = board.copy()
+    for i in range(50): conquer(sim, rng, players)
+    check_groups(sim, territories)
+    check_groups(board, territories)
+    assert dict((player, board.components.get_groups(player)) for player in players) == groups
+
+    components = Components(board)
+    for player, player_groups in groups.items(): components.set_groups(player, player_groups)
+    for territory in territories: assert sorted(components.get_members(territory)) == sorted(board.components.get_members(territory))
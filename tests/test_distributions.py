@@ -0,0 +1,63 @@
+from __future__ import division
+import math, random
+import pytest
+from clisk.distributions import sample_binomial, sample_multinomial
+
+def get_binomial(n, p):
+    """Compute the probabilities of a binomial distribution
+
+       Args:
+           n (int): Number of trials
+           p (float): Probability of success of each trial
+
+       Returns:
+           (list(float)): Probability of each number of successes
+    """
+    return [math.exp(math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1) + k * math.log(p) + (n - k) * math.log(1. - p))
+            for k in range(n + 1)]
+
+def test_binomial_edge_cases():
+    """No trials, negative numbers of trials and certain outcomes need no draw
+    """
+    rng = random.Random(0)
+    for p in [0., 0.3, 0.7, 1.]:
+        assert sample_binomial(0, p, rng) == 0
+        assert sample_binomial(-3, p, rng) == 0
+    assert sample_binomial(10, 0., rng) == 0
+    assert sample_binomial(10, 1., rng) == 10
+
+@pytest.mark.parametrize('n, p', [(5, 0.3), (40, 0.2), (100, 0.4), (1000, 0.3), (1000, 0.9)])
+def test_binomial_distribution(n, p):
+    """Draws by inversion and by rejection follow the binomial distribution
+    """
+    rng, n_samples = random.Random(1), 20000
+    samples = [sample_binomial(n, p, rng) for i in range(n_samples)]
+    mean = sum(samples) / n_samples
+    variance = sum((k - mean) ** 2 for k in samples) / (n_samples - 1)
+    assert abs(mean - n * p) <= 5 * math.sqrt(n * p * (1 - p) / n_samples)
+    assert variance == pytest.approx(n * p * (1 - p), rel=0.06)
+    counts = [0] * (n + 1)
+    for k in samples: counts[k] += 1
+    for k, p_k in enumerate(get_binomial(n, p)):
+        assert abs(counts[k] - n_samples * p_k) <= 5 * math.sqrt(n_samples * p_k * (1 - p_k)) + 1, k
+
+def test_multinomial_edge_cases():
+    """No trials or a negative number of trials fall nowhere
+    """
+    rng = random.Random(2)
+    assert sample_multinomial(0, 4, rng) == [0, 0, 0, 0]
+    assert sample_multinomial(-2, 3, rng) == [0, 0, 0]
+    assert sample_multinomial(5, 1, rng) == [5]
+
+@pytest.mark.parametrize('n, n_categories', [(3, 7), (12, 12), (40, 6), (1000, 4)])
+def test_multinomial_distribution(n, n_categories):
+    """Trials split over equally likely categories, drawn trial by trial or by binomials
+    """
+    rng, n_samples = random.Random(3), 5000
+    totals = [0] * n_categories
+    for i in range(n_samples):
+        counts = sample_multinomial(n, n_categories, rng)
+        assert len(counts) == n_categories and sum(counts) == n and min(counts) >= 0
+        for j, k in enumerate(counts): totals[j] += k
+    p = 1. / n_categories
+    for total in totals: assert abs(total - n_samples * n * p) <= 5 * math.sqrt(n_samples * n * p * (1 - p))
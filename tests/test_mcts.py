@@ -0,0 +1,17 @@
+import pytest
+from clisk import sim
+from clisk.player.mcts_player import parse_options
+
+def test_parse_options():
+    """Options of the player type convert to keyword arguments of MCTSPlayer
+    """
+    assert parse_options('') == {}
+    assert parse_options('budget=0.5,workers=4,iterations=none') == {'time_budget': 0.5, 'n_workers': 4, 'n_iterations': None}
+    for options in ['budgt=1', 'budget', 'workers=0', 'depth=x', 'budget=none,iterations=none']:
+        with pytest.raises(ValueError): parse_options(options)
+
+def test_workers_in_sim():
+    """Players with several search workers play in clisk-sim workers, which cannot start processes
+    """
+    stats = sim.run([['m', 'mcts:budget=none,iterations=3,workers=2'], ['r', 'random']], 'grid', n_games=2, n_workers=1, instant_battles=True)
+    assert stats['games'] == 2
@@ -0,0 +1,74 @@
+import pytest
+from clisk.bench import make_game
+from clisk.protocol import parse_answer
+
+BOARDS = [('classic', {}), ('classic', {'compact': True}), ('grid', {}), ('grid', {'compact': True})]
+
+# Errors the server and bot clients turn into a rejected answer
+ERRORS = (ValueError, TypeError, KeyError)
+
+@pytest.fixture(params=BOARDS, ids=['classic', 'classic-compact', 'grid', 'grid-compact'])
+def position(request):
+    """Board after the initial distribution, with a territory of the first player next to a friendly and a hostile neighbor
+
+       Returns:
+           (Board, str, str, str, str): Board, name of player, territory with 5 troops, friendly neighbor and hostile neighbor
+    """
+    board_type, board_args = request.param
+    game = make_game(board_type, board_args)
+    board, player, other = game.board, game.players[0].name, game.players[1].name
+    territory = board.get_territories(player)[0]
+    friend, enemy = board.get_neighbors(territory)[:2]
+    board.assign(friend, player)
+    board.assign(enemy, other)
+    board.set_n_troops(territory, 5)
+    return board, player, territory, friend, enemy
+
+def test_valid_answers(position):
+    """Well formed answers convert to the decisions of a player
+    """
+    board, player, territory, friend, enemy = position
+    assert parse_answer(board, player, 'do_attack', (), True) is True
+    assert parse_answer(board, player, 'do_move_troops', (), False) is False
+    assert parse_answer(board, player, 'place_troops', (5,), {territory: 3, friend: 2}) == {territory: 3, friend: 2}
+    assert parse_answer(board, player, 'attack', (), [territory, enemy]) == (territory, enemy)
+    assert parse_answer(board, player, 'attack', (), [None, None]) == (None, None)
+    assert parse_answer(board, player, 'move_troops', (), [territory, friend, 4]) == (territory, friend, 4)
+    assert parse_answer(board, player, 'move_troops', (), [None, None, 0]) == (None, None, 0)
+
+@pytest.mark.parametrize('value', [1, 'true', None, [], {}])
+def test_rejects_malformed_choices(position, value):
+    """Yes or no decisions only take booleans
+    """
+    for method in ['do_attack', 'do_move_troops']:
+        with pytest.raises(TypeError): parse_answer(position[0], position[1], method, (), value)
+
+def test_rejects_malformed_placements(position):
+    """Placements must put exactly the new troops on the player's own territories
+    """
+    board, player, territory, friend, enemy = position
+    for value in [None, [territory, 5], {territory: None}, {territory: 'five'}, {territory: [5]}, {enemy: 5}, {'Nowhere': 5},
+                  {territory: 4}, {territory: 6}, {territory: 7, friend: -2}]:
+        with pytest.raises(ERRORS): parse_answer(board, player, 'place_troops', (5,), value)
+
+def test_rejects_malformed_attacks(position):
+    """Attacks must go from a territory of the player with troops to spare to a hostile neighbor
+    """
+    board, player, territory, friend, enemy = position
+    board.set_n_troops(friend, 1)
+    for value in [None, territory, {territory: enemy}, [territory], [territory, enemy, 1], [territory, friend], [enemy, territory],
+                  [friend, enemy], [territory, 'Nowhere'], ['Nowhere', enemy], [[territory], enemy], [territory, [enemy]]]:
+        with pytest.raises(ERRORS): parse_answer(board, player, 'attack', (), value)
+
+def test_rejects_malformed_moves(position):
+    """Moves must take troops the player can spare to a territory they can reach
+    """
+    board, player, territory, friend, enemy = position
+    for value in [None, [territory, friend], [territory, enemy, 1], [enemy, territory, 1], [territory, friend, 5], [territory, friend, -1],
+                  [territory, friend, 'four'], [territory, friend, None], ['Nowhere', friend, 1], [territory, 'Nowhere', 1], [[territory], friend, 1]]:
+        with pytest.raises(ERRORS): parse_answer(board, player, 'move_troops', (), value)
+
+def test_rejects_unknown_decisions(position):
+    """Only decisions of the Player interface are answered
+    """
+    with pytest.raises(ValueError): parse_answer(position[0], position[1], 'draw_cards', (), True)
@@ -0,0 +1,80 @@
+import pytest
+from clisk.bench import make_game
+from clisk.board import create_board
+from clisk.record import RecordWriter, RecordReader, read_varint, write_varint, read_string, write_string
+
+BOARDS = [('classic', {}), ('classic', {'compact': True}), ('grid', {}), ('grid', {'compact': True, 'n_regions_per_side': 3})]
+
+def get_state(board):
+    """Return the owner and number of troops of each territory
+
+       Args:
+           board (Board): The gameboard
+
+       Returns:
+           (list((str, str, int))): Territory, owner and number of troops of each territory
+    """
+    return [(t, board.get_owner(t), board.get_n_troops(t)) for t in board.get_territories()]
+
+def test_varint_round_trip():
+    """Varints of any size read back as written
+    """
+    buffer = bytearray()
+    numbers = [0, 1, 127, 128, 300, 1 << 21, (1 << 63) + 5]
+    for n in numbers: write_varint(buffer, n)
+    pos = 0
+    for n in numbers:
+        m, pos = read_varint(buffer, pos)
+        assert m == n
+    assert pos == len(buffer)
+
+def test_string_round_trip():
+    """Strings, empty or not ASCII, read back as written
+    """
+    buffer = bytearray()
+    strings = ['', 'Alaska', u'Ca\xf1ada', 'x' * 200]
+    for s in strings: write_string(buffer, s)
+    pos = 0
+    for s in strings:
+        t, pos = read_string(buffer, pos)
+        assert t == s
+    assert pos == len(buffer)
+
+@pytest.mark.parametrize('board_type, board_args', BOARDS)
+def test_replay_matches_game(tmpdir, board_type, board_args):
+    """Replaying a record rebuilds the board at the start, every checkpoint and the end of the game
+    """
+    path = str(tmpdir.join('game.clr'))
+    game = make_game(board_type, board_args, seed=1)
+    initial = get_state(game.board)
+    game.add_sink(RecordWriter(path, 'seed-1'))
+    checkpoints = []
+    while game.play(5) is None: checkpoints.append((game.n_turns, get_state(game.board)))
+    game.close()
+
+    record = RecordReader(path)
+    assert record.seed == 'seed-1'
+    assert record.players == [player.name for player in game.players]
+    assert record.winner == game.winner
+    assert record.n_turns == game.n_turns
+    assert get_state(record.replay(create_board(board_type, **board_args), 0)) == initial
+    for n_turns, state in checkpoints:
+        assert get_state(record.replay(create_board(board_type, **board_args), n_turns)) == state
+    assert get_state(record.replay(create_board(board_type, **board_args))) == get_state(game.board)
+
+def test_replay_rejects_other_board(tmpdir):
+    """Records only replay on boards of the recorded type
+    """
+    path = str(tmpdir.join('game.clr'))
+    game = make_game('grid', seed=2)
+    game.add_sink(RecordWriter(path))
+    game.play()
+    game.close()
+    with pytest.raises(ValueError): RecordReader(path).replay(create_board('classic'))
+
+def test_reader_rejects_other_files(tmpdir):
+    """Files which are not records are rejected
+    """
+    path = tmpdir.join('game.clr')
+    path.write_binary(b'not a record')
+    with pytest.raises(ValueError): RecordReader(str(path))
@@ -0,0 +1,56 @@
+import math
+import pytest
+from clisk.rng import SeedSequence, create_streams
+
+@pytest.mark.parametrize('text', ['0', '42:3', '0:3.1', 'seed:with:colons:0.2', '7:'])
+def test_parse(text):
+    """Sequences are rebuilt from their description
+    """
+    sequence = SeedSequence.parse(text)
+    assert str(sequence) == text.rstrip(':')
+    assert SeedSequence.parse(str(sequence)).generate_seed() == sequence.generate_seed()
+
+def test_stable_seeds():
+    """Seeds only depend on the root seed and spawn key, the same in every run
+    """
+    assert SeedSequence(0).generate_seed() == 42488865030413917399014926450421260821
+    assert SeedSequence(0).get_child(3).generate_seed(64) == 17059235139537335238
+    assert SeedSequence('abc').get_child(1).get_child(2).random().random() == 0.9335348773882768
+    assert SeedSequence(0).get_child(3).generate_seed() == SeedSequence.parse('0:3').generate_seed()
+    assert SeedSequence(0).generate_seed() == SeedSequence('0').generate_seed()
+
+def test_children_distinct():
+    """Children, grandchildren and other roots all get distinct seeds
+    """
+    root = SeedSequence(0)
+    sequences = [root, SeedSequence(1)] + [root.get_child(i) for i in range(100)] + [root.get_child(i).get_child(j) for i in range(10) for j in range(10)]
+    assert len(set(s.generate_seed() for s in sequences)) == len(sequences)
+
+def test_spawn():
+    """Spawned children continue the numbering of earlier spawns
+    """
+    root = SeedSequence(5)
+    children = root.spawn(3) + root.spawn(2)
+    assert [str(child) for child in children] == ['5:0', '5:1', '5:2', '5:3', '5:4']
+    assert [child.generate_seed() for child in children] == [root.get_child(i).generate_seed() for i in range(5)]
+    assert children[1].spawn(1)[0].spawn_key == (1, 0)
+
+def test_streams_independent():
+    """Streams of a game and its players are reproducible and uncorrelated
+    """
+    sequence = SeedSequence(0).get_child(7)
+    game_random, player_randoms = create_streams(sequence, 3)
+    n = 2000
+    draws = [[r.random() for i in range(n)] for r in [game_random] + player_randoms]
+    game_random, player_randoms = create_streams(sequence, 3)
+    assert draws == [[r.random() for i in range(n)] for r in [game_random] + player_randoms]
+    # Adding players leaves the others' streams as they were
+    assert [r.random() for r in create_streams(sequence, 4)[1][:3]] == [d[0] for d in draws[1:]]
+    # Other games draw other numbers
+    assert create_streams(SeedSequence(0).get_child(8), 3)[0].random() != draws[0][0]
+    # Correlations within 5 sigma of 0
+    for i in range(len(draws)):
+        for j in range(i):
+            mean_i, mean_j = sum(draws[i]) / n, sum(draws[j]) / n
+            covariance = sum((x - mean_i) * (y - mean_j) for x, y in zip(draws[i], draws[j])) / n
+            assert abs(covariance * 12.) < 5. / math.sqrt(n)
@@ -0,0 +1,127 @@
+import sys
+import pytest
+from clisk.board import create_board
+from clisk.player import create_player
+from clisk.game import Game
+from clisk.rng import SeedSequence, create_streams
+
+BOARDS = [
+    ('classic', {}),
+    ('classic', {'compact': True}),
+    ('grid', {'n_regions_per_side': 3}),
+    ('grid', {'compact': True, 'n_regions_per_side': 3}),
+    ('grid', {'compact': True, 'connected_moves': True, 'n_regions_per_side': 4}),
+]
+TYPES = ['random', 'greedy', 'random']
+
+# Python 2 dictionaries have no order to restore, so resumed games only continue from the same position
+exact = pytest.mark.skipif(sys.version_info[0] < 3, reason='resumed games only play the same on Python 3')
+
+def make_game(board_type, board_args, seed, setup=True):
+    """Set up a game between random and greedy players
+
+       Args:
+           board_type (str): Type of board
+           board_args (dict(str, val)): Keyword arguments of create_board
+           seed (int): Random seed
+           setup (bool): Whether or not to randomly distribute territories and troops
+
+       Returns:
+           (Game): Game
+    """
+    game_random, player_randoms = create_streams(SeedSequence(seed), len(TYPES))
+    players = [create_player('p%i' % (i), type, rng) for i, (type, rng) in enumerate(zip(TYPES, player_randoms))]
+    return Game(players, create_board(board_type, **board_args), game_random, setup=setup)
+
+def resume(game, board_type, board_args):
+    """Snapshot a game and restore it in a new game with other random engines
+
+       Args:
+           game (Game): Game
+           board_type (str): Type of board
+           board_args (dict(str, val)): Keyword arguments of create_board
+
+       Returns:
+           (Game): Restored game
+    """
+    data = game.dumps()
+    resumed = make_game(board_type, board_args, 1000, setup=False)
+    resumed.loads(data)
+    return resumed
+
+def get_result(game):
+    """Return the winner, length and final board of a game
+
+       Args:
+           game (Game): Game
+
+       Returns:
+           (tuple): Winner, number of turns and territory, owner and number of troops of each territory
+    """
+    return game.winner, game.n_turns, [(t, game.board.get_owner(t), game.board.get_n_troops(t)) for t in game.board.get_territories()]
+
+@pytest.mark.parametrize('board_type, board_args', BOARDS)
+def test_round_trip(board_type, board_args):
+    """A restored game snapshots to the same bytes
+    """
+    game = make_game(board_type, board_args, 0)
+    game.play(10)
+    data = game.dumps()
+    assert resume(game, board_type, board_args).dumps() == data
+
+@exact
+@pytest.mark.parametrize('board_type, board_args', BOARDS)
+def test_resume_between_turns(board_type, board_args):
+    """A game stopped and resumed every few turns plays as the uninterrupted game
+    """
+    for seed in range(3):
+        game = make_game(board_type, board_args, seed)
+        game.play()
+        game_result = get_result(game)
+        resumed = make_game(board_type, board_args, seed)
+        while resumed.play(7) is None: resumed = resume(resumed, board_type, board_args)
+        assert get_result(resumed) == game_result
+
+@exact
+@pytest.mark.parametrize('board_type, board_args', BOARDS)
+def test_resume_within_turns(board_type, board_args):
+    """A game stopped and resumed between any two decisions plays as the uninterrupted game
+    """
+    game = make_game(board_type, board_args, 0)
+    game.play()
+    game_result = get_result(game)
+    resumed = make_game(board_type, board_args, 0)
+    steps, answer, n_decisions = resumed.steps(), None, 0
+    while True:
+        try:
+            player, method, args = steps.send(answer)
+        except StopIteration:
+            break
+        n_decisions += 1
+        if n_decisions % 13 == 0:
+            # Drop the pending decision, the restored game asks for it again
+            resumed = resume(resumed, board_type, board_args)
+            steps, answer = resumed.steps(), None
+            continue
+        answer = getattr(player, method)(resumed.board, *args)
+    assert get_result(resumed) == game_result
+
+def test_fork_keeps_position():
+    """A game restored without its random engines continues from the same position
+    """
+    game = make_game('grid', {'compact': True}, 0)
+    game.play(10)
+    forked = make_game('grid', {'compact': True}, 1000, setup=False)
+    forked.loads(game.dumps(random=False), random=False)
+    assert get_result(forked) == get_result(game)
+    assert forked.player_index == game.player_index and forked.phase == game.phase
+
+def test_load_rejects_other_games():
+    """Snapshots only restore into games with the same players and board layout
+    """
+    game = make_game('classic', {}, 0)
+    data = game.dumps()
+    with pytest.raises(ValueError): make_game('grid', {}, 0, setup=False).loads(data)
+    other = Game([create_player(name, 'random', game.random) for name in ['a', 'b', 'c']], create_board('classic'), game.random, setup=False)
+    with pytest.raises(ValueError): other.loads(data)
+    with pytest.raises(ValueError): make_game('classic', {}, 0, setup=False).loads(b'not a snapshot')
@@ -0,0 +1,101 @@
+import itertools, math, random
+import pytest
+from clisk.rng import SeedSequence
+from clisk.tournament import Match, fit_ratings, get_expected_score, get_sprt_result, pair_swiss
+
+def test_sprt_decisions():
+    """Lopsided matches are decided for the winner and even ones go on
+    """
+    assert get_sprt_result(30, 5, 50.) == 1
+    assert get_sprt_result(5, 30, 50.) == -1
+    assert get_sprt_result(6, 4, 50.) == 0
+    for n in (1, 10, 1000):
+        assert get_sprt_result(n, n, 50.) == 0
+    for n_wins, n_losses in itertools.product(range(0, 60, 7), repeat=2):
+        assert get_sprt_result(n_wins, n_losses, 50.) == -get_sprt_result(n_losses, n_wins, 50.)
+
+@pytest.mark.parametrize('elo, expected', [(-50., -1), (50., 1), (200., 1)])
+def test_sprt_errors(elo, expected):
+    """Sequential tests find the stronger player, wrong at most alpha of the time
+    """
+    rng = random.Random(0)
+    p = get_expected_score(elo)
+    n_runs, n_wrong = 200, 0
+    for run in range(n_runs):
+        n_wins = n_losses = 0
+        result = 0
+        while not result:
+            if rng.random() < p: n_wins += 1
+            else: n_losses += 1
+            result = get_sprt_result(n_wins, n_losses, 50.)
+        n_wrong += result != expected
+    # alpha = beta = 0.05, with a 5 sigma margin
+    assert n_wrong <= n_runs * 0.05 + 5 * math.sqrt(n_runs * 0.05 * 0.95)
+
+def test_fit_ratings_exact():
+    """Ratings recover the strengths behind expected win counts
+    """
+    elos = {'a': 0., 'b': 100., 'c': 300., 'd': -150.}
+    wins = {}
+    for x, y in itertools.permutations(elos, 2):
+        wins[(x, y)] = 5000 * get_expected_score(elos[x] - elos[y])
+    ratings, errors = fit_ratings(sorted(elos), wins)
+    mean = sum(elos.values()) / len(elos)
+    for name in elos:
+        assert abs(ratings[name] - (elos[name] - mean)) < 2.
+        assert 0. < errors[name] < 15.
+    assert abs(sum(ratings.values())) < 1e-6
+
+def test_fit_ratings_sampled():
+    """Ratings fitted to random games are within their errors of the true strengths
+    """
+    rng = random.Random(1)
+    elos = {'a': 0., 'b': 50., 'c': 200.}
+    wins = dict.fromkeys(itertools.permutations(elos, 2), 0)
+    for x, y in itertools.combinations(elos, 2):
+        for game in range(1000):
+            if rng.random() < get_expected_score(elos[x] - elos[y]): wins[(x, y)] += 1
+            else: wins[(y, x)] += 1
+    ratings, errors = fit_ratings(list(elos), wins)
+    mean = sum(elos.values()) / len(elos)
+    for name in elos:
+        assert abs(ratings[name] - (elos[name] - mean)) < 4 * errors[name]
+
+def test_fit_ratings_unbeaten():
+    """Unbeaten players get a finite rating and players without games none
+    """
+    ratings, errors = fit_ratings(['a', 'b', 'c'], {('a', 'b'): 10, ('b', 'a'): 0})
+    assert sorted(ratings) == sorted(errors) == ['a', 'b']
+    assert 0. < ratings['a'] - ratings['b'] < 1000.
+    assert fit_ratings(['a', 'b'], {}) == ({}, {})
+
+def test_swiss_byes():
+    """Every player sits out once before anyone sits out twice, and rematches are avoided
+    """
+    names = ['a', 'b', 'c', 'd', 'e']
+    scores = dict.fromkeys(names, 0.)
+    played, byes = {}, {}
+    rng = random.Random(2)
+    for round in range(len(names)):
+        pairs, bye = pair_swiss(names, scores, played, byes)
+        assert bye not in byes
+        assert sorted([bye] + [name for pair in pairs for name in pair]) == names
+        if round < 2:
+            assert not any(pair in played for pair in pairs)
+        byes[bye] = None
+        for a, b in pairs:
+            played[(a, b)] = played[(b, a)] = None
+            scores[rng.choice((a, b))] += 1.
+    assert sorted(byes) == names
+    assert pair_swiss(names[:4], scores, {}, {})[1] is None
+
+def test_match_jobs():
+    """Match games alternate the first player and the boards, each with its own stream
+    """
+    match = Match(['a', 'random'], ['b', 'greedy'], SeedSequence(0).get_child(3))
+    boards = [('classic', {}), ('grid', {'n_regions_per_side': 2})]
+    jobs = match.get_jobs(3, boards, False) + match.get_jobs(2, boards, False)
+    assert [str(job[0]) for job in jobs] == ['0:3.%i' % (i) for i in range(5)]
+    assert [job[1][0][0] for job in jobs] == ['a', 'b', 'a', 'b', 'a']
+    assert [job[2] for job in jobs] == ['classic', 'grid', 'classic', 'grid', 'classic']
+    assert match.n_scheduled == 5
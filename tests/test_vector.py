@@ -0,0 +1,68 @@
+import pytest
+np = pytest.importorskip('numpy')
+from clisk.board import create_board
+from clisk.game import Game
+from clisk.player.random_player import RandomPlayer
+from clisk.rng import SeedSequence
+from clisk.vector import VectorGames, play_batch
+
+@pytest.mark.parametrize('n_players, board_type, board_args', [(3, 'classic', {}), (5, 'grid', {'n_regions_per_side': 3})])
+def test_setup(n_players, board_type, board_args):
+    """Territories are dealt evenly, the first players taking the rest, and every player gets their starting troops
+    """
+    board = create_board(board_type, **board_args)
+    n_territories = len(board.get_territories())
+    games = VectorGames(['p%i' % (p) for p in range(n_players)], board, 200, np.random.default_rng(0))
+    assert (games.troops >= 1).all()
+    for p in range(n_players):
+        n_owned = (games.owners == p).sum(1)
+        assert (n_owned == n_territories // n_players + (p < n_territories % n_players)).all()
+        assert (np.where(games.owners == p, games.troops, 0).sum(1) == max(n_owned[0], 40 - 5 * (n_players - 2))).all()
+    # Territories are dealt at random
+    assert len(set(map(bytes, games.owners))) == 200
+
+def test_setup_large_board():
+    """Players owning more territories than their starting troops place none
+    """
+    board = create_board('grid', region_size=5, n_regions_per_side=2)
+    games = VectorGames(['a', 'b'], board, 20, np.random.default_rng(0))
+    assert (games.troops == 1).all()
+    assert ((games.owners == 0).sum(1) == 50).all()
+    assert len(games.play()) == 20
+
+def test_collect_troops():
+    """Players collect the troops of Game.collect_troops, with region bonuses
+    """
+    board = create_board('classic')
+    games = VectorGames(['a', 'b'], board, 50, np.random.default_rng(1))
+    # Give regions away to get bonuses
+    games.owners[:25, :20] = 0
+    territories = board.get_territories()
+    for k in range(50):
+        for territory, owner in zip(territories, games.owners[k]): board.assign(territory, games.players[owner])
+        game = Game([RandomPlayer(name, None) for name in games.players], board, None, setup=False)
+        for p, player in enumerate(game.players):
+            assert games.collect_troops(p, np.array([k]))[0] == game.collect_troops(player)
+
+@pytest.mark.parametrize('n_players, board_type, board_args', [(2, 'classic', {}), (3, 'grid', {'n_regions_per_side': 3})])
+def test_play_terminates(n_players, board_type, board_args):
+    """All games end with a winner owning every territory
+    """
+    games = VectorGames(['p%i' % (p) for p in range(n_players)], create_board(board_type, **board_args), 100, np.random.default_rng(2))
+    winners = games.play()
+    assert not len(games.get_running_games())
+    assert (games.owners == games.winners[:, None]).all()
+    assert winners == [games.players[w] for w in games.winners]
+    assert (games.n_turns > 0).all()
+    # Every player wins some games
+    assert set(winners) == set(games.players)
+
+def test_batch_results():
+    """Results name their batch, which replays as a whole from its seed
+    """
+    root = SeedSequence(0)
+    jobs = [(root.get_child(i), [['a', 'random'], ['b', 'random']], 'classic', {}, False, None, False) for i in range(8)]
+    results = play_batch(jobs)
+    assert [result['batch_seed'] for result in results] == ['0:0'] * 8
+    assert [result['batch_game'] for result in results] == list(range(8))
+    assert [(r['winner'], r['turns']) for r in play_batch(jobs)] == [(r['winner'], r['turns']) for r in results]